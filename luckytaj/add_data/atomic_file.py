@@ -0,0 +1,31 @@
+"""
+Atomic writes for the shared result/ cache files
+Parallel shard workers save the same caches (locators, routes, page sizes, wait timings,
+driver setup). Each write goes to its own temp file in the target's directory (mkstemp)
+and is moved over the target with os.replace, so two writers never share a temp file and
+a reader never sees a half-written one.
+"""
+import json
+import os
+import tempfile
+
+
+def write_atomic(path, data):
+    """Replace path with data (str or bytes) in one step"""
+    directory, name = os.path.split(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data.encode("utf-8") if isinstance(data, str) else data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_json_atomic(path, obj, **dump_kwargs):
+    """json.dump(obj) to path through write_atomic"""
+    write_atomic(path, json.dumps(obj, **dump_kwargs))
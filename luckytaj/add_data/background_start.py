@@ -0,0 +1,96 @@
+"""
+Run the browser start and login in the background while the operator answers prompts
+BackgroundStart runs a function in a worker thread as soon as the site is known; the main
+thread keeps asking for dates/cutoffs and only calls result() where the driver is needed.
+Anything the worker prints is held back and shown when result() is called, so it does not
+break into the prompts.
+"""
+import io
+import sys
+import threading
+import time
+
+
+class _ThreadOutput:
+    """sys.stdout stand-in that buffers writes from registered threads and passes the rest through"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.buffers = {}  # thread id -> StringIO
+        self.lock = threading.Lock()
+
+    def _target(self):
+        return self.buffers.get(threading.get_ident(), self.stream)
+
+    def write(self, text):
+        target = self._target()
+        if target is self.stream:
+            return self.stream.write(text)
+        with self.lock:
+            return target.write(text)
+
+    def flush(self):
+        if self._target() is self.stream:
+            self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+def _thread_output():
+    if not isinstance(sys.stdout, _ThreadOutput):
+        sys.stdout = _ThreadOutput(sys.stdout)
+    return sys.stdout
+
+
+class BackgroundStart:
+    """Runs target(*args) in a daemon thread; result() waits for it, replays its output and re-raises its errors"""
+
+    def __init__(self, name, target, *args):
+        self.name = name
+        self.output = _thread_output()
+        self.buffer = io.StringIO()
+        self._value = None
+        self._error = None
+        self.started = time.time()
+        self.finished = None
+        self._thread = threading.Thread(target=self._run, args=(target, args), name=name, daemon=True)
+        self._thread.start()
+        print(f"[INFO] {name} running in the background...")
+
+    def _run(self, target, args):
+        self.output.buffers[threading.get_ident()] = self.buffer
+        try:
+            self._value = target(*args)
+        except BaseException as e:  # also SystemExit from the start/login helpers
+            self._error = e
+        finally:
+            self.output.buffers.pop(threading.get_ident(), None)
+            self.finished = time.time()
+
+    def _replay(self):
+        with self.output.lock:
+            text, self.buffer = self.buffer.getvalue(), io.StringIO()
+        if text:
+            self.output.stream.write(text)
+            self.output.stream.flush()
+
+    def result(self):
+        """The target's return value (waits for it first); re-raises whatever the target raised"""
+        waiting = time.time()
+        if self._thread.is_alive():
+            print(f"[INFO] Waiting for {self.name} to finish...")
+        self._thread.join()
+        self._replay()
+        if self._error is not None:
+            raise self._error
+        overlapped = min(waiting, self.finished) - self.started
+        print(f"[INFO] {self.name} ready ({self.finished - self.started:.1f}s, "
+              f"{overlapped:.1f}s of it while the prompts were open)")
+        return self._value
+
+    def discard(self, cleanup):
+        """The result is not needed (e.g. the operator cancelled): wait for the worker quietly and pass its value to cleanup"""
+        self._thread.join()
+        if self._value is not None:
+            cleanup(self._value)
@@ -0,0 +1,128 @@
+"""
+Fast, offline browser start for the Selenium scripts
+The first start walks the setups (Firefox with a cached or downloaded geckodriver, Firefox with
+the system driver, Chrome) and records the one that worked, with its driver path and browser
+version, in result/driver_bootstrap.json. Later starts launch that setup straight from the
+recorded driver binary without webdriver-manager or any network lookup, and only walk the
+chain again when it stops working (e.g. after a browser update).
+"""
+import glob
+import json
+import os
+import platform
+import time
+
+from selenium import webdriver
+from selenium.webdriver.firefox.service import Service
+from selenium.webdriver.firefox.options import Options
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+
+from atomic_file import write_json_atomic
+
+SETUPS = ["firefox", "firefox_system", "chrome"]
+SETUP_LABELS = {
+    "firefox": "Firefox (cached geckodriver)",
+    "firefox_system": "Firefox (system geckodriver)",
+    "chrome": "Chrome (cached chromedriver)",
+}
+# Keep Selenium Manager from going online for the system-driver setup
+os.environ.setdefault("SE_OFFLINE", "true")
+
+
+def get_state_path():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    working_dir = os.path.dirname(os.path.dirname(script_dir))
+    result_dir = os.path.join(working_dir, "result")
+    os.makedirs(result_dir, exist_ok=True)
+    return os.path.join(result_dir, "driver_bootstrap.json")
+
+
+def _load_state():
+    try:
+        with open(get_state_path(), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(state):
+    write_json_atomic(get_state_path(), state, indent=2)
+
+
+def _cached_driver_binary(name):
+    """Newest driver binary already in webdriver-manager's cache (~/.wdm), found without going online"""
+    executable = f"{name}.exe" if platform.system() == "Windows" else name
+    root = os.environ.get("WDM_LOCAL_PATH") or os.path.join(os.path.expanduser("~"), ".wdm")
+    candidates = [path for path in glob.glob(os.path.join(root, "drivers", name, "**", executable), recursive=True)
+                  if os.path.isfile(path)]
+    return max(candidates, key=os.path.getmtime) if candidates else None
+
+
+def _download_driver(name):
+    """Resolve the driver through webdriver-manager (network); only used when nothing is cached"""
+    if name == "geckodriver":
+        from webdriver_manager.firefox import GeckoDriverManager
+        return GeckoDriverManager().install()
+    from webdriver_manager.chrome import ChromeDriverManager
+    return ChromeDriverManager().install()
+
+
+def _launch(setup, driver_path, firefox_options, headless):
+    if setup == "chrome":
+        chrome_options = ChromeOptions()
+        chrome_options.add_argument('--no-sandbox')
+        chrome_options.add_argument('--disable-dev-shm-usage')
+        if headless:
+            chrome_options.add_argument('--headless')
+        return webdriver.Chrome(service=ChromeService(driver_path), options=chrome_options)
+    if headless and '--headless' not in firefox_options.arguments:
+        firefox_options.add_argument('--headless')
+    if setup == "firefox_system":
+        for argument in ('--no-sandbox', '--disable-dev-shm-usage'):
+            if argument not in firefox_options.arguments:
+                firefox_options.add_argument(argument)
+        return webdriver.Firefox(service=Service(), options=firefox_options)
+    return webdriver.Firefox(service=Service(driver_path), options=firefox_options)
+
+
+def start_driver(options=None, headless=False, maximize=True):
+    """
+    Start a browser with the remembered setup first, falling back through SETUPS.
+    options: Firefox Options to use (a new one when None).
+    Returns the driver, or None when no setup starts.
+    """
+    firefox_options = options or Options()
+    state = _load_state()
+    winner = state.get("setup")
+    order = ([winner] if winner in SETUPS else []) + [setup for setup in SETUPS if setup != winner]
+
+    for setup in order:
+        started = time.time()
+        driver_path = None
+        try:
+            if setup != "firefox_system":
+                name = "chromedriver" if setup == "chrome" else "geckodriver"
+                recorded = state.get("driver_path") if setup == winner else None
+                driver_path = recorded if recorded and os.path.isfile(recorded) else _cached_driver_binary(name)
+                if driver_path is None:
+                    print(f"[INFO] No cached {name}, downloading it once...")
+                    driver_path = _download_driver(name)
+            driver = _launch(setup, driver_path, firefox_options, headless)
+        except Exception as e:
+            print(f"❌ {SETUP_LABELS[setup]} failed to start: {e}")
+            continue
+
+        seconds = time.time() - started
+        if maximize and not headless:
+            driver.maximize_window()
+        capabilities = driver.capabilities
+        browser_version = capabilities.get("browserVersion")
+        print(f"✅ Browser started: {SETUP_LABELS[setup]} {browser_version or ''} in {seconds:.2f}s")
+        if setup != winner or state.get("driver_path") != driver_path or state.get("browser_version") != browser_version:
+            if winner and setup != winner:
+                print(f"[INFO] Remembering {SETUP_LABELS[setup]} for the next starts (was {SETUP_LABELS.get(winner, winner)})")
+            _save_state({"setup": setup, "driver_path": driver_path, "browser_version": browser_version,
+                         "recorded": time.strftime("%Y-%m-%d %H:%M:%S")})
+        return driver
+    return None
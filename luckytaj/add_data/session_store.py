@@ -0,0 +1,287 @@
+"""
+Encrypted local store for logged-in browser sessions
+After a successful login the scripts save the site's cookies and localStorage to
+result/sessions/<name>.session, encrypted with a key kept in the user's home folder.
+A fresh browser restores them before opening the site, so the login form (and the
+CAPTCHA) only comes up again once the server has expired the session.
+Needs the optional 'cryptography' package; without it nothing is stored.
+"""
+import json
+import os
+import tempfile
+import time
+from urllib.parse import urlsplit
+
+from atomic_file import write_atomic
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+except ImportError:
+    Fernet = None
+
+# Override with ROCKETGO_SESSION_KEY (a Fernet key) to share sessions between user accounts
+KEY_ENV = "ROCKETGO_SESSION_KEY"
+KEY_PATH = os.path.join(os.path.expanduser("~"), ".rocketgo_session.key")
+# Sessions older than this are not restored, the server will have dropped them anyway
+MAX_AGE_HOURS = 24
+
+LOCAL_STORAGE_READ_JS = """
+var items = {};
+for (var i = 0; i < window.localStorage.length; i++) {
+    var key = window.localStorage.key(i);
+    items[key] = window.localStorage.getItem(key);
+}
+return items;
+"""
+
+LOCAL_STORAGE_WRITE_JS = """
+var items = arguments[0];
+for (var key in items) {
+    window.localStorage.setItem(key, items[key]);
+}
+"""
+
+_warned_missing = False
+
+
+def get_session_path(name):
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    working_dir = os.path.dirname(os.path.dirname(script_dir))
+    session_dir = os.path.join(working_dir, "result", "sessions")
+    os.makedirs(session_dir, exist_ok=True)
+    safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in name)
+    return os.path.join(session_dir, f"{safe_name}.session")
+
+
+def _get_cipher():
+    """Fernet cipher with the local key (created on first use, readable by this user only); None without cryptography"""
+    global _warned_missing
+    if Fernet is None:
+        if not _warned_missing:
+            print("[WARNING] 'cryptography' is not installed, login sessions are not saved (pip install cryptography)")
+            _warned_missing = True
+        return None
+    key = os.environ.get(KEY_ENV)
+    if key:
+        return Fernet(key.encode("ascii"))
+    if not os.path.exists(KEY_PATH):
+        _create_key_file()
+    try:
+        with open(KEY_PATH, "rb") as f:
+            return Fernet(f.read().strip())
+    except (OSError, ValueError) as e:
+        print(f"[WARNING] Session key {KEY_PATH} is unusable ({e}), login sessions are not saved")
+        return None
+
+
+def _create_key_file():
+    """
+    Write a new key to a private temp file and link it into place: the key file appears complete
+    or not at all, and when parallel shard workers race, the first link wins and the others read it
+    """
+    fd, tmp_path = tempfile.mkstemp(prefix=".rocketgo_session.", suffix=".tmp", dir=os.path.dirname(KEY_PATH))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(Fernet.generate_key())
+        try:
+            os.link(tmp_path, KEY_PATH)
+        except FileExistsError:
+            pass  # another worker created it first, use theirs
+        except OSError:
+            # No hard links on this file system: an atomic replace, re-checked just before
+            if not os.path.exists(KEY_PATH):
+                os.replace(tmp_path, KEY_PATH)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def save_session(driver, name):
+    """Save the current page's cookies and localStorage (call once the login is known to have worked)"""
+    cipher = _get_cipher()
+    if cipher is None:
+        return False
+    parts = urlsplit(driver.current_url)
+    session = {
+        "saved": time.time(),
+        "origin": f"{parts.scheme}://{parts.netloc}",
+        "cookies": driver.get_cookies(),
+        "local_storage": driver.execute_script(LOCAL_STORAGE_READ_JS) or {},
+    }
+    write_atomic(get_session_path(name), cipher.encrypt(json.dumps(session).encode("utf-8")))
+    print(f"[INFO] Saved login session for {name} ({len(session['cookies'])} cookies)")
+    return True
+
+
+def load_session(name):
+    """Decrypted session dict, or None when missing, too old or unreadable"""
+    cipher = _get_cipher()
+    path = get_session_path(name)
+    if cipher is None or not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            session = json.loads(cipher.decrypt(f.read()))
+    except (OSError, ValueError, InvalidToken):
+        print(f"[WARNING] Saved session for {name} could not be read, logging in again")
+        return None
+    if time.time() - session.get("saved", 0) > MAX_AGE_HOURS * 3600:
+        return None
+    return session
+
+
+def restore_session(driver, name, url):
+    """
+    Put a saved session into the browser before the site is opened.
+    Returns True when something was restored; the caller still checks that the site accepts it.
+    """
+    session = load_session(name)
+    if session is None:
+        return False
+    parts = urlsplit(url)
+    if session["origin"] != f"{parts.scheme}://{parts.netloc}":
+        return False
+
+    # Cookies and localStorage can only be set while a page of the same origin is open
+    driver.get(session["origin"] + "/favicon.ico")
+    restored = 0
+    for cookie in session["cookies"]:
+        cookie = {k: v for k, v in cookie.items() if k in ("name", "value", "path", "domain", "secure", "httpOnly", "expiry", "sameSite")}
+        if cookie.get("sameSite") not in ("Strict", "Lax", "None"):
+            cookie.pop("sameSite", None)
+        if "expiry" in cookie:
+            cookie["expiry"] = int(cookie["expiry"])
+        try:
+            driver.add_cookie(cookie)
+            restored += 1
+        except Exception as e:
+            print(f"[DEBUG] Could not restore cookie {cookie.get('name')}: {e}")
+    if session["local_storage"]:
+        driver.execute_script(LOCAL_STORAGE_WRITE_JS, session["local_storage"])
+    print(f"[INFO] Restored saved session for {name} ({restored} cookies)")
+    return True
+
+
+def clear_session(name):
+    """Forget a saved session (e.g. after the site rejected it)"""
+    path = get_session_path(name)
+    if os.path.exists(path):
+        os.remove(path)
+
+
+# Records the page's own successful JSON GET requests (URL and headers, so an Authorization
+# token from localStorage is replayed too); reinstalled by check() after a full page load
+KEEPALIVE_HOOK_JS = """
+if (!window.__keepaliveRequests) {
+    window.__keepaliveRequests = [];
+    var remember = function(method, url, headers, status, contentType) {
+        if (status !== 200 || String(method || 'GET').toUpperCase() !== 'GET') { return; }
+        if (String(contentType || '').indexOf('json') === -1) { return; }
+        var list = window.__keepaliveRequests;
+        list.push({url: url, headers: headers});
+        if (list.length > 5) { list.shift(); }
+    };
+    var origOpen = XMLHttpRequest.prototype.open;
+    var origSetHeader = XMLHttpRequest.prototype.setRequestHeader;
+    XMLHttpRequest.prototype.open = function(method, url) {
+        this.__keepalive = {method: method, url: String(url), headers: {}};
+        var xhr = this;
+        this.addEventListener('load', function() {
+            remember(xhr.__keepalive.method, xhr.responseURL || xhr.__keepalive.url, xhr.__keepalive.headers,
+                     xhr.status, xhr.getResponseHeader('content-type'));
+        });
+        return origOpen.apply(this, arguments);
+    };
+    XMLHttpRequest.prototype.setRequestHeader = function(name, value) {
+        if (this.__keepalive) { this.__keepalive.headers[name] = value; }
+        return origSetHeader.apply(this, arguments);
+    };
+    if (window.fetch) {
+        var origFetch = window.fetch;
+        window.fetch = function(input, init) {
+            init = init || {};
+            var method = init.method || (input && input.method) || 'GET';
+            var url = (typeof input === 'string') ? input : input.url;
+            var headers = {};
+            if (init.headers) {
+                if (init.headers.forEach) {
+                    init.headers.forEach(function(v, k) { headers[k] = v; });
+                } else {
+                    for (var k in init.headers) { headers[k] = init.headers[k]; }
+                }
+            }
+            return origFetch.apply(this, arguments).then(function(resp) {
+                remember(method, resp.url || url, headers, resp.status, resp.headers.get('content-type'));
+                return resp;
+            });
+        };
+    }
+}
+return window.__keepaliveRequests.length;
+"""
+
+# Replays the newest recorded request from inside the page (the browser adds its cookies)
+KEEPALIVE_PING_JS = """
+var done = arguments[arguments.length - 1];
+var list = window.__keepaliveRequests || [];
+if (!list.length) { done(null); return; }
+var request = list[list.length - 1];
+var controller = window.AbortController ? new AbortController() : null;
+if (controller) { setTimeout(function() { controller.abort(); }, 10000); }
+fetch(request.url, {credentials: 'include', cache: 'no-store', headers: request.headers,
+                    signal: controller ? controller.signal : undefined})
+    .then(function(resp) {
+        return resp.text().then(function(text) {
+            var code = null;
+            try { code = JSON.parse(text).code; } catch (e) {}
+            done({status: resp.status, url: resp.url, code: code});
+        });
+    })
+    .catch(function(e) { done({error: String(e)}); });
+"""
+
+
+class SessionKeepalive:
+    """
+    Keeps a single-page app session in use during long runs, on the main thread between records.
+    check() replays one of the app's own authenticated requests from inside the page at most
+    every `interval` seconds and reports an expired session (401/403, a redirect to the login
+    page or an error code of 401/403 in the JSON) so the caller can log in before the next record.
+    """
+
+    def __init__(self, interval=240, login_marker="/login"):
+        self.interval = interval
+        self.login_marker = login_marker
+        self.last_check = time.time()
+
+    def install(self, driver):
+        """Start recording the page's requests (call after a full page load)"""
+        try:
+            driver.execute_script(KEEPALIVE_HOOK_JS)
+        except Exception as e:
+            print(f"[DEBUG] Session keepalive hook not installed: {e}")
+
+    def due(self):
+        return time.time() - self.last_check >= self.interval
+
+    def check(self, driver):
+        """True when the site says the session has expired, False when it is alive, None when unknown"""
+        self.last_check = time.time()
+        self.install(driver)
+        try:
+            result = driver.execute_async_script(KEEPALIVE_PING_JS)
+        except Exception as e:
+            print(f"[DEBUG] Session keepalive ping failed: {e}")
+            return None
+        if not result:
+            print("[DEBUG] Session keepalive: no authenticated request seen on this page yet")
+            return None
+        if result.get("error"):
+            print(f"[DEBUG] Session keepalive ping failed: {result['error']}")
+            return None
+        expired = (result.get("status") in (401, 403)
+                   or self.login_marker in urlsplit(result.get("url") or "").path
+                   or str(result.get("code")) in ("401", "403"))
+        if expired:
+            print("\033[93m[WARNING] Session keepalive: the site asks for a login again\033[0m")
+        return expired
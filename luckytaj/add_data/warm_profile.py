@@ -0,0 +1,166 @@
+"""
+Persistent per-site Firefox profiles that keep the HTTP cache between runs
+Every run used to start from a fresh temporary profile and download the back office's
+JS/CSS bundles again. WarmProfile hands out a profile directory under result/profiles
+(one per site, plus extra slots for runs that overlap, e.g. shard workers), locked by
+pid so two browsers never share one, and keeps the disk cache and service workers in it.
+cache_report() reads the Resource Timing entries of the current page to show how much
+of it came from the cache.
+"""
+import atexit
+import os
+
+# Profile slots per site; a run that finds all of them busy falls back to a fresh profile
+MAX_SLOTS = 4
+
+WARM_PREFERENCES = {
+    "browser.cache.disk.enable": True,
+    "browser.cache.disk.smart_size.enabled": False,
+    "browser.cache.disk.capacity": 262144,  # KB
+    "browser.cache.check_doc_frequency": 3,  # revalidate only when the server says the copy is stale
+    "browser.cache.offline.enable": True,
+    "dom.serviceWorkers.enabled": True,
+    "dom.caches.enabled": True,
+    # Do not restore tabs or ask questions after a crashed run
+    "browser.sessionstore.resume_from_crash": False,
+    "browser.shell.checkDefaultBrowser": False,
+    "browser.startup.page": 0,
+}
+
+# {entries, cached, network, cachedBytes, networkBytes}; transferSize 0 with a body means the cache served it
+CACHE_REPORT_JS = """
+var entries = performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'));
+var report = {entries: 0, cached: 0, network: 0, opaque: 0, cachedBytes: 0, networkBytes: 0};
+for (var i = 0; i < entries.length; i++) {
+    var entry = entries[i];
+    report.entries++;
+    if (entry.decodedBodySize === 0 && entry.transferSize === 0) {
+        report.opaque++;  // cross-origin without Timing-Allow-Origin, sizes hidden
+    } else if (entry.transferSize === 0) {
+        report.cached++;
+        report.cachedBytes += entry.decodedBodySize;
+    } else {
+        report.network++;
+        report.networkBytes += entry.transferSize;
+    }
+}
+return report;
+"""
+
+
+def get_profiles_dir():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    working_dir = os.path.dirname(os.path.dirname(script_dir))
+    profiles_dir = os.path.join(working_dir, "result", "profiles")
+    os.makedirs(profiles_dir, exist_ok=True)
+    return profiles_dir
+
+
+def _lock_owner(lock_path):
+    try:
+        with open(lock_path, "r", encoding="utf-8") as f:
+            return int(f.read().strip() or 0)
+    except (OSError, ValueError):
+        return 0
+
+
+def _take_over_stale(lock_path, dead_owner):
+    """
+    Move a dead run's lock out of the way; False when the file turned out to be a live run's lock.
+    The rename is atomic, so when several runs find the same stale lock only one of them moves it.
+    """
+    aside = f"{lock_path}.{os.getpid()}.stale"
+    try:
+        os.rename(lock_path, aside)
+    except FileNotFoundError:
+        return True  # another run moved it first; the O_EXCL create decides who gets the slot
+    if _lock_owner(aside) == dead_owner:
+        os.remove(aside)
+        return True
+    # Another run took the slot between our read and the rename: give its lock back
+    try:
+        os.link(aside, lock_path)
+    except OSError:
+        pass  # a third run holds the slot by now; the displaced run sees that in its re-check
+    os.remove(aside)
+    return False
+
+
+class WarmProfile:
+    """A locked persistent profile directory for one site (released when the script exits)"""
+
+    def __init__(self, name):
+        self.name = "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+        self.path = None
+        self.lock_path = None
+        self.fresh = False
+
+    def acquire(self):
+        """Lock the first free slot; returns its directory or None when every slot is in use"""
+        from browser_daemon import _pid_alive
+
+        profiles_dir = get_profiles_dir()
+        for slot in range(1, MAX_SLOTS + 1):
+            slot_name = self.name if slot == 1 else f"{self.name}-{slot}"
+            lock_path = os.path.join(profiles_dir, f"{slot_name}.lock")
+            owner = _lock_owner(lock_path)
+            if owner and owner != os.getpid() and _pid_alive(owner):
+                continue
+            # Left behind by a run that died, the profile itself is still usable
+            if owner and not _take_over_stale(lock_path, owner):
+                continue
+            try:
+                fd = os.open(lock_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL)
+            except FileExistsError:
+                continue  # another run took it between the check and the open
+            with os.fdopen(fd, "w") as f:
+                f.write(str(os.getpid()))
+            if _lock_owner(lock_path) != os.getpid():
+                continue  # a run taking over the same stale lock moved ours away; the slot is theirs
+            self.lock_path = lock_path
+            self.path = os.path.join(profiles_dir, slot_name)
+            self.fresh = not os.path.isdir(self.path)
+            os.makedirs(self.path, exist_ok=True)
+            atexit.register(self.release)
+            return self.path
+        return None
+
+    def release(self):
+        if self.lock_path and _lock_owner(self.lock_path) == os.getpid():
+            try:
+                os.remove(self.lock_path)
+            except FileNotFoundError:
+                pass
+        self.lock_path = None
+
+    def apply(self, options):
+        """Point Firefox Options at the locked profile (used in place, not copied); False when no slot was free"""
+        if self.path is None and self.acquire() is None:
+            print(f"\033[93m[WARNING] All {MAX_SLOTS} warm profiles for {self.name} are in use, starting with a fresh one\033[0m")
+            return False
+        options.add_argument("-profile")
+        options.add_argument(self.path)
+        for name, value in WARM_PREFERENCES.items():
+            options.set_preference(name, value)
+        state = "new, the first load fills its cache" if self.fresh else "warm"
+        print(f"[INFO] Using persistent browser profile {os.path.basename(self.path)} ({state})")
+        return True
+
+
+def cache_report(driver, label):
+    """Print how much of the current page came from the browser cache; returns the counts or None"""
+    try:
+        report = driver.execute_script(CACHE_REPORT_JS)
+    except Exception as e:
+        print(f"[DEBUG] Cache report not available: {e}")
+        return None
+    measured = report["cached"] + report["network"]
+    if not measured:
+        return report
+    total_bytes = report["cachedBytes"] + report["networkBytes"]
+    opaque = f", {report['opaque']} cross-origin not measurable" if report["opaque"] else ""
+    print(f"[INFO] {label}: {report['cached']}/{measured} resources from the browser cache "
+          f"({report['cachedBytes'] / 1024:.0f} KB cached, {report['networkBytes'] / 1024:.0f} KB downloaded{opaque})")
+    if total_bytes and report["cachedBytes"] / total_bytes >= 0.5:
+        print(f"[INFO] {label} loaded warm")
+    return report
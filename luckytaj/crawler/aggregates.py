@@ -0,0 +1,87 @@
+"""
+One-pass totals for the transaction report
+Turns the collected records into column arrays once (amount, fee, gateway code, day, hour)
+and sums count, amount and fee per gateway, per day and per hour with np.bincount, so the
+extraction summary, the per-section report and the grand-total table all read the same
+totals instead of summing the record lists again. Falls back to a plain Python loop
+when NumPy is not installed. Amounts and fees are integer paise (money.py), so the totals
+are exact.
+"""
+from collections import namedtuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+Totals = namedtuple("Totals", "count amount fee")
+SectionTotals = namedtuple("SectionTotals", "total gateways days hours")
+
+
+def _hour(time_text):
+    """Hour of a 'YYYY-MM-DD HH:MM:SS' time, -1 when missing"""
+    try:
+        return int(time_text[11:13])
+    except (TypeError, ValueError):
+        return -1
+
+
+def _columns(records):
+    """Column lists plus the gateway and day keys in first-seen order"""
+    gateway_codes, day_codes = {}, {}
+    amounts, fees, gateways, days, hours = [], [], [], [], []
+    for record in records:
+        amounts.append(record["Amount"] or 0)
+        fees.append(record.get("Tax Fee", 0) or 0)
+        gateways.append(gateway_codes.setdefault(record["Gateway"], len(gateway_codes)))
+        days.append(day_codes.setdefault(record.get("Date"), len(day_codes)))
+        hours.append(_hour(record.get("Time")))
+    return amounts, fees, gateways, days, hours, list(gateway_codes), list(day_codes)
+
+
+def _grouped_numpy(codes, amounts, fees, keys):
+    # bincount sums its weights as float64, exact for integer paise up to 2**53
+    counts = np.bincount(codes, minlength=len(keys))
+    amount_sums = np.rint(np.bincount(codes, weights=amounts, minlength=len(keys))).astype(np.int64)
+    fee_sums = np.rint(np.bincount(codes, weights=fees, minlength=len(keys))).astype(np.int64)
+    return {key: Totals(int(counts[i]), int(amount_sums[i]), int(fee_sums[i]))
+            for i, key in enumerate(keys) if counts[i]}
+
+
+def _grouped_python(codes, amounts, fees, keys):
+    sums = [[0, 0, 0] for _ in keys]
+    for code, amount, fee in zip(codes, amounts, fees):
+        entry = sums[code]
+        entry[0] += 1
+        entry[1] += amount
+        entry[2] += fee
+    return {key: Totals(*sums[i]) for i, key in enumerate(keys) if sums[i][0]}
+
+
+def aggregate_records(records):
+    """SectionTotals (total, per gateway, per day, per hour) for a list of transaction records"""
+    amounts, fees, gateways, days, hours, gateway_keys, day_keys = _columns(records)
+    hour_keys = list(range(-1, 24))
+    if np is not None and amounts:
+        amounts, fees = np.asarray(amounts, dtype=np.int64), np.asarray(fees, dtype=np.int64)
+        grouped = _grouped_numpy
+        hour_codes = np.asarray(hours, dtype=np.int64) + 1
+        gateways, days = np.asarray(gateways, dtype=np.int64), np.asarray(days, dtype=np.int64)
+        total = Totals(len(amounts), int(amounts.sum()), int(fees.sum()))
+    else:
+        grouped = _grouped_python
+        hour_codes = [hour + 1 for hour in hours]
+        total = Totals(len(amounts), sum(amounts), sum(fees))
+    by_hour = grouped(hour_codes, amounts, fees, hour_keys)
+    by_hour.pop(-1, None)  # rows without a time only count in the other breakdowns
+    return SectionTotals(
+        total=total,
+        gateways=grouped(gateways, amounts, fees, gateway_keys),
+        days=dict(sorted(grouped(days, amounts, fees, day_keys).items(), key=lambda item: str(item[0]))),
+        hours=by_hour,
+    )
+
+
+def aggregate_groups(groups):
+    """aggregate_records over {gateway: [records]} (keeps the groups' gateway order)"""
+    return aggregate_records([record for records in groups.values() for record in records])
@@ -0,0 +1,367 @@
+"""
+Back-office JSON data source for the transaction crawler
+Captures the XHR/fetch request that fills the deposit/withdrawal table, then replays it
+over a pooled HTTP session (reusing the browser's cookies) to page through the JSON directly
+"""
+import json
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode, urljoin
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Records are handed to table_snapshot.parse_transaction_rows as plain rows in this order
+API_COLUMNS = {
+    "min_cols": 7,
+    "order_id": 0,
+    "player_id": 1,
+    "phone": 2,
+    "amount": 3,
+    "tax_fee": 4,
+    "time": 5,
+    "gateway": 6,
+}
+
+# Candidate JSON keys per record field (first match wins, dotted paths allowed).
+# Override per site with config["api_field_map"].
+DEFAULT_FIELD_MAP = {
+    "Order ID": ["orderId", "orderNo", "order_id", "orderNumber", "transactionId", "id"],
+    "Player ID": ["playerId", "memberId", "player_id", "memberCode", "userName", "username"],
+    "Phone Number": ["phone", "phoneNumber", "mobile", "mobileNo", "memberPhone"],
+    "Amount": ["amount", "orderAmount", "transactionAmount", "realAmount"],
+    "Tax Fee": ["taxFee", "fee", "tax_fee", "handlingFee", "serviceFee"],
+    "Time": ["createTime", "createdAt", "created_at", "orderTime", "approveTime", "time"],
+    "Gateway": ["gateway", "gatewayName", "channelName", "paymentChannel", "payChannel", "channel"],
+}
+
+PAGE_KEYS = ("page", "pageNo", "pageNum", "pageIndex", "currentPage", "current", "page_no")
+SIZE_KEYS = ("pageSize", "size", "limit", "perPage", "per_page", "page_size", "rows")
+TOTAL_KEYS = ("total", "totalCount", "totalRecords", "totalElements", "recordsTotal", "count")
+
+PAGE_SIZE_CANDIDATES = (1000, 500, 200, 100, 50)
+
+# India timezone UTC+05:30 (epoch timestamps are rendered in this zone)
+INDIA_TZ = timezone(timedelta(hours=5, minutes=30))
+
+# Records every XHR/fetch made by the page together with its JSON response
+CAPTURE_HOOK_JS = """
+if (!window.__boCapture) {
+    window.__boCapture = [];
+    var origOpen = XMLHttpRequest.prototype.open;
+    var origSend = XMLHttpRequest.prototype.send;
+    var origSetHeader = XMLHttpRequest.prototype.setRequestHeader;
+    XMLHttpRequest.prototype.open = function(method, url) {
+        this.__capture = {method: method, url: String(url), headers: {}, body: null};
+        return origOpen.apply(this, arguments);
+    };
+    XMLHttpRequest.prototype.setRequestHeader = function(name, value) {
+        if (this.__capture) { this.__capture.headers[name] = value; }
+        return origSetHeader.apply(this, arguments);
+    };
+    XMLHttpRequest.prototype.send = function(body) {
+        var xhr = this;
+        if (xhr.__capture) {
+            xhr.__capture.body = (typeof body === 'string') ? body : null;
+            xhr.addEventListener('load', function() {
+                var text = '';
+                try { text = xhr.responseText; } catch (e) { text = JSON.stringify(xhr.response); }
+                xhr.__capture.status = xhr.status;
+                xhr.__capture.url = xhr.responseURL || xhr.__capture.url;
+                xhr.__capture.response = text;
+                window.__boCapture.push(xhr.__capture);
+            });
+        }
+        return origSend.apply(this, arguments);
+    };
+    if (window.fetch) {
+        var origFetch = window.fetch;
+        window.fetch = function(input, init) {
+            init = init || {};
+            var entry = {
+                method: init.method || (input && input.method) || 'GET',
+                url: (typeof input === 'string') ? input : input.url,
+                headers: {},
+                body: (typeof init.body === 'string') ? init.body : null
+            };
+            if (init.headers) {
+                if (init.headers.forEach) {
+                    init.headers.forEach(function(v, k) { entry.headers[k] = v; });
+                } else {
+                    for (var k in init.headers) { entry.headers[k] = init.headers[k]; }
+                }
+            }
+            return origFetch.apply(this, arguments).then(function(resp) {
+                resp.clone().text().then(function(t) {
+                    entry.status = resp.status;
+                    entry.url = resp.url || entry.url;
+                    entry.response = t;
+                    window.__boCapture.push(entry);
+                });
+                return resp;
+            });
+        };
+    }
+}
+window.__boCapture.length = 0;
+return true;
+"""
+
+
+def install_capture_hook(driver):
+    """Install (or reset) the request capture hook in the current page"""
+    driver.execute_script(CAPTURE_HOOK_JS)
+
+
+def read_captured_requests(driver):
+    """Return the requests captured since the hook was installed"""
+    return driver.execute_script("return window.__boCapture || [];") or []
+
+
+def _load_json(text):
+    try:
+        return json.loads(text) if text else None
+    except (TypeError, ValueError):
+        return None
+
+
+def find_record_list(payload):
+    """Return the largest list of objects inside a JSON payload (the table rows)"""
+    best = []
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            if node and all(isinstance(item, dict) for item in node) and len(node) > len(best):
+                best = node
+            stack.extend(item for item in node if isinstance(item, (dict, list)))
+    return best
+
+
+def find_total(payload):
+    """Return the total row count reported by the API, or None"""
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            for key in TOTAL_KEYS:
+                value = node.get(key)
+                if isinstance(value, int) and not isinstance(value, bool):
+                    return value
+            stack.extend(v for v in node.values() if isinstance(v, dict))
+    return None
+
+
+def _lookup(item, key):
+    """Look up a (possibly dotted) key in a JSON object"""
+    value = item
+    for part in key.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+
+def _has_paging(request):
+    """True if the request carries a page/size parameter we can drive"""
+    parts = urlsplit(request["url"])
+    params = dict(parse_qsl(parts.query))
+    body = _load_json(request.get("body"))
+    if not isinstance(body, dict):
+        body = dict(parse_qsl(request.get("body") or ""))
+    keys = set(params) | set(body)
+    return any(k in keys for k in PAGE_KEYS) and any(k in keys for k in SIZE_KEYS)
+
+
+def find_table_request(captured, field_map=None):
+    """
+    Pick the captured request that filled the table: a JSON response holding a list of
+    objects with an order-ID field, and page/size parameters we can change.
+    """
+    field_map = field_map or DEFAULT_FIELD_MAP
+    order_keys = field_map.get("Order ID", DEFAULT_FIELD_MAP["Order ID"])
+    best = None
+    best_rows = -1
+    for request in captured:
+        if request.get("status") and request["status"] >= 400:
+            continue
+        rows = find_record_list(_load_json(request.get("response")))
+        if not rows or not any(_lookup(rows[0], key) is not None for key in order_keys):
+            continue
+        if not _has_paging(request):
+            continue
+        if len(rows) > best_rows:
+            best, best_rows = request, len(rows)
+    return best
+
+
+def format_api_time(value):
+    """Normalise an API timestamp to 'YYYY-MM-DD HH:MM:SS' (India time for epochs)"""
+    if value is None or value == "":
+        return ""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        seconds = value / 1000 if value > 10**11 else value
+        return datetime.fromtimestamp(seconds, INDIA_TZ).strftime("%Y-%m-%d %H:%M:%S")
+    text = str(value).strip().replace("T", " ")
+    return text[:19]
+
+
+def api_item_to_row(item, field_map=None):
+    """Project one JSON row onto the API_COLUMNS order as strings"""
+    field_map = field_map or DEFAULT_FIELD_MAP
+    row = []
+    for field in ("Order ID", "Player ID", "Phone Number", "Amount", "Tax Fee", "Time", "Gateway"):
+        value = None
+        for key in field_map.get(field, DEFAULT_FIELD_MAP[field]):
+            value = _lookup(item, key)
+            if value is not None:
+                break
+        if field == "Time":
+            row.append(format_api_time(value))
+        elif field == "Gateway" and value in (None, ""):
+            row.append("Unknown")
+        else:
+            row.append("" if value is None else str(value).strip())
+    return row
+
+
+class ApiTableClient:
+    """Replays a captured table request with different page/size parameters"""
+
+    def __init__(self, request, cookies=None, user_agent=None, referer=None, pool_size=4):
+        self.method = (request.get("method") or "GET").upper()
+        parts = urlsplit(request["url"])
+        self._url_parts = parts
+        self.query = parse_qsl(parts.query, keep_blank_values=True)
+
+        raw_body = request.get("body")
+        self.json_body = _load_json(raw_body)
+        if not isinstance(self.json_body, dict):
+            self.json_body = None
+        self.form_body = parse_qsl(raw_body, keep_blank_values=True) if raw_body and self.json_body is None else None
+
+        params = dict(self.query)
+        params.update(self.json_body or {})
+        params.update(dict(self.form_body or []))
+        self.page_key = next((k for k in PAGE_KEYS if k in params), None)
+        self.size_key = next((k for k in SIZE_KEYS if k in params), None)
+        if not self.page_key or not self.size_key:
+            raise ValueError(f"Captured request has no page/size parameters: {request['url']}")
+        try:
+            self.first_page = int(params[self.page_key])
+        except (TypeError, ValueError):
+            self.first_page = 1
+        self.first_page = 0 if self.first_page == 0 else 1
+        # (size, items, total) of the first page fetched by negotiate_page_size, reused by iter_pages
+        self._first_response = None
+
+        self.session = requests.Session()
+        retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(502, 503, 504))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        skip_headers = {"content-length", "host", "cookie"}
+        for name, value in (request.get("headers") or {}).items():
+            if name.lower() not in skip_headers:
+                self.session.headers[name] = value
+        if user_agent:
+            self.session.headers["User-Agent"] = user_agent
+        if referer:
+            self.session.headers["Referer"] = referer
+        for cookie in cookies or []:
+            extra = {"domain": cookie["domain"]} if cookie.get("domain") else {}
+            self.session.cookies.set(cookie["name"], cookie["value"], path=cookie.get("path", "/"), **extra)
+
+    @classmethod
+    def from_driver(cls, driver, request):
+        """Build a client that shares the logged-in browser's cookies"""
+        request = dict(request)
+        request["url"] = urljoin(driver.current_url, request["url"])
+        user_agent = driver.execute_script("return navigator.userAgent;")
+        return cls(request, cookies=driver.get_cookies(), user_agent=user_agent, referer=driver.current_url)
+
+    def fetch_page(self, page, size):
+        """Fetch one page; returns (items, total)"""
+        overrides = {self.page_key: page, self.size_key: size}
+        query_keys = dict(self.query)
+
+        # Each parameter is sent back where the page put it (query string, JSON or form body)
+        query = [(k, v) for k, v in self.query if k not in overrides]
+        json_body = dict(self.json_body) if self.json_body is not None else None
+        form_body = [(k, v) for k, v in self.form_body if k not in overrides] if self.form_body is not None else None
+        for key, value in overrides.items():
+            if key in query_keys or (json_body is None and form_body is None):
+                query.append((key, str(value)))
+            elif json_body is not None:
+                json_body[key] = value
+            else:
+                form_body.append((key, str(value)))
+
+        url = urlunsplit(self._url_parts._replace(query=urlencode(query)))
+        response = self.session.request(
+            self.method, url,
+            json=json_body,
+            data=urlencode(form_body) if form_body is not None else None,
+            timeout=30,
+        )
+        response.raise_for_status()
+        payload = response.json()
+        return find_record_list(payload), find_total(payload)
+
+    def negotiate_page_size(self, candidates=PAGE_SIZE_CANDIDATES):
+        """
+        Return the largest page size the API honours, or None when every size is rejected.
+        Sizes that error out are skipped; a silently capped size is replaced by the cap.
+        The accepted first page is kept so iter_pages does not fetch it again.
+        """
+        for size in candidates:
+            try:
+                items, total = self.fetch_page(self.first_page, size)
+            except Exception as e:
+                print(f"[DEBUG] Page size {size} rejected: {e}")
+                continue
+            if items and len(items) < size and self._more_rows_after(items, total, size):
+                print(f"[INFO] API capped page size {size} at {len(items)}")
+                size = len(items)
+            else:
+                print(f"[INFO] Using API page size {size}")
+            self._first_response = (size, items, total)
+            return size
+        print("[WARNING] The API rejected every page size")
+        return None
+
+    def _more_rows_after(self, items, total, size):
+        """
+        Whether a short first page was capped rather than the last page. Without a total in
+        the response, page 2 is fetched: a capped server returns more rows there.
+        """
+        if total is not None:
+            return total > len(items)
+        try:
+            next_items, _ = self.fetch_page(self.first_page + 1, size)
+        except Exception as e:
+            print(f"[DEBUG] Page 2 at size {size} could not be checked: {e}")
+            return True  # Unknown: the shorter size is still correct if it was the last page
+        return bool(next_items)
+
+    def iter_pages(self, size):
+        """Yield (page_number, items) until the API runs out of rows"""
+        page = self.first_page
+        page_number = 1
+        first, self._first_response = self._first_response, None
+        while True:
+            if first is not None and first[0] == size:
+                _, items, total = first
+                first = None
+            else:
+                items, total = self.fetch_page(page, size)
+            if not items:
+                return
+            yield page_number, items
+            if len(items) < size or (total is not None and (page_number * size) >= total):
+                return
+            page += 1
+            page_number += 1
@@ -0,0 +1,256 @@
+"""
+Persistent browser-session daemon for the Selenium automation scripts
+Keeps one logged-in browser per site alive between runs, so transaction.py, phone_number.py
+and the add_data scripts attach to it instead of starting Firefox and logging in again.
+
+Start it once (leave the window open):   python browser_daemon.py
+Stop it with Ctrl+C or:                  python browser_daemon.py stop
+"""
+import json
+import os
+import platform
+import signal
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qsl, urlencode
+from urllib.request import urlopen
+
+from selenium import webdriver
+from selenium.webdriver.firefox.options import Options
+
+from driver_bootstrap import start_driver
+from warm_profile import WarmProfile
+
+
+def get_state_file_path():
+    """Path of the file that tells scripts where the daemon is listening"""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    working_dir = os.path.dirname(os.path.dirname(script_dir))
+    result_dir = os.path.join(working_dir, "result")
+    os.makedirs(result_dir, exist_ok=True)
+    return os.path.join(result_dir, ".browser_daemon.json")
+
+
+def _pid_alive(pid):
+    """Check whether a process is still running (Windows and Unix)"""
+    if platform.system() == "Windows":
+        import ctypes
+        handle = ctypes.windll.kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        exit_code = ctypes.c_ulong()
+        ctypes.windll.kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code))
+        ctypes.windll.kernel32.CloseHandle(handle)
+        return exit_code.value == 259  # STILL_ACTIVE
+    try:
+        os.kill(pid, 0)
+        return True
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+
+
+def _driver_alive(driver):
+    try:
+        driver.window_handles
+        return True
+    except Exception:
+        return False
+
+
+# ======== Daemon ========
+
+class BrowserDaemon:
+    """Owns one browser per session name and leases it to one script at a time"""
+
+    def __init__(self):
+        self.sessions = {}  # session name -> driver
+        self.leases = {}    # session name -> pid of the attached script
+        self.lock = threading.Lock()
+
+    def _start_browser(self, name):
+        options = Options()
+        # Persistent profile per session (result/profiles), locked by the daemon while it runs
+        WarmProfile(name).apply(options)
+        driver = start_driver(options)
+        if driver is None:
+            raise RuntimeError("no browser could be started (see the daemon's output)")
+        return driver
+
+    def acquire(self, name, pid):
+        with self.lock:
+            holder = self.leases.get(name)
+            if holder and holder != pid and _pid_alive(holder):
+                raise RuntimeError(f"session '{name}' is in use by process {holder}")
+
+            driver = self.sessions.get(name)
+            if driver is not None and not _driver_alive(driver):
+                print(f"[WARNING] Browser for '{name}' is gone, starting a new one")
+                self.sessions.pop(name, None)
+                driver = None
+
+            is_new = driver is None
+            if is_new:
+                print(f"[INFO] Starting browser for '{name}'...")
+                driver = self._start_browser(name)
+                self.sessions[name] = driver
+
+            self.leases[name] = pid
+            print(f"[INFO] '{name}' attached by process {pid}")
+            return {
+                "executor_url": driver.service.service_url,
+                "session_id": driver.session_id,
+                "new": is_new,
+            }
+
+    def release(self, name, pid):
+        with self.lock:
+            if self.leases.get(name) == pid:
+                self.leases.pop(name, None)
+                print(f"[INFO] '{name}' released by process {pid}")
+        return {"released": True}
+
+    def status(self):
+        with self.lock:
+            return {name: {"leased_by": self.leases.get(name)} for name in self.sessions}
+
+    def shutdown(self):
+        with self.lock:
+            for name, driver in self.sessions.items():
+                try:
+                    driver.quit()
+                    print(f"[INFO] Closed browser for '{name}'")
+                except Exception:
+                    pass
+            self.sessions.clear()
+            self.leases.clear()
+
+
+def serve():
+    """Run the daemon until Ctrl+C (or 'python browser_daemon.py stop')"""
+    daemon = BrowserDaemon()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            params = dict(parse_qsl(parts.query))
+            try:
+                if parts.path == "/acquire":
+                    body = daemon.acquire(params["name"], int(params["pid"]))
+                elif parts.path == "/release":
+                    body = daemon.release(params["name"], int(params["pid"]))
+                elif parts.path == "/status":
+                    body = daemon.status()
+                elif parts.path == "/stop":
+                    body = {"stopping": True}
+                    threading.Thread(target=server.shutdown, daemon=True).start()
+                else:
+                    self.send_error(404)
+                    return
+                code = 200
+            except Exception as e:
+                body, code = {"error": str(e)}, 409
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    state_path = get_state_file_path()
+    with open(state_path, "w", encoding="utf-8") as f:
+        json.dump({"port": server.server_port, "pid": os.getpid()}, f)
+
+    def handle_signal(signum, frame):
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
+
+    print(f"\033[92m[INFO] Browser daemon listening on 127.0.0.1:{server.server_port}\033[0m")
+    print("[INFO] Scripts will now attach to kept-alive browsers. Press Ctrl+C to stop.")
+    try:
+        server.serve_forever()
+    finally:
+        daemon.shutdown()
+        server.server_close()
+        if os.path.exists(state_path):
+            os.remove(state_path)
+        print("[INFO] Browser daemon stopped")
+
+
+# ======== Client ========
+
+def _call_daemon(action, timeout=120, **params):
+    """Call the running daemon; returns the JSON reply or None if no daemon is running"""
+    try:
+        with open(get_state_file_path(), "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not _pid_alive(state.get("pid", 0)):
+        return None
+    url = f"http://127.0.0.1:{state['port']}/{action}?{urlencode(params)}"
+    with urlopen(url, timeout=timeout) as response:
+        return json.loads(response.read().decode("utf-8"))
+
+
+class AttachedDriver(webdriver.Remote):
+    """
+    Remote driver bound to one of the daemon's browser sessions.
+    quit() only hands the browser back to the daemon; the browser stays open and logged in.
+    """
+
+    def __init__(self, session_name, executor_url, session_id, is_new_session):
+        self._attach_session_id = session_id
+        self.session_name = session_name
+        self.is_new_session = is_new_session
+        super().__init__(command_executor=executor_url, options=Options())
+
+    def start_session(self, capabilities, *args, **kwargs):
+        # Reuse the daemon's session instead of creating a new one
+        self.session_id = self._attach_session_id
+        self.caps = {}
+
+    def quit(self):
+        try:
+            _call_daemon("release", timeout=10, name=self.session_name, pid=os.getpid())
+        except Exception as e:
+            print(f"[WARNING] Could not release '{self.session_name}' to the browser daemon: {e}")
+
+
+def attach_browser(session_name):
+    """
+    Attach to the daemon's browser for `session_name` (e.g. 'backoffice-luckytaj.com').
+    Returns an AttachedDriver, or None when no daemon is running so the caller cold-starts.
+    """
+    try:
+        info = _call_daemon("acquire", name=session_name, pid=os.getpid())
+    except Exception as e:
+        print(f"[WARNING] Browser daemon unavailable ({e}), starting a new browser")
+        return None
+    if not info:
+        return None
+
+    driver = AttachedDriver(session_name, info["executor_url"], info["session_id"], info["new"])
+    state = "new browser" if info["new"] else "existing session"
+    print(f"✅ Attached to browser daemon ({state} for {session_name})")
+    return driver
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "stop":
+        reply = _call_daemon("stop", timeout=10)
+        print("[INFO] Stop requested" if reply else "[INFO] No browser daemon is running")
+    elif len(sys.argv) > 1 and sys.argv[1] == "status":
+        reply = _call_daemon("status", timeout=10)
+        print(json.dumps(reply, indent=2) if reply is not None else "[INFO] No browser daemon is running")
+    else:
+        serve()
@@ -0,0 +1,96 @@
+"""
+Crash-safe page journal for the transaction crawler
+Every parsed page is appended (and fsynced) to result/journal/<site>_<mode>_<start>_<end>.jsonl,
+so a crawl killed by Ctrl+C or a dead browser can be continued with --resume
+"""
+import json
+import os
+
+from records import TransactionRecord
+
+
+def get_journal_path(site_key, mode, start_date, end_date):
+    """Journal file for one site, mode and date range"""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    working_dir = os.path.dirname(os.path.dirname(script_dir))
+    journal_dir = os.path.join(working_dir, "result", "journal")
+    os.makedirs(journal_dir, exist_ok=True)
+    return os.path.join(journal_dir, f"{site_key}_{mode}_{start_date}_{end_date}.jsonl")
+
+
+def _append_line(path, entry):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def start_journal(path, filters):
+    """Start a fresh journal whose first line records the filter state"""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"filters": filters}) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def append_journal_page(path, page, records):
+    """Durably record one parsed page"""
+    _append_line(path, {
+        "page": page,
+        "records": [record.to_json() for record in records],
+    })
+
+
+def mark_journal_complete(path):
+    """Record that the crawl for this journal reached its end"""
+    _append_line(path, {"complete": True})
+
+
+def load_journal(path, filters):
+    """
+    Read a journal back for --resume.
+    Returns {"last_page", "records", "complete"} or None when there is no journal
+    or it was written with different filters. A torn last line (crash mid-write) is ignored.
+    """
+    if not os.path.exists(path):
+        return None
+
+    last_page = 0
+    records = []
+    complete = False
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        lines = f.readlines()
+
+    valid_bytes = 0
+    for line_number, line in enumerate(lines):
+        try:
+            if not line.endswith("\n"):
+                raise ValueError("torn line")
+            entry = json.loads(line)
+        except ValueError:
+            print(f"[WARNING] Ignoring incomplete journal line {line_number + 1}")
+            break
+        valid_bytes += len(line.encode("utf-8"))
+        if line_number == 0:
+            if entry.get("filters") != filters:
+                print("\033[93m[WARNING] Journal was written with different filters, starting over\033[0m")
+                return None
+            continue
+        if entry.get("complete"):
+            complete = True
+            continue
+        records.extend(TransactionRecord.from_dict(record) for record in entry["records"])
+        last_page = max(last_page, entry["page"])
+
+    # Cut off a torn tail so the resumed crawl appends after the last good line
+    if valid_bytes < os.path.getsize(path):
+        with open(path, "r+b") as f:
+            f.truncate(valid_bytes)
+
+    return {"last_page": last_page, "records": records, "complete": complete}
+
+
+def finish_journal(path):
+    """Remove a journal once its results have been written"""
+    if os.path.exists(path):
+        os.remove(path)
@@ -0,0 +1,137 @@
+"""
+Incremental crawl state for the transaction crawler
+Stores the records collected per site and mode (deposit/withdrawal) together with the
+high-water mark (newest Order ID and time seen) and the day ranges that were actually
+crawled, so a re-run only pages until it reaches rows the previous run already has
+"""
+import json
+import os
+from datetime import date, datetime, timedelta
+
+from records import TransactionRecord
+
+# Stored records older than this are dropped (and the covered ranges move forward)
+STATE_RETENTION_DAYS = 7
+# 2: "covered" list of crawled [from, to] day ranges instead of a single covered_from
+STATE_FORMAT = 2
+
+
+def get_state_path(site_key, mode):
+    """State file for one site and mode (result/state/<site>_<mode>.json)"""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    working_dir = os.path.dirname(os.path.dirname(script_dir))
+    state_dir = os.path.join(working_dir, "result", "state")
+    os.makedirs(state_dir, exist_ok=True)
+    return os.path.join(state_dir, f"{site_key}_{mode}.json")
+
+
+def _parse_day(text):
+    return datetime.strptime(text, "%Y-%m-%d").date()
+
+
+def merge_ranges(ranges):
+    """Sort (from, to) day ranges and join the ones that overlap or touch"""
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def load_crawl_state(site_key, mode):
+    """Return the stored state dict (records with Date objects, covered day ranges) or None"""
+    path = get_state_path(site_key, mode)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("format") != STATE_FORMAT:
+            # Older states only kept covered_from, which cannot tell crawled days from gaps
+            print(f"[INFO] Crawl state {os.path.basename(path)} has no crawled day ranges, starting it over")
+            return None
+        state["covered"] = [(_parse_day(start), _parse_day(end)) for start, end in state["covered"]]
+        state["records"] = [TransactionRecord.from_dict(record) for record in state["records"]]
+        return state
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"\033[93m[WARNING] Ignoring unreadable crawl state {path}: {e}\033[0m")
+        return None
+
+
+def get_known_records(site_key, mode, start_date, end_date):
+    """
+    Records from the previous runs that can stand in for re-crawled pages, or None when no
+    crawled range contains start_date (full crawl needed).
+    Only the records of the crawled range that contains start_date are returned: the crawl pages
+    from end_date down until it meets one of them, and every day from there back to start_date
+    was crawled without a gap. Records of other ranges would stop the paging above a gap.
+    """
+    state = load_crawl_state(site_key, mode)
+    if state is None:
+        print(f"[INFO] No {mode} crawl state for {site_key} yet, doing a full crawl")
+        return None
+    covering = next(((start, end) for start, end in state["covered"] if start <= start_date <= end), None)
+    if covering is None:
+        ranges = ", ".join(f"{start} to {end}" for start, end in state["covered"]) or "nothing"
+        print(f"[INFO] {mode.capitalize()} crawl state covers {ranges}, not {start_date}; doing a full crawl")
+        return None
+
+    covered_from, covered_to = covering
+    known = [record for record in state["records"]
+             if covered_from <= record["Date"] <= min(covered_to, end_date)]
+    print(f"[INFO] Incremental {mode} crawl: {len(known)} stored records crawled from {covered_from} to {covered_to}")
+    return known
+
+
+def save_crawl_state(site_key, mode, records, start_date, end_date):
+    """
+    Merge freshly collected records (complete for start_date..end_date) into the stored set
+    (new rows win on Order ID), add the range to the crawled ranges, update the high-water mark
+    and write the state atomically.
+    """
+    state = load_crawl_state(site_key, mode)
+    merged = {}
+    covered = [(start_date, end_date)]
+    if state is not None:
+        covered += state["covered"]
+        merged = {record["Order ID"]: record for record in state["records"]}
+    for record in records:
+        merged[record["Order ID"]] = record
+
+    cutoff = date.today() - timedelta(days=STATE_RETENTION_DAYS)
+    covered = [(max(start, cutoff), end) for start, end in merge_ranges(covered) if end >= cutoff]
+    kept = [record for record in merged.values()
+            if any(start <= record["Date"] <= end for start, end in covered)]
+
+    high_water = {}
+    if kept:
+        newest = max(kept, key=lambda record: record["Time"])
+        high_water = {"order_id": newest["Order ID"], "time": newest["Time"]}
+
+    path = get_state_path(site_key, mode)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "format": STATE_FORMAT,
+            "covered": [[str(start), str(end)] for start, end in covered],
+            "high_water": high_water,
+            "records": [record.to_json() for record in kept],
+        }, f)
+    os.replace(tmp_path, path)
+    print(f"[INFO] Saved {mode} crawl state: {len(kept)} records, newest Order ID {high_water.get('order_id')}")
+
+
+def merge_known_records(all_collected_records, known_records, seen_order_ids, start_date, end_date):
+    """Add stored records in the date range that this run did not re-collect. Returns the count added."""
+    added = 0
+    for record in known_records or []:
+        if record["Order ID"] in seen_order_ids or not (start_date <= record["Date"] <= end_date):
+            continue
+        all_collected_records.append(record)
+        seen_order_ids.add(record["Order ID"])
+        added += 1
+    if known_records is not None:
+        print(f"[INFO] Merged {added} stored records from previous runs")
+    return added
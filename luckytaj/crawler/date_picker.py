@@ -0,0 +1,145 @@
+"""
+Direct date injection for the back office's o-dp-trig date pickers
+Sets the picker's value in one script call (through the component's model when the
+picker is a Vue component, else through its input plus input/change events) and
+verifies it by reading the rendered label back. set_browser_date falls back to
+clicking through the calendar when the check fails.
+"""
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Sets the date of the picker under a label. Returns {method, text} or null when no picker is found.
+INJECT_DATE_JS = """
+var labelText = arguments[0], iso = arguments[1];
+var parts = iso.split('-');
+var year = parseInt(parts[0], 10), month = parseInt(parts[1], 10), day = parseInt(parts[2], 10);
+
+var labels = document.querySelectorAll('div.label');
+var container = null;
+for (var i = 0; i < labels.length; i++) {
+    if ((labels[i].textContent || '').trim() === labelText) {
+        var sibling = labels[i].nextElementSibling;
+        while (sibling && !sibling.querySelector('.o-dp-trig') && !sibling.classList.contains('o-dp-trig')) {
+            sibling = sibling.nextElementSibling;
+        }
+        container = sibling;
+        break;
+    }
+}
+if (!container) { return null; }
+var trigger = container.classList.contains('o-dp-trig') ? container : container.querySelector('.o-dp-trig');
+
+// Same kind of value as the current one, with only the date part replaced
+function withDate(current) {
+    if (current instanceof Date) {
+        var next = new Date(current.getTime());
+        next.setFullYear(year, month - 1, day);
+        return next;
+    }
+    if (typeof current === 'number') {
+        var stamp = new Date(current);
+        stamp.setFullYear(year, month - 1, day);
+        return current < 1e11 ? Math.floor(stamp.getTime() / 1000) : stamp.getTime();
+    }
+    if (typeof current === 'string' && /\\d{4}-\\d{2}-\\d{2}/.test(current)) {
+        return current.replace(/\\d{4}-\\d{2}-\\d{2}/, iso);
+    }
+    if (typeof current === 'string' && /\\d{4}\\/\\d{2}\\/\\d{2}/.test(current)) {
+        return current.replace(/\\d{4}\\/\\d{2}\\/\\d{2}/, iso.replace(/-/g, '/'));
+    }
+    return undefined;
+}
+
+// 1. Vue component model (Vue 2 __vue__, Vue 3 __vueParentComponent), nearest component first
+for (var el = trigger; el && el !== container.parentElement; el = el.parentElement) {
+    var vm2 = el.__vue__;
+    if (vm2) {
+        var keys2 = ['value', 'modelValue', 'date'];
+        for (var k = 0; k < keys2.length; k++) {
+            if (vm2.$props && keys2[k] in vm2.$props) {
+                var next2 = withDate(vm2.$props[keys2[k]]);
+                if (next2 !== undefined) {
+                    vm2.$emit(keys2[k] === 'modelValue' ? 'update:modelValue' : 'input', next2);
+                    vm2.$emit('change', next2);
+                    return {method: 'vue2', text: (trigger.textContent || '').trim()};
+                }
+            }
+        }
+    }
+    var vm3 = el.__vueParentComponent;
+    if (vm3 && vm3.props) {
+        var keys3 = ['modelValue', 'value'];
+        for (var m = 0; m < keys3.length; m++) {
+            if (keys3[m] in vm3.props) {
+                var next3 = withDate(vm3.props[keys3[m]]);
+                if (next3 !== undefined) {
+                    vm3.emit(keys3[m] === 'modelValue' ? 'update:modelValue' : 'input', next3);
+                    vm3.emit('change', next3);
+                    return {method: 'vue3', text: (trigger.textContent || '').trim()};
+                }
+            }
+        }
+    }
+}
+
+// 2. Underlying input: native value setter so framework listeners see the change
+var input = container.querySelector('input');
+if (input) {
+    var next = withDate(input.value) || iso;
+    var setter = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+    setter.call(input, next);
+    input.dispatchEvent(new Event('input', {bubbles: true}));
+    input.dispatchEvent(new Event('change', {bubbles: true}));
+    return {method: 'input', text: (trigger.textContent || '').trim()};
+}
+return {method: null, text: (trigger.textContent || '').trim()};
+"""
+
+# Rendered text of the picker under a label ('' when not found)
+READ_LABEL_JS = """
+var labels = document.querySelectorAll('div.label');
+for (var i = 0; i < labels.length; i++) {
+    if ((labels[i].textContent || '').trim() !== arguments[0]) { continue; }
+    for (var sibling = labels[i].nextElementSibling; sibling; sibling = sibling.nextElementSibling) {
+        var trigger = sibling.classList.contains('o-dp-trig') ? sibling : sibling.querySelector('.o-dp-trig');
+        if (trigger) { return (trigger.textContent || '').trim(); }
+    }
+}
+return '';
+"""
+
+# Ways the picker may render a date
+LABEL_FORMATS = ["%Y-%m-%d", "%Y/%m/%d", "%d/%m/%Y", "%d-%m-%Y", "%d %b %Y", "%b %d, %Y", "%d %B %Y"]
+
+
+def date_label_matches(text, date_value):
+    """True when the rendered picker text shows date_value in one of LABEL_FORMATS"""
+    if not text:
+        return False
+    text = " ".join(text.split())
+    return any(date_value.strftime(fmt) in text for fmt in LABEL_FORMATS)
+
+
+def inject_browser_date(driver, label_text, date_value, timeout=1):
+    """
+    Set the picker under label_text to date_value in one script call.
+    Returns True only when the rendered label shows the new date afterwards.
+    """
+    try:
+        result = driver.execute_script(INJECT_DATE_JS, label_text, date_value.strftime("%Y-%m-%d"))
+    except Exception as e:
+        print(f"[DEBUG] Date injection for {label_text} failed: {e}")
+        return False
+    if not result or not result.get("method"):
+        print(f"[DEBUG] No injectable date picker found for {label_text}")
+        return False
+
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.05).until(
+            lambda d: date_label_matches(d.execute_script(READ_LABEL_JS, label_text), date_value)
+        )
+    except Exception:
+        shown = driver.execute_script(READ_LABEL_JS, label_text)
+        print(f"[DEBUG] Date injection ({result['method']}) not reflected in {label_text} label: '{shown}'")
+        return False
+    print(f"[INFO] {label_text} set to {date_value} (direct {result['method']} injection)")
+    return True
@@ -0,0 +1,155 @@
+"""
+Structured handoff files between the crawlers and the add_data scripts
+Next to each human-readable result/*.txt the crawlers write a record-per-line JSONL file
+and a small sidecar index (section/gateway byte offsets, counts, totals, min/max time),
+so the consumers can stream records, seek straight to a gateway or timestamp cutoff
+and read totals without scanning the file. Amounts and fees are rupee text in the JSONL
+and integer paise in the index and in the records handed out (money.py).
+"""
+import json
+import os
+from datetime import datetime
+
+from money import money_from_json, money_to_json
+
+HANDOFF_TRANSACTIONS = "selenium-transaction_history"
+HANDOFF_PHONES = "selenium-phone-number"
+
+HANDOFF_FORMAT = 2  # 2: money as rupee text / integer paise instead of floats
+# One (time, offset) checkpoint every this many records inside a gateway block
+CHECKPOINT_EVERY = 100
+
+
+def get_handoff_paths(name):
+    """(data_path, index_path) for a handoff name in the result folder"""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    working_dir = os.path.dirname(os.path.dirname(script_dir))
+    result_dir = os.path.join(working_dir, "result")
+    os.makedirs(result_dir, exist_ok=True)
+    return os.path.join(result_dir, f"{name}.jsonl"), os.path.join(result_dir, f"{name}.index.json")
+
+
+def _new_summary(offset):
+    return {"offset": offset, "end": offset, "count": 0, "amount": 0, "fee": 0,
+            "min_time": None, "max_time": None}
+
+
+def _add_to_summary(summary, record):
+    summary["count"] += 1
+    summary["amount"] += record.get("Amount", 0) or 0
+    summary["fee"] += record.get("Tax Fee", 0) or 0
+    record_time = record.get("Time")
+    if record_time:
+        if summary["min_time"] is None or record_time < summary["min_time"]:
+            summary["min_time"] = record_time
+        if summary["max_time"] is None or record_time > summary["max_time"]:
+            summary["max_time"] = record_time
+
+
+def write_handoff(name, sections):
+    """
+    Write sections ({section: {gateway: [records]}}, in order) as JSONL plus the sidecar index.
+    Amount/Tax Fee in the records are integer paise.
+    Records inside a gateway are written in the order given; pass them oldest first
+    if consumers should be able to seek to a timestamp cutoff.
+    """
+    data_path, index_path = get_handoff_paths(name)
+    index = {"format": HANDOFF_FORMAT, "written": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "sections": {}}
+
+    tmp_path = data_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        for section, gateway_groups in sections.items():
+            section_summary = _new_summary(f.tell())
+            section_summary["gateways"] = {}
+            for gateway, records in gateway_groups.items():
+                gateway_summary = _new_summary(f.tell())
+                gateway_summary["checkpoints"] = []
+                for i, record in enumerate(records):
+                    if i % CHECKPOINT_EVERY == 0 and record.get("Time"):
+                        gateway_summary["checkpoints"].append([record["Time"], f.tell()])
+                    line = money_to_json(dict(record, Section=section, Gateway=gateway))
+                    if "Date" in line:
+                        line["Date"] = str(line["Date"])
+                    f.write((json.dumps(line) + "\n").encode("utf-8"))
+                    _add_to_summary(gateway_summary, record)
+                    _add_to_summary(section_summary, record)
+                gateway_summary["end"] = f.tell()
+                section_summary["gateways"][gateway] = gateway_summary
+            section_summary["end"] = f.tell()
+            index["sections"][section] = section_summary
+        index["size"] = f.tell()
+    os.replace(tmp_path, data_path)
+
+    # Index last: a reader that finds an index always finds the matching data file
+    tmp_path = index_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=1)
+    os.replace(tmp_path, index_path)
+    print(f"[INFO] Wrote handoff {os.path.basename(data_path)} ({index['size']:,} bytes) with index")
+
+
+def load_handoff_index(name, text_path=None):
+    """
+    Return the index for a handoff name, or None when missing, unreadable or out of date.
+    text_path: the matching .txt result; if it was changed after the handoff was written
+    (e.g. edited by hand) the index is ignored so the caller reads the text file instead.
+    """
+    data_path, index_path = get_handoff_paths(name)
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if index.get("format") != HANDOFF_FORMAT or not os.path.exists(data_path) \
+            or os.path.getsize(data_path) != index.get("size"):
+        print(f"[WARNING] Handoff index for {name} is out of date, ignoring it")
+        return None
+    if text_path and os.path.exists(text_path) and os.path.getmtime(text_path) > os.path.getmtime(index_path):
+        print(f"[INFO] {os.path.basename(text_path)} changed after the handoff was written, reading the text file")
+        return None
+    index["data_path"] = data_path
+    return index
+
+
+def iter_handoff_records(index, section, gateway=None, after_time=None):
+    """
+    Stream the records of one section (or one gateway block of it), Amount/Tax Fee as integer paise.
+    after_time ('YYYY-MM-DD HH:MM:SS' or datetime): seek past the checkpoints at or before the
+    cutoff and skip records with Time <= after_time.
+    """
+    section_summary = index["sections"].get(section)
+    if section_summary is None:
+        return
+    if isinstance(after_time, datetime):
+        after_time = after_time.strftime("%Y-%m-%d %H:%M:%S")
+
+    if gateway is None:
+        blocks = [(summary, summary.get("checkpoints", [])) for summary in section_summary["gateways"].values()]
+    else:
+        summary = section_summary["gateways"].get(gateway)
+        blocks = [(summary, summary.get("checkpoints", []))] if summary else []
+
+    with open(index["data_path"], "rb") as f:
+        for summary, checkpoints in blocks:
+            if after_time and summary["max_time"] and summary["max_time"] <= after_time:
+                continue
+            start = summary["offset"]
+            if after_time:
+                for checkpoint_time, checkpoint_offset in checkpoints:
+                    if checkpoint_time > after_time:
+                        break
+                    start = checkpoint_offset
+            f.seek(start)
+            while f.tell() < summary["end"]:
+                record = json.loads(f.readline())
+                if after_time and record.get("Time") and record["Time"] <= after_time:
+                    continue
+                yield money_from_json(record)
+
+
+def handoff_totals(index, section):
+    """(count, amount, fee) of a section straight from the index, money in integer paise"""
+    section_summary = index["sections"].get(section)
+    if section_summary is None:
+        return 0, 0, 0
+    return section_summary["count"], section_summary["amount"], section_summary["fee"]
@@ -0,0 +1,128 @@
+"""
+Learned locator cache for the Selenium crawlers
+Remembers per site which selector and which click strategy worked for a control
+(Next button, Search button, table rows) and tries that one first on the next page
+and the next run, falling back to the full list only when it fails.
+Stored in result/locator_cache.json (persist=False keeps what is learned in memory only).
+"""
+import json
+import os
+
+from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+from atomic_file import write_json_atomic
+
+
+def get_cache_path():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    working_dir = os.path.dirname(os.path.dirname(script_dir))
+    result_dir = os.path.join(working_dir, "result")
+    os.makedirs(result_dir, exist_ok=True)
+    return os.path.join(result_dir, "locator_cache.json")
+
+
+def _read_cache_file():
+    try:
+        with open(get_cache_path(), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+# ======== Click strategies (tried in this order unless one was learned) ========
+
+def _regular_click(driver, element):
+    element.click()
+
+
+def _javascript_click(driver, element):
+    driver.execute_script("arguments[0].click();", element)
+
+
+def _action_chains_click(driver, element):
+    ActionChains(driver).move_to_element(element).click().perform()
+
+
+def _scroll_then_click(driver, element):
+    driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
+    element.click()
+
+
+CLICK_STRATEGIES = [
+    ("regular", _regular_click),
+    ("javascript", _javascript_click),
+    ("action_chains", _action_chains_click),
+    ("scroll_into_view", _scroll_then_click),
+]
+
+
+class LocatorCache:
+    """What worked last time for each control on one site"""
+
+    def __init__(self, site, persist=True):
+        self.site = site
+        self.persist = persist
+        self.entries = _read_cache_file().get(site, {})
+
+    def _save(self):
+        if not self.persist:
+            return
+        # Re-read before writing so parallel shard workers do not drop each other's entries
+        cache = _read_cache_file()
+        cache[self.site] = dict(cache.get(self.site, {}), **self.entries)
+        write_json_atomic(get_cache_path(), cache, indent=2)
+
+    def _remember(self, name, value):
+        if self.entries.get(name) != value:
+            self.entries[name] = value
+            self._save()
+
+    def ordered(self, name, candidates, catch_all=()):
+        """Candidates with the learned one first (a learned catch-all candidate is ignored)"""
+        learned = self.entries.get(name)
+        if learned is None:
+            return list(candidates)
+        learned = tuple(learned) if isinstance(learned, list) else learned
+        normalized = [tuple(c) if isinstance(c, list) else c for c in candidates]
+        if learned not in normalized or learned in catch_all:
+            return list(candidates)
+        return [learned] + [c for c in normalized if c != learned]
+
+    def remember(self, name, value):
+        """Record the candidate that worked (a selector string or a (By, selector) pair)"""
+        self._remember(name, list(value) if isinstance(value, tuple) else value)
+
+    def find(self, driver, name, locators, timeout=3, condition=EC.element_to_be_clickable, catch_all=()):
+        """
+        Wait for the first locator that matches, learned locator first.
+        catch_all: locators that can also match other controls (e.g. any pagination button,
+        which is Previous on the last page); they are still tried, but never learned.
+        Returns (element, locator) or (None, None).
+        """
+        catch_all = [tuple(locator) for locator in catch_all]
+        for by, selector in self.ordered(name, locators, catch_all):
+            try:
+                element = WebDriverWait(driver, timeout).until(condition((by, selector)))
+            except Exception:
+                print(f"[DEBUG] {name}: no match for {selector}")
+                continue
+            if (by, selector) not in catch_all:
+                self.remember(name, (by, selector))
+            return element, (by, selector)
+        return None, None
+
+    def click(self, driver, name, element, strategies=None):
+        """Click with the learned strategy first; returns the strategy name that worked or None"""
+        strategies = strategies or CLICK_STRATEGIES
+        by_name = dict(strategies)
+        for strategy in self.ordered(f"{name}_click", [strategy for strategy, _ in strategies]):
+            try:
+                by_name[strategy](driver, element)
+            except Exception as e:
+                print(f"[DEBUG] {name}: {strategy} click failed: {e}")
+                continue
+            self.remember(f"{name}_click", strategy)
+            return strategy
+        return None
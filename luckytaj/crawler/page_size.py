@@ -0,0 +1,206 @@
+"""
+Adaptive rows-per-page for the back-office tables
+Reads the sizes offered by the Per Page dropdown, measures how fast the larger sizes render
+and keeps the size with the best rows per second, remembered per site and page type
+in result/page_size_cache.json
+"""
+import json
+import os
+import time
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+from atomic_file import write_json_atomic
+from page_turn import table_fingerprint, wait_for_page_turn, PageTurnTimeout
+from table_snapshot import TABLE_ROW_SELECTORS
+
+PER_PAGE_TRIGGER = "div.row-select-container div.o-dp-trig"
+PER_PAGE_OPTIONS = "div.o-select-option span[data-slug]"
+DEFAULT_PAGE_SIZE = "50"
+# A size change that re-renders the table does so well within this (seconds)
+RERENDER_TIMEOUT = 5
+
+ROW_COUNT_JS = """
+var selectors = arguments[0];
+for (var i = 0; i < selectors.length; i++) {
+    var n = document.querySelectorAll(selectors[i]).length;
+    if (n > 0) { return n; }
+}
+return 0;
+"""
+
+SELECTED_SIZE_JS = """
+var trigger = document.querySelector(arguments[0]);
+var match = trigger ? (trigger.innerText || '').match(/\\d+/) : null;
+return match ? parseInt(match[0], 10) : null;
+"""
+
+
+def get_cache_path():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    working_dir = os.path.dirname(os.path.dirname(script_dir))
+    result_dir = os.path.join(working_dir, "result")
+    os.makedirs(result_dir, exist_ok=True)
+    return os.path.join(result_dir, "page_size_cache.json")
+
+
+def _load_cache():
+    try:
+        with open(get_cache_path(), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(cache):
+    write_json_atomic(get_cache_path(), cache, indent=2)
+
+
+def _open_dropdown(driver):
+    trigger = WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.CSS_SELECTOR, PER_PAGE_TRIGGER)))
+    trigger.click()
+    WebDriverWait(driver, 5).until(EC.presence_of_element_located((By.CSS_SELECTOR, PER_PAGE_OPTIONS)))
+
+
+def read_page_size_options(driver):
+    """Page sizes offered by the dropdown, smallest first (the dropdown is left open)"""
+    _open_dropdown(driver)
+    slugs = [span.get_attribute("data-slug") for span in driver.find_elements(By.CSS_SELECTOR, PER_PAGE_OPTIONS)]
+    return sorted({int(slug) for slug in slugs if slug and slug.isdigit()})
+
+
+def count_table_rows(driver):
+    return driver.execute_script(ROW_COUNT_JS, TABLE_ROW_SELECTORS)
+
+
+def selected_page_size(driver):
+    """Size shown on the Per Page dropdown, or None when it cannot be read"""
+    try:
+        return driver.execute_script(SELECTED_SIZE_JS, PER_PAGE_TRIGGER)
+    except Exception:
+        return None
+
+
+def rerender_expected(driver, size):
+    """
+    False when picking `size` cannot change the table: it is already selected, or the
+    current page is not full (every row already fits, any other size shows the same rows)
+    """
+    current = selected_page_size(driver)
+    if current is None:
+        return True
+    if current == int(size):
+        return False
+    return count_table_rows(driver) >= current
+
+
+def click_page_size_option(driver, option, size, timeout=RERENDER_TIMEOUT):
+    """Click a Per Page option and wait for the re-render, only when the table can change"""
+    expected = rerender_expected(driver, size)
+    fingerprint = table_fingerprint(driver)
+    driver.execute_script("arguments[0].click();", option)
+    if not expected:
+        return
+    try:
+        wait_for_page_turn(driver, fingerprint, timeout=timeout)
+    except PageTurnTimeout:
+        pass  # same rows after all
+
+
+def apply_page_size(driver, size, dropdown_open=False, timeout=RERENDER_TIMEOUT):
+    """
+    Pick `size` in the dropdown and wait for the table to re-render (no wait when it cannot change).
+    Returns (rows_shown, seconds) or None when the option is missing.
+    """
+    if not dropdown_open:
+        _open_dropdown(driver)
+    options = driver.find_elements(By.CSS_SELECTOR, f"div.o-select-option span[data-slug='{size}']")
+    if not options:
+        print(f"[WARNING] Per Page option {size} is not offered")
+        return None
+
+    started = time.time()
+    click_page_size_option(driver, options[0], size, timeout=timeout)
+    return count_table_rows(driver), time.time() - started
+
+
+def negotiate_page_size(driver, site_key, page_type):
+    """
+    Select the fastest page size for this site and page type.
+    Uses the remembered size when there is one; otherwise tries the sizes >= 50 from small to large,
+    measuring rows per second, and stops early once a page is no longer full (small result or a site cap).
+    The size already selected cannot be timed (picking it renders nothing), so it is measured last,
+    after another size has replaced it.
+    Returns the size that is now selected (as a string).
+    """
+    cache = _load_cache()
+    cache_key = f"{site_key}|{page_type}"
+    cached = cache.get(cache_key)
+
+    if cached:
+        result = apply_page_size(driver, cached["size"])
+        if result is not None:
+            print(f"[INFO] Set Per Page to {cached['size']} (remembered for {page_type})")
+            return str(cached["size"])
+        print(f"[WARNING] Remembered Per Page {cached['size']} no longer works, measuring again")
+        cache.pop(cache_key, None)
+        _save_cache(cache)
+
+    try:
+        options = [size for size in read_page_size_options(driver) if size >= int(DEFAULT_PAGE_SIZE)]
+    except Exception as e:
+        print(f"[WARNING] Could not read Per Page options: {e}")
+        options = []
+    if not options:
+        apply_page_size(driver, DEFAULT_PAGE_SIZE)
+        return DEFAULT_PAGE_SIZE
+
+    current = selected_page_size(driver)
+    if current in options and len(options) > 1:
+        options = [size for size in options if size != current] + [current]
+
+    measurements = {}
+    dropdown_open = True
+    last_applied = current
+    for size in options:
+        try:
+            result = apply_page_size(driver, size, dropdown_open=dropdown_open)
+        except Exception as e:
+            print(f"[WARNING] Per Page {size} failed: {e}")
+            result = None
+        dropdown_open = False
+        if result is None:
+            break
+        last_applied = size
+        rows, seconds = result
+        measurements[size] = {"rows": rows, "seconds": round(seconds, 2), "rows_per_second": round(rows / max(seconds, 0.01), 1)}
+        print(f"[INFO] Per Page {size}: {rows} rows rendered in {seconds:.2f}s")
+        if rows < size:
+            # Not a full page: either everything fits already or the site caps the size
+            break
+    measurements = dict(sorted(measurements.items()))
+
+    if not measurements:
+        apply_page_size(driver, DEFAULT_PAGE_SIZE)
+        return DEFAULT_PAGE_SIZE
+
+    # Only sizes the site actually honoured: each one must show more rows than the smaller sizes
+    # (a capped size shows the same rows as the size below it)
+    honoured = {}
+    previous_rows = 0
+    for size, m in measurements.items():
+        if m["rows"] > previous_rows:
+            honoured[size] = m
+            previous_rows = m["rows"]
+    best = max(honoured, key=lambda size: honoured[size]["rows_per_second"])
+    if best != last_applied:
+        apply_page_size(driver, best)
+    print(f"\033[92m[INFO] Set Per Page to {best} ({honoured[best]['rows_per_second']} rows/s)\033[0m")
+
+    # Remember it only when the measurement saw full pages, a short day proves nothing
+    if measurements[best]["rows"] >= best:
+        cache[cache_key] = {"size": best, "measured": {str(size): m for size, m in measurements.items()}}
+        _save_cache(cache)
+    return str(best)
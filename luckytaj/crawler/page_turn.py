@@ -0,0 +1,118 @@
+"""
+Event-driven page-turn detection for the Selenium crawlers
+Fingerprints the result table before Next is clicked and returns as soon as a different,
+settled table is shown (MutationObserver inside the page), instead of fixed sleeps and
+waiting for a loading animation that often never appears.
+Needs only selenium, so scripts that just turn pages (others/calculator.py) can ship it alone.
+"""
+from selenium.webdriver.common.by import By
+
+# Table row selectors tried in order (from sample_crawler)
+TABLE_ROW_SELECTORS = [
+    "table.tableInfo tbody tr",
+    "table.new_data-table tbody tr",
+    "table tbody tr",
+    ".table tbody tr",
+    "tbody tr"
+]
+
+NEXT_BUTTON_LOCATORS = [
+    # sample_crawler's selector first, then Ant Design fallbacks
+    (By.CSS_SELECTOR, "div.ml-3 button"),
+    (By.XPATH, "//li[@title='Next Page' and @aria-disabled='false']//button[@class='ant-pagination-item-link']"),
+    (By.XPATH, "//button[@class='ant-pagination-item-link']"),
+]
+# Matches every pagination arrow (Previous too), so it is a last resort that is never learned
+NEXT_BUTTON_CATCH_ALL = [(By.XPATH, "//button[@class='ant-pagination-item-link']")]
+
+
+class PageTurnTimeout(Exception):
+    """The table did not change after a page turn, scraping it again would read the old page"""
+
+
+# Shared JS: fingerprint = row count + first/last row text + a hash of all row text
+_FINGERPRINT_FN = """
+function __tableFingerprint(selectors) {
+    for (var i = 0; i < selectors.length; i++) {
+        var rows = document.querySelectorAll(selectors[i]);
+        if (rows.length === 0) {
+            continue;
+        }
+        var hash = 5381;
+        for (var r = 0; r < rows.length; r++) {
+            var text = rows[r].textContent || '';
+            for (var c = 0; c < text.length; c++) {
+                hash = ((hash * 33) ^ text.charCodeAt(c)) >>> 0;
+            }
+        }
+        var first = (rows[0].textContent || '').trim().substring(0, 80);
+        var last = (rows[rows.length - 1].textContent || '').trim().substring(0, 80);
+        return rows.length + '|' + first + '|' + last + '|' + hash;
+    }
+    return '';
+}
+function __loadingShown() {
+    var overlay = document.querySelector('div.anime-shadow');
+    return !!(overlay && overlay.offsetParent !== null);
+}
+"""
+
+FINGERPRINT_JS = _FINGERPRINT_FN + "return __tableFingerprint(arguments[0]);"
+
+# Resolves with the new fingerprint once the table differs from the old one, is not empty,
+# no loading overlay is shown and no mutation happened for `settleMs`; null on timeout
+WAIT_FOR_TURN_JS = _FINGERPRINT_FN + """
+var selectors = arguments[0], oldFingerprint = arguments[1], timeoutMs = arguments[2], settleMs = arguments[3];
+var done = arguments[arguments.length - 1];
+var finished = false, settleTimer = null, observer = null;
+
+function finish(value) {
+    if (finished) { return; }
+    finished = true;
+    if (observer) { observer.disconnect(); }
+    clearTimeout(settleTimer);
+    clearTimeout(timeoutTimer);
+    done(value);
+}
+function check() {
+    var current = __tableFingerprint(selectors);
+    if (current && current !== oldFingerprint && !__loadingShown()) {
+        finish(current);
+    }
+}
+function scheduleCheck() {
+    clearTimeout(settleTimer);
+    settleTimer = setTimeout(check, settleMs);
+}
+var timeoutTimer = setTimeout(function () { finish(null); }, timeoutMs);
+observer = new MutationObserver(scheduleCheck);
+observer.observe(document.body, {childList: true, subtree: true, characterData: true, attributes: true, attributeFilter: ['style', 'class']});
+scheduleCheck();
+"""
+
+
+def table_fingerprint(driver, selectors=None):
+    """Fingerprint of the table currently shown ('' when there are no rows)"""
+    return driver.execute_script(FINGERPRINT_JS, selectors or TABLE_ROW_SELECTORS)
+
+
+def wait_for_page_turn(driver, old_fingerprint, timeout=20, settle=0.15, selectors=None):
+    """
+    Block until the table shows something other than old_fingerprint and has settled.
+    Returns the new fingerprint; raises PageTurnTimeout if the table never changes.
+    """
+    previous_timeout = driver.timeouts.script
+    driver.set_script_timeout(timeout + 5)
+    try:
+        fingerprint = driver.execute_async_script(
+            WAIT_FOR_TURN_JS, selectors or TABLE_ROW_SELECTORS, old_fingerprint,
+            int(timeout * 1000), int(settle * 1000)
+        )
+    finally:
+        driver.set_script_timeout(previous_timeout)
+
+    if not fingerprint:
+        raise PageTurnTimeout(
+            f"Table did not change within {timeout}s after the page turn; refusing to scrape the old page again"
+        )
+    return fingerprint
@@ -0,0 +1,156 @@
+"""
+Paginator helpers for the transaction crawler
+Reads the total page count, jumps straight to a page number and binary-searches
+for the page where the selected end date starts (rows are listed newest first)
+"""
+import time
+from datetime import datetime
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+
+from page_turn import table_fingerprint, wait_for_page_turn, PageTurnTimeout
+from table_snapshot import TABLE_ROW_SELECTORS
+
+# Highest page number shown by the paginator (Ant Design items, numbered buttons or "of N" text)
+PAGE_COUNT_JS = """
+var best = null;
+var items = document.querySelectorAll('.ant-pagination-item, .ant-pagination li[title], div.ml-3 button, nav button');
+for (var i = 0; i < items.length; i++) {
+    var label = (items[i].getAttribute('title') || items[i].textContent || '').trim();
+    if (/^\\d+$/.test(label)) {
+        var n = parseInt(label, 10);
+        if (best === null || n > best) { best = n; }
+    }
+}
+var pager = document.querySelector('.ant-pagination, div.ml-3, nav');
+var match = pager ? (pager.textContent || '').match(/of\\s+(\\d+)/i) : null;
+if (match) {
+    var total = parseInt(match[1], 10);
+    if (best === null || total > best) { best = total; }
+}
+return best;
+"""
+
+# Newest and oldest 'YYYY-MM-DD' in the time column of the rows on screen
+ROW_DATE_BOUNDS_JS = """
+var selectors = arguments[0], timeColumn = arguments[1];
+for (var i = 0; i < selectors.length; i++) {
+    var rows = document.querySelectorAll(selectors[i]);
+    if (rows.length === 0) { continue; }
+    var newest = null, oldest = null;
+    for (var r = 0; r < rows.length; r++) {
+        var cells = rows[r].getElementsByTagName('td');
+        if (cells.length <= timeColumn) { continue; }
+        var day = (cells[timeColumn].textContent || '').trim().substring(0, 10);
+        if (!/^\\d{4}-\\d{2}-\\d{2}$/.test(day)) { continue; }
+        if (newest === null || day > newest) { newest = day; }
+        if (oldest === null || day < oldest) { oldest = day; }
+    }
+    return [newest, oldest];
+}
+return [null, null];
+"""
+
+QUICK_JUMPER_SELECTOR = ".ant-pagination-options-quick-jumper input"
+
+
+class SeekError(Exception):
+    """A failed seek left the table on a later page and the paginator cannot go back to page 1"""
+
+
+def read_page_count(driver):
+    """Total number of pages shown by the paginator, or None if it cannot be read"""
+    try:
+        return driver.execute_script(PAGE_COUNT_JS)
+    except Exception as e:
+        print(f"[DEBUG] Could not read page count: {e}")
+        return None
+
+
+def jump_to_page(driver, page):
+    """
+    Show page `page` directly (quick-jumper input, else the numbered page item).
+    Returns True once the table shows a different page, False if the paginator offers no jump.
+    """
+    fingerprint = table_fingerprint(driver)
+    jumped = False
+
+    jumper = driver.find_elements(By.CSS_SELECTOR, QUICK_JUMPER_SELECTOR)
+    if jumper:
+        jumper[0].clear()
+        jumper[0].send_keys(str(page) + Keys.ENTER)
+        jumped = True
+    else:
+        items = driver.find_elements(By.CSS_SELECTOR, f"li.ant-pagination-item-{page}, .ant-pagination li[title='{page}']")
+        if items:
+            driver.execute_script("arguments[0].click();", items[0])
+            jumped = True
+
+    if not jumped:
+        print(f"[DEBUG] Paginator has no way to jump to page {page}")
+        return False
+
+    try:
+        wait_for_page_turn(driver, fingerprint)
+    except PageTurnTimeout:
+        # Already on that page (same rows) or the jump did nothing
+        return table_fingerprint(driver) != fingerprint
+    return True
+
+
+def read_row_date_bounds(driver, time_column, selectors=None):
+    """(newest_date, oldest_date) of the rows on screen, None for either when unreadable"""
+    newest, oldest = driver.execute_script(ROW_DATE_BOUNDS_JS, selectors or TABLE_ROW_SELECTORS, time_column)
+    to_date = lambda day: datetime.strptime(day, "%Y-%m-%d").date() if day else None
+    return to_date(newest), to_date(oldest)
+
+
+def _back_to_first_page(driver, current):
+    """Return to page 1 after a failed seek; raises SeekError when the jump back fails too"""
+    if current != 1 and not jump_to_page(driver, 1):
+        raise SeekError(f"could not jump back to page 1 from page {current}")
+    return 1
+
+
+def seek_start_page(driver, end_date, time_column):
+    """
+    Binary-search for the first page whose oldest row is on or before end_date, jump there
+    and return its page number. Falls back to page 1 when the paginator cannot jump, and
+    raises SeekError when it cannot get back to page 1 (the caller reloads the list).
+    """
+    started = time.time()
+    _, oldest = read_row_date_bounds(driver, time_column)
+    if oldest is None or oldest <= end_date:
+        return 1
+
+    page_count = read_page_count(driver)
+    if not page_count or page_count < 2:
+        print("[INFO] Seek: page count not available, crawling from page 1")
+        return 1
+    print(f"[INFO] Seek: {page_count} pages, page 1 ends at {oldest} (after {end_date}), searching...")
+
+    low, high = 2, page_count  # page 1 is known to be entirely newer than end_date
+    current = 1
+    probes = 0
+    while low < high:
+        middle = (low + high) // 2
+        if not jump_to_page(driver, middle):
+            print("\033[93m[WARNING] Seek: could not jump to a page, crawling from page 1\033[0m")
+            return _back_to_first_page(driver, current)
+        current = middle
+        probes += 1
+        _, oldest = read_row_date_bounds(driver, time_column)
+        print(f"[DEBUG] Seek probe page {middle}: oldest row {oldest}")
+        if oldest is not None and oldest <= end_date:
+            high = middle
+        else:
+            low = middle + 1
+
+    if current != low and not jump_to_page(driver, low):
+        print("\033[93m[WARNING] Seek: could not jump to the start page, crawling from page 1\033[0m")
+        return _back_to_first_page(driver, current)
+
+    print(f"\033[92m[INFO] Seek: starting at page {low} of {page_count} "
+          f"({probes} probe(s), {time.time() - started:.1f}s)\033[0m")
+    return low
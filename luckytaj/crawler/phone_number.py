@@ -1,7 +1,5 @@
 from selenium import webdriver
-from selenium.webdriver.firefox.service import Service
 from selenium.webdriver.firefox.options import Options
-from webdriver_manager.firefox import GeckoDriverManager
 import time
 import signal
 import sys
@@ -10,10 +8,26 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 import os
+import argparse
 from selenium.webdriver.support.ui import Select
+from selenium.common.exceptions import TimeoutException
 from datetime import datetime
 from collections import defaultdict
 from terminal_utils import setup_automation_terminal, cleanup_terminal, print_status
+from browser_daemon import attach_browser
+from handoff import write_handoff, HANDOFF_PHONES
+from page_turn import table_fingerprint, wait_for_page_turn, PageTurnTimeout
+from page_size import negotiate_page_size, click_page_size_option
+from locator_cache import LocatorCache
+from wait_timing import WaitTimer
+from date_picker import inject_browser_date
+from route_cache import RouteCache
+from session_store import restore_session, save_session, clear_session
+from driver_bootstrap import start_driver
+from background_start import BackgroundStart
+from crawl_profile import apply_crawl_profile
+from warm_profile import WarmProfile, cache_report
+from records import MemberRecord
 
 def signal_handler(signum, frame):
     """Handle shutdown signals gracefully"""
@@ -36,21 +50,18 @@ def get_captcha_number(driver, timeout=40):
     return captcha_text
 
 def navigate_to_member_page(driver, config):
-    """Navigate to Member > Member Info page after login"""
+    """Navigate to Member > Member Info page after login, straight to the learned route when there is one"""
     wait = WebDriverWait(driver, 40)
 
-    if config.get('has_navigation'):
+    if config.get('has_navigation') and not routes.open_route(driver, "member", "Register From"):
         # Click "Member" sidebar button
         menu_link = wait.until(EC.element_to_be_clickable(
             (By.XPATH, "//div[@class='sidebar-item-container']//button[.//div[text()='Member']]")
         ))
 
         # Wait for ajax loader to finish
-        WebDriverWait(driver, 20).until(
-            EC.invisibility_of_element_located((By.CLASS_NAME, "ajaxLoader"))
-        )
+        timer.wait(driver, "ajax_loader", EC.invisibility_of_element_located((By.CLASS_NAME, "ajaxLoader")), timeout=20)
         print("[INFO] ajaxLoader complete")
-        time.sleep(2)
 
         menu_link.click()
 
@@ -61,23 +72,19 @@ def navigate_to_member_page(driver, config):
         submenu_item.click()
 
         # Wait for panel and ajax loader
-        WebDriverWait(driver, 20).until(
-            EC.invisibility_of_element_located((By.CSS_SELECTOR, ".box.box-info"))
-        )
+        timer.wait(driver, "panel_load", EC.invisibility_of_element_located((By.CSS_SELECTOR, ".box.box-info")), timeout=20)
         print("[INFO] Panel load complete")
-        time.sleep(2)
 
-        WebDriverWait(driver, 20).until(
-            EC.invisibility_of_element_located((By.CLASS_NAME, "ajaxLoader"))
-        )
+        timer.wait(driver, "ajax_loader", EC.invisibility_of_element_located((By.CLASS_NAME, "ajaxLoader")), timeout=20)
         print("[INFO] ajaxLoader complete")
-        time.sleep(2)
+        routes.remember_route(driver, "member", config['url'])
 
     print(f"[INFO] Navigation complete for {config['name']}")
 
 def set_browser_date(driver, label_text, date_value):
     """Set a date in the browser's calendar picker by label ('Start Date' or 'End Date').
-    date_value should be a datetime.date object."""
+    date_value should be a datetime.date object.
+    Injects the date directly and clicks through the calendar only if the label does not show it."""
     month_names = {1: "Jan", 2: "Feb", 3: "Mar", 4: "Apr", 5: "May", 6: "Jun",
                    7: "Jul", 8: "Aug", 9: "Sep", 10: "Oct", 11: "Nov", 12: "Dec"}
     target_year = str(date_value.year)
@@ -86,6 +93,10 @@ def set_browser_date(driver, label_text, date_value):
 
     print(f"[INFO] Setting {label_text} to {date_value} ({target_day} {target_month} {target_year})")
 
+    # Fast path: one script call, verified against the rendered label
+    if inject_browser_date(driver, label_text, date_value):
+        return
+
     # Click the date picker trigger to open calendar
     trigger = WebDriverWait(driver, 10).until(
         EC.element_to_be_clickable((By.XPATH,
@@ -93,48 +104,36 @@ def set_browser_date(driver, label_text, date_value):
         ))
     )
     trigger.click()
-    time.sleep(1)
 
     # Wait for calendar dropdown to appear
-    WebDriverWait(driver, 10).until(
-        EC.visibility_of_element_located((By.CSS_SELECTOR, "div.o-select-dropdown"))
-    )
+    timer.wait(driver, "date_picker_open", EC.visibility_of_element_located((By.CSS_SELECTOR, "div.o-select-dropdown")), timeout=10)
 
     # Click the year header button to open year picker
     year_btns = driver.find_elements(By.CSS_SELECTOR, "div.o-select-dropdown button.op-dp-date-btn")
     if len(year_btns) >= 2:
         year_btns[1].click()  # Second button is year
-        time.sleep(0.5)
 
     # Click the target year
-    year_cell = WebDriverWait(driver, 5).until(
-        EC.element_to_be_clickable((By.XPATH,
+    year_cell = timer.wait(driver, "date_picker_year", EC.element_to_be_clickable((By.XPATH,
             f"//div[contains(@class,'o-select-dropdown')]//button[contains(@class,'o-dp-year-cell') and text()='{target_year}']"
-        ))
-    )
+        )), timeout=5)
     year_cell.click()
     print(f"[INFO] Selected year: {target_year}")
-    time.sleep(0.5)
 
     # Click the target month
-    month_cell = WebDriverWait(driver, 5).until(
-        EC.element_to_be_clickable((By.XPATH,
+    month_cell = timer.wait(driver, "date_picker_month", EC.element_to_be_clickable((By.XPATH,
             f"//div[contains(@class,'o-select-dropdown')]//button[contains(@class,'o-dp-month-cell') and text()='{target_month}']"
-        ))
-    )
+        )), timeout=5)
     month_cell.click()
     print(f"[INFO] Selected month: {target_month}")
-    time.sleep(0.5)
 
     # Click the target day (not 'light' class - those are next/prev month)
-    day_cell = WebDriverWait(driver, 5).until(
-        EC.element_to_be_clickable((By.XPATH,
+    day_cell = timer.wait(driver, "date_picker_day", EC.element_to_be_clickable((By.XPATH,
             f"//div[contains(@class,'o-select-dropdown')]//div[contains(@class,'dpBodyCell') and not(contains(@class,'light')) and text()='{target_day}']"
-        ))
-    )
+        )), timeout=5)
     day_cell.click()
     print(f"[INFO] Selected day: {target_day}")
-    time.sleep(1)
+    timer.settle(driver, "date_picker_close", EC.invisibility_of_element_located((By.CSS_SELECTOR, "div.o-select-dropdown")), timeout=1)
     print(f"[INFO] {label_text} set to {date_value}")
 
 def click_search_button(driver):
@@ -146,17 +145,11 @@ def click_search_button(driver):
         (By.CSS_SELECTOR, "button.search-btn"),
         (By.CSS_SELECTOR, "button[type='submit']"),
     ]
-    for by, selector in search_selectors:
-        try:
-            search_button = WebDriverWait(driver, 5).until(
-                EC.element_to_be_clickable((by, selector))
-            )
-            search_button.click()
-            print(f"[INFO] Clicked Search button using: {selector}")
-            _wait_for_search_animation(driver)
-            return
-        except Exception:
-            continue
+    search_button, locator = locators.find(driver, "search_button", search_selectors, timeout=5)
+    if search_button is not None and locators.click(driver, "search_button", search_button):
+        print(f"[INFO] Clicked Search button using: {locator[1]}")
+        _wait_for_search_animation(driver)
+        return
     print("[WARNING] Could not find Search button automatically.")
     input("Please click the Search button manually, then press ENTER here to continue...")
     _wait_for_search_animation(driver)
@@ -165,37 +158,35 @@ def click_search_button(driver):
 def _wait_for_search_animation(driver):
     """Wait for table refresh to finish after Search is clicked."""
     try:
-        WebDriverWait(driver, 20).until(
-            EC.invisibility_of_element_located((By.CLASS_NAME, "ajaxLoader"))
-        )
+        timer.wait(driver, "search_refresh", EC.invisibility_of_element_located((By.CLASS_NAME, "ajaxLoader")), timeout=20)
         print("[INFO] Table refresh complete")
     except Exception:
         print("[DEBUG] ajaxLoader not detected, continuing...")
     time.sleep(1)
 
 
-def select_per_page(driver, value="50"):
-    """Select per-page count from the dropdown (e.g. '50')."""
+def select_per_page(driver, value="50", page_type="member"):
+    """Select per-page count from the dropdown (e.g. '50'), or 'auto' to pick the fastest size."""
+    if value == "auto":
+        return negotiate_page_size(driver, config['name'], page_type)
     try:
         # Click the Per Page dropdown trigger
         per_page_trigger = WebDriverWait(driver, 10).until(
             EC.element_to_be_clickable((By.CSS_SELECTOR, "div.row-select-container div.o-dp-trig"))
         )
         per_page_trigger.click()
-        time.sleep(1)
 
         # Click the target option by data-slug
-        option = WebDriverWait(driver, 5).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR,
+        option = timer.wait(driver, "per_page_option", EC.presence_of_element_located((By.CSS_SELECTOR,
                 f"div.o-select-option span[data-slug='{value}']"
-            ))
-        )
-        driver.execute_script("arguments[0].click();", option)
+            )), timeout=5)
+        # Waits for the re-render only when this size can change the table
+        click_page_size_option(driver, option, value)
         print(f"[INFO] Set Per Page to {value}")
-        time.sleep(3)
     except Exception as e:
         print(f"[WARNING] Could not set Per Page to {value}: {e}")
 
+# Runs use a persistent per-site profile from result/profiles (warm_profile.py, --fresh-profile to skip it)
 # Windows Firefox profile path (comment out if you want a fresh profile)
 # profile_path = "C:\\Users\\BDC Computer ll\\AppData\\Roaming\\Mozilla\\Firefox\\Profiles\\your-profile-name"
 # firefox_profile = webdriver.FirefoxProfile(profile_path)
@@ -207,9 +198,19 @@ options = Options()
 # Example Windows profile path:
 # options.profile = "C:\\Users\\YourUsername\\AppData\\Roaming\\Mozilla\\Firefox\\Profiles\\xxxxxxxx.selenium-profile"
 
-# Headless mode if needed
+# Headless mode if needed (--profile crawl also blocks images, fonts and analytics hosts)
 # options.add_argument('--headless')
 
+parser = argparse.ArgumentParser(description="Member phone number crawler")
+parser.add_argument("--profile", choices=["default", "crawl"], default="default",
+                    help="crawl: headless, eager page loads, no images/fonts/media, analytics hosts blocked "
+                         "(opt-in, not benchmarked yet: see crawl_profile.py and profile_benchmark.py)")
+parser.add_argument("--fresh-profile", action="store_true",
+                    help="start from a temporary browser profile instead of the persistent one in result/profiles")
+args = parser.parse_args()
+if args.profile == "crawl":
+    apply_crawl_profile(options)
+
 # ======== Website Configuration ========
 website_configs = {
     "1": {
@@ -265,70 +266,132 @@ def select_website():
             print("\n\n❌ Operation cancelled by user")
             exit(0)
 
+def needs_login(driver, config, timeout=8):
+    """
+    Open the site and report whether the login form is shown (False only when the logged-in
+    sidebar is there; a page that shows neither in time goes through login())
+    """
+    driver.get(config['url'])
+    try:
+        # Returns as soon as either the login form or the logged-in sidebar shows up
+        WebDriverWait(driver, timeout).until(EC.any_of(
+            EC.presence_of_element_located((By.XPATH, config['username_xpath'])),
+            EC.presence_of_element_located((By.CSS_SELECTOR, "div.sidebar-item-container")),
+        ))
+    except TimeoutException:
+        print(f"[WARNING] {config['name']} showed neither the login form nor the sidebar in {timeout}s, logging in")
+        return True
+    return bool(driver.find_elements(By.XPATH, config['username_xpath']))
+
+def login(driver, config, load_page=True):
+    """Log in to the back office with the selected configuration"""
+    print(f"\n🚀 Connecting to {config['name']}...")
+    if load_page:
+        driver.get(config['url'])
+    wait = WebDriverWait(driver, 40)
+
+    # Merchant code (only for sites that have it)
+    if 'merchant_code' in config:
+        merchant_code_input = wait.until(EC.presence_of_element_located((By.XPATH, config['merchant_code_xpath'])))
+        merchant_code_input.send_keys(config['merchant_code'])
+
+    # Username + Password
+    username_input = wait.until(EC.presence_of_element_located((By.XPATH, config['username_xpath'])))
+    username_input.send_keys(config['username'])
+    password_input = wait.until(EC.presence_of_element_located((By.XPATH, config['password_xpath'])))
+    password_input.send_keys(config['password'])
+
+    # CAPTCHA handling (luckytaj)
+    if config.get('has_captcha'):
+        captcha_input = wait.until(EC.presence_of_element_located((By.XPATH, "//input[@placeholder='Captcha Code']")))
+        captcha_code = get_captcha_number(driver)
+        captcha_input.send_keys(captcha_code)
+        print(f"\033[92mExtracted CAPTCHA: {captcha_code}\033[0m")
+
+    # Submit (ENTER on last field)
+    if config.get('has_captcha'):
+        captcha_input.send_keys(Keys.ENTER)
+    else:
+        password_input.send_keys(Keys.ENTER)
+
+    print(f"✅ Login attempted for {config['name']}")
+
 # Setup terminal with custom settings
 setup_automation_terminal("Phone Number Crawler")
 
 # Select website configuration BEFORE driver initialization
 config = select_website()
+locators = LocatorCache(config['name'])
+timer = WaitTimer(config['name'])
+routes = RouteCache(config['name'])
+session_name = f"backoffice-{config['name']}"
+
+def open_logged_in_browser():
+    """Browser start, login and the member page (the steps that do not need the dates)"""
+    # Setup the driver (attach to the browser daemon's kept-alive session when it is running)
+    driver = attach_browser(session_name)
+    if driver is None:
+        if not args.fresh_profile:
+            WarmProfile(session_name).apply(options)
+        driver = start_driver(options, headless=args.profile == "crawl")
+        if driver is None:
+            print("❌ No browser could be started (see the errors above)")
+            sys.exit(1)
+
+    # Login with selected configuration (skipped when the attached session is still logged in)
+    # A fresh browser first gets the saved session back (result/sessions), the login form only if it expired
+    if getattr(driver, "is_new_session", True) and not restore_session(driver, session_name, config['url']):
+        login(driver, config)
+    elif needs_login(driver, config):
+        clear_session(session_name)
+        login(driver, config, load_page=False)
+    else:
+        print(f"✅ Reusing logged-in session for {config['name']}")
+    if getattr(driver, "is_new_session", True):
+        cache_report(driver, "First page load")
 
-# Setup the driver
-service = Service(GeckoDriverManager().install())
-driver = webdriver.Firefox(service=service, options=options)
-driver.maximize_window()
-
-# Login with selected configuration
-print(f"\n🚀 Connecting to {config['name']}...")
-driver.get(config['url'])
-wait = WebDriverWait(driver, 40)
-
-# Merchant code (only for sites that have it)
-if 'merchant_code' in config:
-    merchant_code_input = wait.until(EC.presence_of_element_located((By.XPATH, config['merchant_code_xpath'])))
-    merchant_code_input.send_keys(config['merchant_code'])
-
-# Username + Password
-username_input = wait.until(EC.presence_of_element_located((By.XPATH, config['username_xpath'])))
-username_input.send_keys(config['username'])
-password_input = wait.until(EC.presence_of_element_located((By.XPATH, config['password_xpath'])))
-password_input.send_keys(config['password'])
-
-# CAPTCHA handling (luckytaj)
-if config.get('has_captcha'):
-    captcha_input = wait.until(EC.presence_of_element_located((By.XPATH, "//input[@placeholder='Captcha Code']")))
-    captcha_code = get_captcha_number(driver)
-    captcha_input.send_keys(captcha_code)
-    print(f"\033[92mExtracted CAPTCHA: {captcha_code}\033[0m")
-
-# Submit (ENTER on last field)
-if config.get('has_captcha'):
-    captcha_input.send_keys(Keys.ENTER)
-else:
-    password_input.send_keys(Keys.ENTER)
-
-print(f"✅ Login attempted for {config['name']}")
+    # ======== Post-Login Navigation ========
+    navigate_to_member_page(driver, config)
+    save_session(driver, session_name)
+    return driver
 
-# ======== Post-Login Navigation ========
-navigate_to_member_page(driver, config)
+# The browser starts and logs in while the operator picks the dates
+startup = BackgroundStart("Browser startup and login", open_logged_in_browser)
 
 # ======== Date Selection ========
 from date_selector import get_date_selection
 
-start_date, end_date = get_date_selection()
+try:
+    start_date, end_date = get_date_selection()
+except BaseException:
+    # Cancelled at the prompt: close the browser that is being started instead of leaving it behind
+    startup.discard(lambda started_driver: started_driver.quit())
+    raise
 
 if start_date and end_date:
+    driver = startup.result()
     print(f"\033[1;32m[APPROVED]\033[0m Date range selected: {start_date} to {end_date}")
     print(f"\033[1;33m[INFO]\033[0m Setting dates in browser...")
-    set_browser_date(driver, "Register From", start_date)
-    set_browser_date(driver, "Register To", end_date)
+    filter_values = {"start": start_date.strftime("%Y-%m-%d"), "end": end_date.strftime("%Y-%m-%d")}
+    applied = routes.open_filtered(
+        driver, "member", filter_values,
+        {"start": ("Register From", start_date), "end": ("Register To", end_date)}, "Register From"
+    )
+    if applied is None and routes.reloaded and "member" not in routes.entries:
+        # The filtered link and the plain route both failed: back to Member Info through the menu
+        navigate_to_member_page(driver, config)
+    if applied is None:
+        set_browser_date(driver, "Register From", start_date)
+        set_browser_date(driver, "Register To", end_date)
     click_search_button(driver)
+    if applied is None:
+        routes.remember_filters(driver, "member", filter_values)
     driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-    time.sleep(1)
-    select_per_page(driver, "50")
-    time.sleep(1)
+    select_per_page(driver, "auto")
     print(f"\033[1;33m[INFO]\033[0m Using optimized extraction with early stopping")
 else:
     print("\033[1;31m[ERROR] No dates selected, exiting...\033[0m")
-    driver.quit()
+    startup.discard(lambda started_driver: started_driver.quit())
     exit(1)
 
 
@@ -354,8 +417,6 @@ def extract_phone_data(driver, wait_timeout=20):
 
     collected_records = []
 
-    time.sleep(1)  # Stability delay
-
     for idx in range(len(rows)):
         try:
             # Re-find rows to avoid stale element reference
@@ -382,12 +443,7 @@ def extract_phone_data(driver, wait_timeout=20):
             affiliate_code = cols[5].text.strip() if len(cols) > 5 else ""
 
             if phone_number:
-                record = {
-                    "Player ID": player_id,
-                    "Phone Number": phone_number,
-                    "Email": email,
-                    "Affiliate Code": affiliate_code,
-                }
+                record = MemberRecord(player_id, phone_number, email, affiliate_code)
                 collected_records.append(record)
 
         except Exception as e:
@@ -433,35 +489,24 @@ def print_grouped_phone_results(grouped_data):
         f.write(footer)
 
 
-def click_next_page(driver, wait_timeout=10):
-    try:
-        next_button = None
+NEXT_BUTTON_LOCATORS = [
+    # sample_crawler's CSS selector first, then the Ant Design one
+    (By.CSS_SELECTOR, "div.ml-3 button"),
+    (By.CSS_SELECTOR, 'button.ant-pagination-item-link:has(span[aria-label="right"])'),
+]
 
-        # Primary: sample_crawler's CSS selector
-        try:
-            next_button = WebDriverWait(driver, 3).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "div.ml-3 button"))
-            )
-            print("[SUCCESS] Found next button using CSS: div.ml-3 button")
-        except Exception:
-            pass
-
-        # Fallback: Ant Design selector
-        if not next_button:
-            try:
-                next_button = WebDriverWait(driver, 3).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, 'button.ant-pagination-item-link:has(span[aria-label="right"])'))
-                )
-                print("[SUCCESS] Found next button using Ant Design selector")
-            except Exception:
-                pass
 
+def click_next_page(driver, wait_timeout=10):
+    try:
+        next_button, locator = locators.find(driver, "next_button", NEXT_BUTTON_LOCATORS, timeout=3)
         if not next_button:
             print("[WARNING] Could not find Next button with any selector")
             return False
+        print(f"[SUCCESS] Found next button using: {locator[1]}")
 
-        next_button.click()
-        time.sleep(0.5)
+        if not locators.click(driver, "next_button", next_button):
+            print("[WARNING] Could not click Next button with any strategy")
+            return False
         print("[INFO] Clicked on the Next button.")
         return True
     except Exception as e:
@@ -503,28 +548,21 @@ def run_optimized_phone_extraction(driver, start_date, end_date):
 
         # Try to go to next page
         print(f"[DEBUG] Attempting to navigate to next page...")
-        time.sleep(1)
+        fingerprint = table_fingerprint(driver)
         has_next = click_next_page(driver)
         if not has_next:
             print("[INFO] No more pages found. Finishing extraction.")
             break
         else:
-            # Wait for loading animation to appear and disappear
+            # Returns as soon as the table shows the next page
             try:
-                WebDriverWait(driver, 5).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "div.anime-shadow"))
-                )
-                WebDriverWait(driver, 20).until(
-                    EC.invisibility_of_element_located((By.CSS_SELECTOR, "div.anime-shadow"))
-                )
-                print("[INFO] Page loading animation complete")
-            except Exception:
-                print("[DEBUG] Animation element not detected, continuing...")
-            time.sleep(0.5)
+                wait_for_page_turn(driver, fingerprint)
+            except PageTurnTimeout as e:
+                print(f"\033[91m[ERROR] {e}\033[0m")
+                raise
             print(f"[SUCCESS] Successfully navigated to page {page_counter + 1}")
 
         page_counter += 1
-        time.sleep(1)
 
     # Group records for output
     phone_groups = defaultdict(list)
@@ -540,6 +578,7 @@ def run_optimized_phone_extraction(driver, start_date, end_date):
 
     if total_records > 0:
         print_grouped_phone_results(phone_groups)
+        write_handoff(HANDOFF_PHONES, {"PHONES": phone_groups})
     else:
         print("\033[93m[WARNING] No phone numbers found in the specified date range.\033[0m")
 
@@ -593,6 +632,7 @@ def show_post_crawl_menu():
 
 def main():
     run_optimized_phone_extraction(driver, start_date, end_date)
+    timer.report()
     time.sleep(5)
     driver.quit()
     cleanup_terminal()
@@ -0,0 +1,178 @@
+"""
+Page-turn latency and browser memory: default browser setup vs the crawl profile
+Starts one browser per profile, restores the saved back-office session (run transaction.py
+once first so result/sessions and the learned deposit route exist), opens the deposit list
+and turns --pages pages with the same event-driven wait the crawler uses. Prints a
+comparison table and keeps it in result/profile_benchmark.json.
+
+    python profile_benchmark.py --site luckytaj.com --pages 20
+"""
+import argparse
+import json
+import os
+import platform
+import time
+
+from selenium.webdriver.firefox.options import Options
+
+from atomic_file import write_json_atomic
+from crawl_profile import apply_crawl_profile
+from driver_bootstrap import start_driver
+from locator_cache import LocatorCache
+from page_turn import table_fingerprint, wait_for_page_turn, PageTurnTimeout, NEXT_BUTTON_LOCATORS, NEXT_BUTTON_CATCH_ALL
+from route_cache import RouteCache
+from session_store import restore_session
+from wait_timing import percentile
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+def get_result_path():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    working_dir = os.path.dirname(os.path.dirname(script_dir))
+    result_dir = os.path.join(working_dir, "result")
+    os.makedirs(result_dir, exist_ok=True)
+    return os.path.join(result_dir, "profile_benchmark.json")
+
+
+def _proc_children(pid):
+    """Child pids from /proc (Linux without psutil)"""
+    children = []
+    for task in os.listdir(f"/proc/{pid}/task"):
+        with open(f"/proc/{pid}/task/{task}/children") as f:
+            children += [int(child) for child in f.read().split()]
+    return children
+
+
+def _proc_rss(pid):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def browser_memory_mb(driver):
+    """Resident memory of every process under the driver service (browser and content processes), or None"""
+    service_process = getattr(getattr(driver, "service", None), "process", None)
+    if service_process is None:
+        return None
+    try:
+        if psutil is not None:
+            processes = psutil.Process(service_process.pid).children(recursive=True)
+            return sum(process.memory_info().rss for process in processes) / 1024 / 1024
+        if platform.system() == "Linux":
+            pending, total = _proc_children(service_process.pid), 0
+            while pending:
+                pid = pending.pop()
+                total += _proc_rss(pid)
+                pending += _proc_children(pid)
+            return total / 1024 / 1024
+    except Exception as e:
+        print(f"[DEBUG] Could not read browser memory: {e}")
+    return None
+
+
+def run_profile(profile, site, url, pages):
+    """Open the deposit list under one profile and time the page turns"""
+    options = Options()
+    if profile == "crawl":
+        apply_crawl_profile(options)
+    driver = start_driver(options, headless=profile == "crawl")
+    if driver is None:
+        raise RuntimeError(f"no browser could be started for the {profile} profile")
+    # Learned locators are read but never saved, so a benchmark run cannot change what the crawls use
+    locators = LocatorCache(site, persist=False)
+    try:
+        restore_session(driver, f"backoffice-{site}", url)
+        started = time.time()
+        driver.get(url)
+        fingerprint = None
+        while not fingerprint and time.time() - started < 30:
+            fingerprint = table_fingerprint(driver)
+            time.sleep(0.05)
+        if not fingerprint:
+            raise RuntimeError("the deposit table did not load (is the saved session still valid?)")
+        first_load = time.time() - started
+
+        turns = []
+        for _ in range(pages):
+            next_button, _locator = locators.find(driver, "next_button", NEXT_BUTTON_LOCATORS, timeout=3,
+                                                 catch_all=NEXT_BUTTON_CATCH_ALL)
+            if not next_button:
+                break
+            turn_started = time.time()
+            if not locators.click(driver, "next_button", next_button):
+                break
+            try:
+                fingerprint = wait_for_page_turn(driver, fingerprint, timeout=20)
+            except PageTurnTimeout:
+                break
+            turns.append(time.time() - turn_started)
+        memory = browser_memory_mb(driver)
+    finally:
+        driver.quit()
+
+    return {
+        "first_load_s": round(first_load, 3),
+        "page_turns": len(turns),
+        "turn_p50_s": round(percentile(turns, 0.5), 3) if turns else None,
+        "turn_p95_s": round(percentile(turns, 0.95), 3) if turns else None,
+        "turn_mean_s": round(sum(turns) / len(turns), 3) if turns else None,
+        "memory_mb": round(memory, 1) if memory is not None else None,
+    }
+
+
+def _fmt(value, spec):
+    return "n/a" if value is None else format(value, spec)
+
+
+def print_comparison(results):
+    print(f"\n{'Profile':<10}{'First load s':>14}{'Turns':>7}{'p50 s':>8}{'p95 s':>8}{'Mean s':>8}{'Memory MB':>11}")
+    for profile, result in results.items():
+        print(f"{profile:<10}{_fmt(result['first_load_s'], '.2f'):>14}{result['page_turns']:>7}"
+              f"{_fmt(result['turn_p50_s'], '.2f'):>8}{_fmt(result['turn_p95_s'], '.2f'):>8}"
+              f"{_fmt(result['turn_mean_s'], '.2f'):>8}{_fmt(result['memory_mb'], '.0f'):>11}")
+    default, crawl = results.get("default"), results.get("crawl")
+    if default and crawl and default["turn_p50_s"] and crawl["turn_p50_s"]:
+        print(f"\nCrawl profile page turns: {crawl['turn_p50_s'] / default['turn_p50_s']:.0%} of the default p50")
+    if default and crawl and default["memory_mb"] and crawl["memory_mb"]:
+        print(f"Crawl profile memory: {crawl['memory_mb'] / default['memory_mb']:.0%} of the default")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the default browser setup with the crawl profile")
+    parser.add_argument("--site", required=True, help="site name as in transaction.py, e.g. luckytaj.com")
+    parser.add_argument("--url", help="deposit list URL (default: the route learned by transaction.py)")
+    parser.add_argument("--pages", type=int, default=20, help="page turns per profile (default 20)")
+    parser.add_argument("--profiles", nargs="+", choices=["default", "crawl"], default=["default", "crawl"])
+    args = parser.parse_args()
+
+    url = args.url or RouteCache(args.site).entries.get("deposit", {}).get("url")
+    if not url:
+        print("[ERROR] No deposit route learned for this site yet, run transaction.py once or pass --url")
+        return 1
+
+    results = {}
+    for profile in args.profiles:
+        print(f"\n[INFO] Benchmarking the {profile} profile ({args.pages} page turns)...")
+        results[profile] = run_profile(profile, args.site, url, args.pages)
+    print_comparison(results)
+
+    path = get_result_path()
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            history = json.load(f)
+    except (OSError, ValueError):
+        history = []
+    history.append({"site": args.site, "url": url, "pages": args.pages,
+                    "recorded": time.strftime("%Y-%m-%d %H:%M:%S"), "results": results})
+    write_json_atomic(path, history, indent=2)
+    print(f"\n[INFO] Saved to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
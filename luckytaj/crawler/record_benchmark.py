@@ -0,0 +1,99 @@
+"""
+Memory per 100k collected rows: plain dicts vs the slotted records in records.py
+Builds the same synthetic month of deposit rows both ways, the way the crawler holds them
+(record list, gateway groups and the seen Order ID set), and measures the allocations
+with tracemalloc.
+
+    python record_benchmark.py --rows 100000
+"""
+import argparse
+import gc
+import random
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from money import to_paise
+from records import TransactionRecord, parse_day
+
+GATEWAYS = [f"GATEWAY-{i:02d} BANK" for i in range(24)]
+
+
+def synthetic_rows(count, seed=7):
+    """Table cells as the snapshot hands them over (fresh strings per row, like a real page)"""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    rows = []
+    for i in range(count):
+        moment = start + timedelta(seconds=rng.randrange(31 * 24 * 3600))
+        rows.append([
+            f"D{20250100000000 + i}",
+            str(rng.randrange(100000, 999999)),
+            f"98{rng.randrange(10000000, 99999999)}",
+            f"{rng.randrange(100, 50000)}.00",
+            f"{rng.randrange(0, 500)}.50",
+            moment.strftime("%Y-%m-%d %H:%M:%S"),
+            "".join(rng.choice(GATEWAYS)),  # join makes a new string object, as a parsed cell would be
+        ])
+    return rows
+
+
+def build_dicts(rows):
+    records = []
+    for order_id, player_id, phone, amount, tax_fee, time_text, gateway in rows:
+        records.append({
+            "Order ID": order_id,
+            "Player ID": player_id,
+            "Phone Number": phone,
+            "Amount": float(amount),
+            "Tax Fee": float(tax_fee),
+            "Time": time_text,
+            "Gateway": gateway,
+            "Date": datetime.strptime(time_text.split(" ")[0], "%Y-%m-%d").date(),
+        })
+    return records
+
+
+def build_records(rows):
+    return [
+        TransactionRecord(order_id, player_id, phone, to_paise(amount), to_paise(tax_fee), time_text, gateway,
+                          parse_day(time_text.split(" ")[0]))
+        for order_id, player_id, phone, amount, tax_fee, time_text, gateway in rows
+    ]
+
+
+def measure(builder, rows):
+    """Bytes allocated for the records plus gateway groups and the seen Order ID set"""
+    gc.collect()
+    tracemalloc.start()
+    records = builder(rows)
+    gateway_groups = defaultdict(list)
+    seen_order_ids = set()
+    for record in records:
+        gateway_groups[record["Gateway"]].append(record)
+        seen_order_ids.add(record["Order ID"])
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory of the collected rows: dicts vs slotted records")
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    # The cell strings exist either way (they come from the page), only what is built on top is measured
+    rows = synthetic_rows(args.rows)
+    dict_bytes = measure(build_dicts, rows)
+    record_bytes = measure(build_records, rows)
+
+    per_100k = 100000 / args.rows
+    print(f"{'Container':<22}{'MB per 100k':>12}{'Bytes/row':>11}")
+    print(f"{'dict rows':<22}{dict_bytes * per_100k / 1024 / 1024:>12.1f}{dict_bytes / args.rows:>11.0f}")
+    print(f"{'TransactionRecord':<22}{record_bytes * per_100k / 1024 / 1024:>12.1f}{record_bytes / args.rows:>11.0f}")
+    print(f"\nSlotted records use {record_bytes / dict_bytes:.0%} of the dict memory "
+          f"(cell strings shared by both are not counted)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Learned deep links for the back-office pages
+Once a page has been reached through the sidebar, its SPA route is remembered per site in
+result/route_cache.json and later runs open it with one driver.get. When the app keeps the
+search filters in the URL, the query parameters carrying them are learned too, so the
+filtered list can be opened directly (checked against the rendered date labels).
+"""
+import json
+import os
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+from atomic_file import write_json_atomic
+from date_picker import READ_LABEL_JS, date_label_matches
+
+
+def get_cache_path():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    working_dir = os.path.dirname(os.path.dirname(script_dir))
+    result_dir = os.path.join(working_dir, "result")
+    os.makedirs(result_dir, exist_ok=True)
+    return os.path.join(result_dir, "route_cache.json")
+
+
+def _read_cache_file():
+    try:
+        with open(get_cache_path(), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _split_query(url):
+    """(url parts without query, query pairs, query_in_fragment); hash routes keep the query in the fragment"""
+    parts = urlsplit(url)
+    if "?" in parts.fragment:
+        route, query = parts.fragment.split("?", 1)
+        return parts._replace(fragment=route), parse_qsl(query, keep_blank_values=True), True
+    return parts._replace(query=""), parse_qsl(parts.query, keep_blank_values=True), False
+
+
+def _join_query(parts, pairs, in_fragment):
+    query = urlencode(pairs)
+    if not query:
+        return urlunsplit(parts)
+    if in_fragment:
+        return urlunsplit(parts._replace(fragment=f"{parts.fragment}?{query}"))
+    return urlunsplit(parts._replace(query=query))
+
+
+def route_without_query(url):
+    return urlunsplit(_split_query(url)[0])
+
+
+class RouteCache:
+    """Remembered page routes (and filter query parameters) for one site"""
+
+    def __init__(self, site):
+        self.site = site
+        self.entries = _read_cache_file().get(site, {})
+        # Set by open_filtered: the page was reloaded, so filters set before it are gone
+        self.reloaded = False
+
+    def _save(self, removed=None):
+        # Re-read before writing so parallel shard workers do not drop each other's entries
+        cache = _read_cache_file()
+        site_entries = dict(cache.get(self.site, {}), **self.entries)
+        if removed:
+            site_entries.pop(removed, None)
+        cache[self.site] = site_entries
+        write_json_atomic(get_cache_path(), cache, indent=2)
+
+    def forget(self, page):
+        self.entries.pop(page, None)
+        self._save(removed=page)
+
+    def _page_ready(self, driver, url, ready_label, timeout):
+        """The page shows the filter label and the app did not redirect elsewhere"""
+        try:
+            WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+                EC.presence_of_element_located((By.XPATH, f"//div[@class='label' and text()='{ready_label}']"))
+            )
+        except Exception:
+            return False
+        return route_without_query(driver.current_url) == route_without_query(url)
+
+    def open_route(self, driver, page, ready_label, timeout=15):
+        """Open a remembered page with one driver.get; False (and the route is forgotten) if it does not load"""
+        entry = self.entries.get(page)
+        if not entry:
+            return False
+        driver.get(entry["url"])
+        if not self._page_ready(driver, entry["url"], ready_label, timeout):
+            print(f"\033[93m[WARNING] Remembered {page} route no longer works, navigating through the menu\033[0m")
+            self.forget(page)
+            return False
+        print(f"[INFO] Opened {page} page directly: {entry['url']}")
+        return True
+
+    def remember_route(self, driver, page, home_url):
+        """Remember the route the menu navigation ended on (nothing to learn if the URL did not change)"""
+        url = route_without_query(driver.current_url)
+        if url.rstrip("/") == route_without_query(home_url).rstrip("/"):
+            return
+        if self.entries.get(page, {}).get("url") == url:
+            return
+        self.entries[page] = {"url": url}
+        self._save()
+        print(f"[INFO] Learned {page} route: {url}")
+
+    def remember_filters(self, driver, page, values):
+        """
+        Learn which query parameters carry the filters after a search.
+        values: {role: text the URL shows for it}, e.g. {"start": "2025-01-31", "timezone": "05:30"}.
+        Only kept when both dates are found in the URL.
+        """
+        entry = self.entries.get(page)
+        if not entry:
+            return
+        parts, pairs, _ = _split_query(driver.current_url)
+        if urlunsplit(parts) != entry["url"]:
+            return
+        params = {}
+        for role, value in values.items():
+            for name, current in pairs:
+                if value and value in current and name not in params.values():
+                    params[role] = name
+                    break
+        if "start" not in params or "end" not in params:
+            return
+        if entry.get("filter_params") != params:
+            print(f"[INFO] Learned {page} filter parameters: {params}")
+        entry.update({"filter_url": driver.current_url, "filter_params": params, "filter_values": values})
+        self._save()
+
+    def open_filtered(self, driver, page, values, date_labels, ready_label, timeout=15):
+        """
+        Open the page with the filters set through the learned query parameters.
+        date_labels: {role: (label_text, date)} checked against the rendered pickers.
+        Returns the roles applied from the URL, or None when there is no filtered route or the app ignored it.
+        After None, check self.reloaded (filters set earlier are lost) and whether the page is still
+        in self.entries (when not, the plain route failed too and the browser is on an unknown page).
+        """
+        self.reloaded = False
+        entry = self.entries.get(page, {})
+        if "filter_url" not in entry:
+            return None
+        parts, pairs, in_fragment = _split_query(entry["filter_url"])
+        roles_by_param = {name: role for role, name in entry["filter_params"].items()}
+        filled = []
+        for name, current in pairs:
+            role = roles_by_param.get(name)
+            if role in values:
+                current = current.replace(entry["filter_values"][role], values[role])
+            filled.append((name, current))
+        url = _join_query(parts, filled, in_fragment)
+
+        driver.get(url)
+        self.reloaded = True
+        if not self._page_ready(driver, url, ready_label, timeout):
+            print(f"\033[93m[WARNING] Filtered {page} link did not load, setting the filters by hand\033[0m")
+            entry.pop("filter_url", None)
+            self._save()
+            self.open_route(driver, page, ready_label, timeout)
+            return None
+        for role, (label_text, date_value) in date_labels.items():
+            try:
+                WebDriverWait(driver, 5, poll_frequency=0.1).until(
+                    lambda d: date_label_matches(d.execute_script(READ_LABEL_JS, label_text), date_value)
+                )
+            except Exception:
+                print(f"\033[93m[WARNING] {label_text} from the link was not applied, setting the filters by hand\033[0m")
+                entry.pop("filter_url", None)
+                self._save()
+                return None
+        print(f"[INFO] Opened filtered {page} page directly")
+        return set(entry["filter_params"])
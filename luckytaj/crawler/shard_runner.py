@@ -0,0 +1,138 @@
+"""
+Date-range sharding for the transaction crawler
+Splits start_date..end_date into windows and crawls each window in its own worker
+process (transaction.py --worker), every worker driving a separate logged-in headless browser.
+Worker outputs stay in result/shards until the merged results are written, so --resume
+skips the windows that already finished.
+"""
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+
+from records import TransactionRecord
+
+
+def split_date_range(start_date, end_date, days=1):
+    """Split an inclusive date range into windows of `days` days, newest window first"""
+    days = max(1, days)
+    windows = []
+    window_end = end_date
+    while window_end >= start_date:
+        window_start = max(start_date, window_end - timedelta(days=days - 1))
+        windows.append((window_start, window_end))
+        window_end = window_start - timedelta(days=1)
+    return windows
+
+
+def get_shard_dir():
+    """Directory for worker outputs and logs (result/shards)"""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    working_dir = os.path.dirname(os.path.dirname(script_dir))
+    shard_dir = os.path.join(working_dir, "result", "shards")
+    os.makedirs(shard_dir, exist_ok=True)
+    return shard_dir
+
+
+def get_shard_output_path(site_key, window, mode, shard_dir=None):
+    """Records file a worker writes for one window"""
+    window_start, window_end = window
+    return os.path.join(shard_dir or get_shard_dir(), f"{site_key}_{mode}_{window_start}_{window_end}.json")
+
+
+def clear_shard_outputs(site_key, windows, mode):
+    """Remove the worker outputs once the merged results are on disk"""
+    for window in windows:
+        path = get_shard_output_path(site_key, window, mode)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def save_shard_records(path, records):
+    """Write a worker's records as JSON (dates as YYYY-MM-DD)"""
+    serializable = [record.to_json() for record in records]
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(serializable, f)
+    os.replace(tmp_path, path)
+
+
+def load_shard_records(path):
+    """Read a worker's records back, restoring the Date objects"""
+    with open(path, "r", encoding="utf-8") as f:
+        return [TransactionRecord.from_dict(record) for record in json.load(f)]
+
+
+def _run_worker(script_path, site_key, window, mode, extra_args, shard_dir, resume=False):
+    """Run one worker process for a window and return its records (a finished window is reused on resume)"""
+    window_start, window_end = window
+    output_path = get_shard_output_path(site_key, window, mode, shard_dir)
+    log_path = output_path[:-len(".json")] + ".log"
+    if os.path.exists(output_path):
+        if resume:
+            try:
+                records = load_shard_records(output_path)
+            except (OSError, ValueError) as e:
+                print(f"[WARNING] Shard output {output_path} unreadable ({e}), crawling the window again")
+            else:
+                print(f"[INFO] Shard {window_start} to {window_end} already finished, reusing its records")
+                return records
+        os.remove(output_path)
+
+    command = [
+        sys.executable, script_path, "--worker",
+        "--site", site_key,
+        "--mode", mode,
+        "--start", str(window_start),
+        "--end", str(window_end),
+        "--output", output_path,
+    ] + list(extra_args)
+
+    with open(log_path, "w", encoding="utf-8") as log:
+        result = subprocess.run(command, stdout=log, stderr=subprocess.STDOUT,
+                                stdin=subprocess.DEVNULL, cwd=os.path.dirname(script_path))
+
+    if result.returncode != 0 or not os.path.exists(output_path):
+        raise RuntimeError(f"worker exited with code {result.returncode}, see {log_path}")
+    return load_shard_records(output_path)
+
+
+def run_shards(script_path, site_key, windows, mode, workers, extra_args=(), resume=False):
+    """
+    Crawl every window with up to `workers` browsers at once.
+    Failed windows are retried once. Returns a list of record lists in window order,
+    or None if a window still fails (so partial totals are never reported).
+    resume: reuse the outputs of windows that finished in an interrupted run.
+    """
+    shard_dir = get_shard_dir()
+    results = {}
+    failed = []
+
+    print(f"\033[92m[INFO] Crawling {len(windows)} {mode} shard(s) with {workers} browser(s)...\033[0m")
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_run_worker, script_path, site_key, window, mode, extra_args, shard_dir, resume): window
+            for window in windows
+        }
+        for future in as_completed(futures):
+            window = futures[future]
+            try:
+                results[window] = future.result()
+                print(f"[SUCCESS] Shard {window[0]} to {window[1]}: {len(results[window])} records")
+            except Exception as e:
+                print(f"\033[93m[WARNING] Shard {window[0]} to {window[1]} failed: {e}\033[0m")
+                failed.append(window)
+
+    for window in failed:
+        print(f"[INFO] Retrying shard {window[0]} to {window[1]}...")
+        try:
+            results[window] = _run_worker(script_path, site_key, window, mode, extra_args, shard_dir, resume)
+            print(f"[SUCCESS] Shard {window[0]} to {window[1]}: {len(results[window])} records")
+        except Exception as e:
+            print(f"\033[91m[ERROR] Shard {window[0]} to {window[1]} failed again: {e}\033[0m")
+            return None
+
+    return [results[window] for window in windows]
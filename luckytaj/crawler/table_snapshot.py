@@ -0,0 +1,341 @@
+"""
+Table snapshot helpers for the Selenium crawlers
+Reads a whole result table in one WebDriver round trip and parses the rows in Python
+"""
+import time
+from html.parser import HTMLParser
+from selenium.webdriver.common.by import By
+
+from money import to_paise
+from records import TransactionRecord, parse_day
+# Table row selectors tried in order (defined with the page-turn waiter, which needs them too)
+from page_turn import TABLE_ROW_SELECTORS
+
+try:
+    import lxml.html
+except ImportError:  # optional, html.parser is used without it
+    lxml = None
+
+
+# Column mapping per back-office table
+DEPOSIT_COLUMNS = {
+    "min_cols": 10,
+    "order_id": 0,
+    "player_id": 4,
+    "phone": 5,
+    "amount": 9,
+    "tax_fee": 12,
+    "time": 20,
+    "gateway": 21,
+}
+
+WITHDRAWAL_COLUMNS = {
+    "min_cols": 5,
+    "order_id": 1,
+    "player_id": 7,
+    "phone": 8,
+    "amount": 12,
+    "tax_fee": 13,
+    "time": 18,
+    "gateway": 24,
+}
+
+# Returns the cell texts of every row for the first selector that matches
+SNAPSHOT_JS = """
+var selectors = arguments[0];
+for (var i = 0; i < selectors.length; i++) {
+    var rows = document.querySelectorAll(selectors[i]);
+    if (rows.length === 0) {
+        continue;
+    }
+    var out = [];
+    for (var r = 0; r < rows.length; r++) {
+        var cells = rows[r].getElementsByTagName('td');
+        var texts = [];
+        for (var c = 0; c < cells.length; c++) {
+            texts.push(cells[c].innerText || '');
+        }
+        out.push(texts);
+    }
+    return {selector: selectors[i], rows: out};
+}
+return {selector: null, rows: []};
+"""
+
+
+# Returns the raw row HTML for the first selector that matches plus the oldest date in the
+# time column, so the caller can decide on early stopping before the rows are parsed
+HTML_SNAPSHOT_JS = """
+var selectors = arguments[0];
+var timeColumn = arguments[1];
+for (var i = 0; i < selectors.length; i++) {
+    var rows = document.querySelectorAll(selectors[i]);
+    if (rows.length === 0) {
+        continue;
+    }
+    var html = [];
+    var oldest = null;
+    for (var r = 0; r < rows.length; r++) {
+        html.push(rows[r].outerHTML);
+        var cells = rows[r].getElementsByTagName('td');
+        if (cells.length > timeColumn) {
+            var day = (cells[timeColumn].textContent || '').trim().substring(0, 10);
+            if (/^\\d{4}-\\d{2}-\\d{2}$/.test(day) && (oldest === null || day < oldest)) {
+                oldest = day;
+            }
+        }
+    }
+    return {selector: selectors[i], html: '<table><tbody>' + html.join('') + '</tbody></table>', oldest: oldest};
+}
+return {selector: null, html: '', oldest: null};
+"""
+
+
+# Applies the date window, summary-row skip, money checks and column projection in the page.
+# Rows are newest first, so the scan stops at the first row older than the start date.
+PUSHDOWN_JS = """
+var selectors = arguments[0], columns = arguments[1], startDate = arguments[2], endDate = arguments[3];
+function cellText(cells, index, fallback) {
+    return cells.length > index ? (cells[index].innerText || '').trim() : fallback;
+}
+function money(text, label, rowNumber, warnings) {
+    // Checked here, returned as text: Python turns it into exact paise
+    var cleaned = text.replace(/Rs/g, '').replace(/,/g, '').trim();
+    if (!cleaned) { return '0'; }
+    if (!isFinite(Number(cleaned))) {
+        warnings.push('Invalid ' + label + " '" + cleaned + "' in row " + rowNumber + ', setting to 0.0');
+        return '0';
+    }
+    return cleaned;
+}
+for (var i = 0; i < selectors.length; i++) {
+    var rows = document.querySelectorAll(selectors[i]);
+    if (rows.length === 0) {
+        continue;
+    }
+    var records = [], warnings = [], crossedStart = false, tooNew = 0, skipped = 0;
+    for (var r = 0; r < rows.length; r++) {
+        var rowNumber = r + 1;
+        var cells = rows[r].getElementsByTagName('td');
+        if (cells.length < columns.min_cols) { skipped++; continue; }
+        var first = (cells[0].innerText || '');
+        if (first.indexOf('Page Summary') !== -1 || first.indexOf('Total Summary') !== -1) { skipped++; continue; }
+
+        var time = cellText(cells, columns.time, '');
+        var day = time.split(' ')[0];
+        if (!/^\\d{4}-\\d{2}-\\d{2}$/.test(day)) {
+            warnings.push('No valid date in row ' + rowNumber + " ('" + time + "'), skipping");
+            continue;
+        }
+        if (day > endDate) { tooNew++; continue; }
+        if (day < startDate) { crossedStart = true; break; }
+
+        if (cells.length <= columns.order_id || cells.length <= columns.phone) {
+            warnings.push('Row ' + rowNumber + ' has no Order ID/Phone column, skipping');
+            continue;
+        }
+        records.push([
+            cellText(cells, columns.order_id, ''),
+            cellText(cells, columns.player_id, ''),
+            cellText(cells, columns.phone, ''),
+            money(cellText(cells, columns.amount, ''), 'amount', rowNumber, warnings),
+            money(cellText(cells, columns.tax_fee, ''), 'tax fee', rowNumber, warnings),
+            time,
+            cellText(cells, columns.gateway, 'Unknown'),
+        ]);
+    }
+    return {selector: selectors[i], rows: rows.length, records: records, crossed_start: crossedStart,
+            too_new: tooNew, skipped: skipped, warnings: warnings};
+}
+return {selector: null, rows: 0, records: [], crossed_start: false, too_new: 0, skipped: 0, warnings: []};
+"""
+
+
+def snapshot_table_rows(driver, selectors=None):
+    """
+    Read every row of the result table as a list of cell strings.
+    Uses a single execute_script call; falls back to one find_elements pass
+    (no per-row re-lookup) if the script cannot run.
+    Returns (rows, working_selector)
+    """
+    selectors = selectors or TABLE_ROW_SELECTORS
+    try:
+        snapshot = driver.execute_script(SNAPSHOT_JS, selectors)
+        rows = [[(text or "").strip() for text in row] for row in snapshot.get("rows", [])]
+        return rows, snapshot.get("selector")
+    except Exception as e:
+        print(f"[DEBUG] Snapshot script failed ({e}), reading cells directly...")
+
+    for selector in selectors:
+        elements = driver.find_elements(By.CSS_SELECTOR, selector)
+        if elements:
+            rows = []
+            for element in elements:
+                try:
+                    rows.append([td.text.strip() for td in element.find_elements(By.TAG_NAME, 'td')])
+                except Exception as e:
+                    print(f"[WARNING] Could not read row: {e}")
+                    rows.append([])
+            return rows, selector
+    return [], None
+
+
+def snapshot_table_html(driver, time_column, selectors=None, timeout=10):
+    """
+    Grab the result table's raw row HTML in one round trip (waits up to `timeout` for rows).
+    Returns {"selector", "html", "oldest"} where oldest is the earliest 'YYYY-MM-DD' in the time column.
+    """
+    selectors = selectors or TABLE_ROW_SELECTORS
+    deadline = time.time() + timeout
+    while True:
+        snapshot = driver.execute_script(HTML_SNAPSHOT_JS, selectors, time_column)
+        if snapshot.get("selector") or time.time() >= deadline:
+            return snapshot
+        time.sleep(0.2)
+
+
+class _TableRowParser(HTMLParser):
+    """Collects the text of every <td> per <tr> (whitespace collapsed like innerText)"""
+
+    def __init__(self):
+        super().__init__()
+        self.rows = []
+        self._row = None
+        self._cell = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "tr":
+            self._row = []
+        elif tag == "td" and self._row is not None:
+            self._cell = []
+        elif tag == "br" and self._cell is not None:
+            self._cell.append(" ")
+
+    def handle_endtag(self, tag):
+        if tag == "td" and self._cell is not None:
+            self._row.append(" ".join("".join(self._cell).split()))
+            self._cell = None
+        elif tag == "tr" and self._row is not None:
+            self.rows.append(self._row)
+            self._row = None
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell.append(data)
+
+
+def parse_table_html(html):
+    """Turn snapshot HTML into rows of cell strings (lxml when installed, else html.parser)"""
+    if not html:
+        return []
+    if lxml is not None:
+        table = lxml.html.fromstring(html)
+        for br in table.iter("br"):
+            br.tail = " " + (br.tail or "")
+        return [[" ".join(td.text_content().split()) for td in tr.findall("td")] for tr in table.iter("tr")]
+    parser = _TableRowParser()
+    parser.feed(html)
+    parser.close()
+    return parser.rows
+
+
+def pushdown_transaction_rows(driver, start_date, end_date, columns, selectors=None):
+    """
+    Filter and project the table inside the page (PUSHDOWN_JS) so only in-range, typed rows
+    come back over WebDriver. Same rules as parse_transaction_rows.
+    Returns (collected_records, should_stop_scraping, working_selector)
+    """
+    result = driver.execute_script(PUSHDOWN_JS, selectors or TABLE_ROW_SELECTORS, columns,
+                                   str(start_date), str(end_date))
+    for warning in result["warnings"]:
+        print(f"[WARNING] {warning}")
+    if result["too_new"] or result["skipped"]:
+        print(f"[DEBUG] {result['too_new']} row(s) newer than {end_date}, {result['skipped']} short/summary row(s) skipped in page")
+    if result["crossed_start"]:
+        print(f"[INFO] Reached rows older than {start_date}, stopping scraping")
+
+    collected_records = []
+    for order_id, player_id, phone, amount, tax_fee, full_date_str, gateway in result["records"]:
+        collected_records.append(TransactionRecord(
+            order_id, player_id, phone, to_paise(amount), to_paise(tax_fee), full_date_str, gateway,
+            parse_day(full_date_str.split(" ")[0])
+        ))
+    return collected_records, result["crossed_start"], result["selector"]
+
+
+def _cell(cols, index, default=""):
+    """Return a column value or a default when the row is too short"""
+    return cols[index] if len(cols) > index else default
+
+
+def parse_money(text, label, row_number):
+    """Parse an amount/fee cell ('Rs 1,500.00') into integer paise, 0 on bad input"""
+    cleaned = text.replace("Rs", "").replace(",", "").strip()
+    try:
+        return to_paise(cleaned)
+    except ValueError:
+        print(f"[WARNING] Invalid {label} '{cleaned}' in row {row_number}, setting to 0")
+        return 0
+
+
+def parse_transaction_rows(rows, start_date, end_date, columns):
+    """
+    Parse snapshot rows into transaction records with early-stopping date filtering.
+    columns is DEPOSIT_COLUMNS or WITHDRAWAL_COLUMNS.
+    Returns (collected_records, should_stop_scraping)
+    """
+    collected_records = []
+    should_stop_scraping = False
+
+    for idx, cols in enumerate(rows):
+        row_number = idx + 1
+        try:
+            if len(cols) < columns["min_cols"]:
+                print(f"[WARNING] Row {row_number} has only {len(cols)} columns. Skipping.")
+                continue
+
+            # Skip summary rows
+            first_col_text = cols[0]
+            if "Page Summary" in first_col_text or "Total Summary" in first_col_text:
+                print(f"[INFO] Skipping summary row: '{first_col_text}'")
+                continue
+
+            # Time column (format: 'YYYY-MM-DD HH:MM:SS')
+            full_date_str = _cell(cols, columns["time"])
+            if not full_date_str:
+                print(f"[WARNING] No date in row {row_number}, skipping")
+                continue
+
+            try:
+                row_date = parse_day(full_date_str.split(" ")[0])
+            except ValueError as e:
+                print(f"[WARNING] Invalid date format '{full_date_str}' in row {row_number}: {e}")
+                continue
+
+            # Date filtering logic with early stopping
+            if row_date > end_date:
+                print(f"[DEBUG] Row {row_number} too new ({row_date}), skipping")
+                continue
+
+            if row_date < start_date:
+                print(f"[INFO] Row {row_number} too old ({row_date}), stopping scraping")
+                should_stop_scraping = True
+                break
+
+            record = TransactionRecord(
+                cols[columns["order_id"]],
+                _cell(cols, columns["player_id"]),
+                cols[columns["phone"]],
+                parse_money(_cell(cols, columns["amount"]), "amount", row_number),
+                parse_money(_cell(cols, columns["tax_fee"]), "tax fee", row_number),
+                full_date_str,
+                _cell(cols, columns["gateway"], "Unknown"),
+                row_date
+            )
+            collected_records.append(record)
+
+        except Exception as e:
+            print(f"[ERROR] Failed to process row {row_number}: {e}")
+            continue
+
+    return collected_records, should_stop_scraping
@@ -0,0 +1,138 @@
+"""
+Tests for api_source against a local stand-in for the back-office table API
+
+    python -m pytest test_api_source.py   (or: python -m unittest test_api_source)
+"""
+import json
+import threading
+import unittest
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from api_source import API_COLUMNS, ApiTableClient, api_item_to_row, find_table_request
+from table_snapshot import parse_transaction_rows
+
+ROWS = [
+    {"orderNo": f"LTJPD{1000 - i}", "memberCode": f"LTJ{i:05d}", "mobile": f"91{i:010d}",
+     "amount": "1,500.00", "fee": 72.0, "createTime": f"2026-02-{19 - i // 100:02d} 12:00:00",
+     "channelName": "SKPAY" if i % 2 else "YTPAY"}
+    for i in range(250)
+]
+SERVER_PAGE_CAP = 200
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Pages ROWS like the back office: cookie required, pageSize silently capped"""
+    requests_seen = []
+    page_cap = SERVER_PAGE_CAP
+    send_total = True
+
+    def do_POST(self):
+        if self.headers.get("Cookie") != "session=abc":
+            self.send_response(401)
+            self.end_headers()
+            return
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.requests_seen.append((int(body["pageNo"]), int(body["pageSize"])))
+        size = min(int(body["pageSize"]), self.page_cap)
+        start = (int(body["pageNo"]) - 1) * size
+        payload = {"code": 0, "data": {"list": ROWS[start:start + size]}}
+        if self.send_total:
+            payload["data"]["total"] = len(ROWS)
+        data = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class ApiTableClientTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_port}/api/deposit/list"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        StandInHandler.requests_seen = []
+        StandInHandler.page_cap = SERVER_PAGE_CAP
+        StandInHandler.send_total = True
+        captured = [{
+            "method": "POST", "url": self.url, "status": 200, "headers": {"Content-Type": "application/json"},
+            "body": json.dumps({"pageNo": 1, "pageSize": 50, "status": "APPROVED"}),
+            "response": json.dumps({"data": {"total": len(ROWS), "list": ROWS[:50]}}),
+        }]
+        self.request = find_table_request(captured)
+        self.client = ApiTableClient(self.request, cookies=[{"name": "session", "value": "abc"}])
+
+    def test_capture_is_recognised(self):
+        self.assertIsNotNone(self.request)
+        self.assertEqual((self.client.page_key, self.client.size_key), ("pageNo", "pageSize"))
+        self.assertEqual(self.client.first_page, 1)
+
+    def test_page_size_is_negotiated_down_to_the_server_cap(self):
+        self.assertEqual(self.client.negotiate_page_size(), SERVER_PAGE_CAP)
+        self.assertEqual(StandInHandler.requests_seen, [(1, 1000)])
+
+    def test_cap_without_total_is_found_on_page_2(self):
+        StandInHandler.send_total = False
+        size = self.client.negotiate_page_size()
+
+        self.assertEqual(size, SERVER_PAGE_CAP)
+        self.assertEqual([len(items) for _, items in self.client.iter_pages(size)], [200, 50])
+
+    def test_short_last_page_without_total_keeps_the_size(self):
+        StandInHandler.send_total = False
+        StandInHandler.page_cap = 1000
+        self.assertEqual(self.client.negotiate_page_size(), 1000)
+        self.assertEqual(StandInHandler.requests_seen, [(1, 1000), (2, 1000)])
+
+    def test_no_size_when_every_size_is_rejected(self):
+        client = ApiTableClient(self.request)  # No session cookie: every size is refused
+        self.assertIsNone(client.negotiate_page_size(candidates=(500, 100)))
+
+    def test_paging_reuses_the_negotiated_first_page(self):
+        size = self.client.negotiate_page_size()
+        pages = list(self.client.iter_pages(size))
+
+        self.assertEqual([(number, len(items)) for number, items in pages], [(1, 200), (2, 50)])
+        self.assertEqual([item["orderNo"] for _, items in pages for item in items],
+                         [row["orderNo"] for row in ROWS])
+        # Page 1 came from negotiation; only page 2 was fetched by iter_pages
+        self.assertEqual(StandInHandler.requests_seen, [(1, 1000), (2, 200)])
+
+    def test_paging_without_negotiation(self):
+        pages = list(self.client.iter_pages(100))
+        self.assertEqual([len(items) for _, items in pages], [100, 100, 50])
+        self.assertEqual(StandInHandler.requests_seen, [(1, 100), (2, 100), (3, 100)])
+
+    def test_api_item_to_row(self):
+        self.assertEqual(api_item_to_row(ROWS[1]),
+                         ["LTJPD999", "LTJ00001", "910000000001", "1,500.00", "72.0", "2026-02-19 12:00:00", "SKPAY"])
+        self.assertEqual(api_item_to_row({"id": 7, "createTime": 1771484400000})[5], "2026-02-19 12:30:00")
+        self.assertEqual(api_item_to_row({"id": 7})[6], "Unknown")
+
+    def test_rows_parse_into_records(self):
+        items = [item for _, page in self.client.iter_pages(200) for item in page]
+        records, should_stop = parse_transaction_rows(
+            [api_item_to_row(item) for item in items], date(2026, 2, 18), date(2026, 2, 19), API_COLUMNS)
+
+        self.assertEqual(len(records), 200)
+        self.assertTrue(should_stop)  # Rows from 2026-02-17 end the range
+        first = records[0]
+        self.assertEqual((first["Order ID"], first["Amount"], first["Tax Fee"], first["Gateway"]),
+                         ("LTJPD1000", 150000, 7200, "YTPAY"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+Tests for crawl_state: the incremental path must never skip days that were not crawled
+
+    python -m pytest test_crawl_state.py   (or: python -m unittest test_crawl_state)
+"""
+import os
+import tempfile
+import unittest
+from datetime import date, timedelta
+from unittest import mock
+
+import crawl_state
+from records import TransactionRecord
+
+
+def _record(order_id, day):
+    return TransactionRecord(order_id, "P1", "98", 150000, 0, f"{day} 12:00:00", "XYPAY", day)
+
+
+class CrawlStateCoverageTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(crawl_state, "get_state_path",
+                                    lambda site_key, mode: os.path.join(self.tmp.name, f"{site_key}_{mode}.json"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+        today = date.today()
+        self.day1, self.day2, self.day3 = today - timedelta(days=3), today - timedelta(days=2), today - timedelta(days=1)
+
+    def test_gap_between_crawled_days_forces_full_crawl(self):
+        # Crawl day 3, then day 1: day 2 was never crawled
+        crawl_state.save_crawl_state("site", "deposit", [_record("D3", self.day3)], self.day3, self.day3)
+        crawl_state.save_crawl_state("site", "deposit", [_record("D1", self.day1)], self.day1, self.day1)
+
+        self.assertIsNone(crawl_state.get_known_records("site", "deposit", self.day2, self.day3))
+
+    def test_contiguous_coverage_is_used(self):
+        crawl_state.save_crawl_state("site", "deposit", [_record("D2", self.day2)], self.day2, self.day2)
+        crawl_state.save_crawl_state("site", "deposit", [_record("D3", self.day3)], self.day3, self.day3)
+
+        known = crawl_state.get_known_records("site", "deposit", self.day2, self.day3)
+        self.assertEqual(sorted(record["Order ID"] for record in known), ["D2", "D3"])
+        state = crawl_state.load_crawl_state("site", "deposit")
+        self.assertEqual(state["covered"], [(self.day2, self.day3)])
+
+    def test_only_the_range_containing_start_date_is_known(self):
+        # Records above a gap must not stop the paging before the gap is crawled
+        crawl_state.save_crawl_state("site", "deposit", [_record("D1", self.day1)], self.day1, self.day1)
+        crawl_state.save_crawl_state("site", "deposit", [_record("D3", self.day3)], self.day3, self.day3)
+
+        known = crawl_state.get_known_records("site", "deposit", self.day1, self.day3)
+        self.assertEqual([record["Order ID"] for record in known], ["D1"])
+
+    def test_merge_ranges_joins_touching_days(self):
+        self.assertEqual(crawl_state.merge_ranges([(self.day3, self.day3), (self.day1, self.day2)]),
+                         [(self.day1, self.day3)])
+
+
+if __name__ == "__main__":
+    unittest.main()
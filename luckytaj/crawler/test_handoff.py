@@ -0,0 +1,74 @@
+"""
+Tests for handoff: JSONL + index round trip, written to a temp directory instead of result/
+
+    python -m pytest test_handoff.py   (or: python -m unittest test_handoff)
+"""
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import handoff
+
+
+def _records(count, minute=10):
+    return [{"Order ID": f"D{i}", "Amount": 10000 + i, "Tax Fee": 100,
+             "Time": f"2025-01-01 {minute}:{i // 60:02d}:{i % 60:02d}"} for i in range(count)]
+
+
+class HandoffTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(handoff, "get_handoff_paths",
+                                    lambda name: (os.path.join(self.tmp.name, f"{name}.jsonl"),
+                                                  os.path.join(self.tmp.name, f"{name}.index.json")))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+        self.xypay, self.skpay = _records(250), _records(3, minute=11)
+        handoff.write_handoff("test", {"DEPOSITS": {"XYPAY": self.xypay, "SKPAY": self.skpay},
+                                       "WITHDRAWALS": {"XYPAY": self.skpay}})
+        self.index = handoff.load_handoff_index("test")
+
+    def test_totals_come_from_the_index(self):
+        self.assertIsNotNone(self.index)
+        amount = sum(record["Amount"] for record in self.xypay + self.skpay)
+        self.assertEqual(handoff.handoff_totals(self.index, "DEPOSITS"), (253, amount, 253 * 100))
+        self.assertEqual(handoff.handoff_totals(self.index, "MISSING"), (0, 0, 0))
+
+    def test_records_round_trip_with_exact_money(self):
+        records = list(handoff.iter_handoff_records(self.index, "DEPOSITS"))
+        self.assertEqual([record["Order ID"] for record in records],
+                         [record["Order ID"] for record in self.xypay + self.skpay])
+        self.assertEqual(records[1]["Amount"], 10001)
+        self.assertEqual(records[0]["Gateway"], "XYPAY")
+        with open(self.index["data_path"], "r", encoding="utf-8") as f:
+            self.assertEqual(json.loads(f.readline())["Amount"], "100.00")
+
+    def test_after_time_seeks_past_the_cutoff(self):
+        after = list(handoff.iter_handoff_records(self.index, "DEPOSITS", "XYPAY", after_time="2025-01-01 10:03:20"))
+        self.assertEqual(len(after), 49)
+        self.assertEqual(after[0]["Order ID"], "D201")
+        # A gateway whose newest record is at or before the cutoff is skipped from the index
+        self.assertEqual(list(handoff.iter_handoff_records(self.index, "DEPOSITS", "SKPAY",
+                                                           after_time="2025-01-01 11:00:02")), [])
+
+    def test_resized_data_file_invalidates_the_index(self):
+        with open(self.index["data_path"], "ab") as f:
+            f.write(b"{}\n")
+        self.assertIsNone(handoff.load_handoff_index("test"))
+
+    def test_newer_text_result_wins(self):
+        text_path = os.path.join(self.tmp.name, "result.txt")
+        with open(text_path, "w", encoding="utf-8") as f:
+            f.write("edited by hand\n")
+        later = time.time() + 5
+        os.utime(text_path, (later, later))
+        self.assertIsNone(handoff.load_handoff_index("test", text_path=text_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
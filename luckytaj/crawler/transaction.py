@@ -1,10 +1,5 @@
 from selenium import webdriver
-from selenium.webdriver.firefox.service import Service
 from selenium.webdriver.firefox.options import Options
-from webdriver_manager.firefox import GeckoDriverManager
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from webdriver_manager.chrome import ChromeDriverManager
 import time
 import signal
 import sys
@@ -12,10 +7,35 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
+from selenium.common.exceptions import TimeoutException
 import os
+import argparse
 from datetime import datetime
+import requests
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from terminal_utils import setup_automation_terminal, cleanup_terminal, print_status
+from table_snapshot import snapshot_table_rows, snapshot_table_html, parse_table_html, parse_transaction_rows, pushdown_transaction_rows, DEPOSIT_COLUMNS, WITHDRAWAL_COLUMNS, TABLE_ROW_SELECTORS
+from browser_daemon import attach_browser
+from crawl_state import get_known_records, save_crawl_state, merge_known_records
+from crawl_journal import get_journal_path, start_journal, append_journal_page, mark_journal_complete, load_journal, finish_journal
+from handoff import write_handoff, HANDOFF_TRANSACTIONS
+from page_turn import table_fingerprint, wait_for_page_turn, PageTurnTimeout, NEXT_BUTTON_LOCATORS, NEXT_BUTTON_CATCH_ALL
+from paginator import jump_to_page, seek_start_page, SeekError
+from page_size import negotiate_page_size, click_page_size_option
+from locator_cache import LocatorCache
+from wait_timing import WaitTimer
+from date_picker import inject_browser_date
+from route_cache import RouteCache
+from session_store import restore_session, save_session, clear_session
+from driver_bootstrap import start_driver
+from background_start import BackgroundStart
+from crawl_profile import apply_crawl_profile
+from warm_profile import WarmProfile, cache_report
+from aggregates import aggregate_records, aggregate_groups
+from money import format_rupees
+from shard_runner import split_date_range, run_shards, save_shard_records, clear_shard_outputs
+from api_source import install_capture_hook, read_captured_requests, find_table_request, api_item_to_row, ApiTableClient, API_COLUMNS
 
 def signal_handler(signum, frame):
     """Handle shutdown signals gracefully"""
@@ -25,6 +45,7 @@ def signal_handler(signum, frame):
         print("[INFO] Browser closed successfully")
     except:
         print("[WARNING] Browser was already closed or unavailable")
+    print("[INFO] Pages crawled so far are kept in result/journal, run again with --resume to continue")
     sys.exit(0)
 
 def get_captcha_number(driver, timeout=40):
@@ -37,103 +58,76 @@ def get_captcha_number(driver, timeout=40):
     print(f"[DEBUG] Found {len(digits)} spans, captcha: {captcha_text}")
     return captcha_text
 
-def navigate_to_deposit_page(driver, config):
-    """Navigate to the deposit page after login (site-specific)"""
+def select_status_approved(driver):
+    """Set the Status filter to 'Approved'"""
+    status_dropdown = WebDriverWait(driver, 20).until(
+        EC.element_to_be_clickable((By.XPATH,
+            "//div[@class='label' and text()='Status']/following-sibling::div//div[contains(@class,'o-input-wrapper')]"
+        ))
+    )
+    status_dropdown.click()
+
+    approved_option = timer.wait(driver, "status_option", EC.element_to_be_clickable((By.XPATH, "//*[contains(text(),'Approved')]")), timeout=10)
+    approved_option.click()
+    print("[INFO] Status filter set to 'Approved'")
+
+def open_finance_submenu(driver, item_text):
+    """Open Finance Management > item_text in the sidebar (expanding the menu if needed)"""
     wait = WebDriverWait(driver, 40)
+    submenu_xpath = f"//a[span[@class='bullet-point'] and text()='{item_text}']"
 
-    if config.get('has_navigation'):
+    submenu_items = driver.find_elements(By.XPATH, submenu_xpath)
+    if not (submenu_items and submenu_items[0].is_displayed()):
         # Wait for sidebar/main page to load
         menu_link = wait.until(EC.element_to_be_clickable(
             (By.XPATH, "//button[.//div[text()='Finance Management']]")
         ))
 
         # Wait for ajax loader to finish
-        WebDriverWait(driver, 20).until(
-            EC.invisibility_of_element_located((By.CLASS_NAME, "ajaxLoader"))
-        )
+        timer.wait(driver, "ajax_loader", EC.invisibility_of_element_located((By.CLASS_NAME, "ajaxLoader")), timeout=20)
         print("[INFO] ajaxLoader complete")
-        time.sleep(2)
 
         menu_link.click()
 
-        # Click "Deposit" submenu
-        submenu_item = wait.until(EC.element_to_be_clickable(
-            (By.XPATH, "//a[span[@class='bullet-point'] and text()='Deposit']")
-        ))
-        submenu_item.click()
+    submenu_item = wait.until(EC.element_to_be_clickable((By.XPATH, submenu_xpath)))
+    submenu_item.click()
 
-        # Wait for panel and ajax loader
-        WebDriverWait(driver, 20).until(
-            EC.invisibility_of_element_located((By.CSS_SELECTOR, ".box.box-info"))
-        )
-        print("[INFO] Panel load complete")
-        time.sleep(2)
+    # Wait for panel and ajax loader
+    timer.wait(driver, "panel_load", EC.invisibility_of_element_located((By.CSS_SELECTOR, ".box.box-info")), timeout=20)
+    print("[INFO] Panel load complete")
 
-        WebDriverWait(driver, 20).until(
-            EC.invisibility_of_element_located((By.CLASS_NAME, "ajaxLoader"))
-        )
-        print("[INFO] ajaxLoader complete")
-        time.sleep(2)
+    timer.wait(driver, "ajax_loader", EC.invisibility_of_element_located((By.CLASS_NAME, "ajaxLoader")), timeout=20)
+    print("[INFO] ajaxLoader complete")
+
+def navigate_to_deposit_page(driver, config):
+    """Navigate to the deposit page after login (site-specific), straight to the learned route when there is one"""
+    if config.get('has_navigation'):
+        if not routes.open_route(driver, "deposit", "Start Date"):
+            open_finance_submenu(driver, "Deposit")
+            routes.remember_route(driver, "deposit", config['url'])
 
     # Status filter (select "Approved")
     if config.get('has_status_filter'):
-        status_dropdown = WebDriverWait(driver, 20).until(
-            EC.element_to_be_clickable((By.XPATH,
-                "//div[@class='label' and text()='Status']/following-sibling::div//div[contains(@class,'o-input-wrapper')]"
-            ))
-        )
-        status_dropdown.click()
-        time.sleep(1)
-
-        approved_option = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, "//*[contains(text(),'Approved')]"))
-        )
-        approved_option.click()
-        print("[INFO] Status filter set to 'Approved'")
+        select_status_approved(driver)
 
     print(f"[INFO] Navigation complete for {config['name']}")
 
 def navigate_to_withdrawal_page(driver, config):
-    """Navigate to the withdrawal page (site-specific)"""
-    wait = WebDriverWait(driver, 40)
-
+    """Navigate to the withdrawal page (site-specific), straight to the learned route when there is one"""
     if config.get('has_navigation'):
-        submenu_item = wait.until(EC.element_to_be_clickable(
-            (By.XPATH, "//a[span[@class='bullet-point'] and text()='Withdraw']")
-        ))
-        submenu_item.click()
-
-        WebDriverWait(driver, 20).until(
-            EC.invisibility_of_element_located((By.CSS_SELECTOR, ".box.box-info"))
-        )
-        print("[INFO] Panel load complete")
-        time.sleep(2)
-
-        WebDriverWait(driver, 20).until(
-            EC.invisibility_of_element_located((By.CLASS_NAME, "ajaxLoader"))
-        )
-        print("[INFO] ajaxLoader complete")
-        time.sleep(2)
+        if not routes.open_route(driver, "withdrawal", "Start Date"):
+            open_finance_submenu(driver, "Withdraw")
+            routes.remember_route(driver, "withdrawal", config['url'])
 
     if config.get('has_status_filter'):
-        status_dropdown = WebDriverWait(driver, 20).until(
-            EC.element_to_be_clickable((By.XPATH,
-                "//div[@class='label' and text()='Status']/following-sibling::div//div[contains(@class,'o-input-wrapper')]"
-            ))
-        )
-        status_dropdown.click()
-        time.sleep(1)
-        approved_option = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, "//*[contains(text(),'Approved')]"))
-        )
-        approved_option.click()
-        print("[INFO] Status filter set to 'Approved'")
+        select_status_approved(driver)
 
     print(f"[INFO] Withdrawal navigation complete for {config['name']}")
 
 def set_browser_date(driver, label_text, date_value):
     """Set a date in the browser's calendar picker by label ('Start Date' or 'End Date').
-    date_value should be a datetime.date object."""
+    date_value should be a datetime.date object.
+    Injects the date directly and clicks through the calendar only if the label does not show it."""
     month_names = {1: "Jan", 2: "Feb", 3: "Mar", 4: "Apr", 5: "May", 6: "Jun",
                    7: "Jul", 8: "Aug", 9: "Sep", 10: "Oct", 11: "Nov", 12: "Dec"}
     target_year = str(date_value.year)
@@ -142,6 +136,10 @@ def set_browser_date(driver, label_text, date_value):
 
     print(f"[INFO] Setting {label_text} to {date_value} ({target_day} {target_month} {target_year})")
 
+    # Fast path: one script call, verified against the rendered label
+    if inject_browser_date(driver, label_text, date_value):
+        return
+
     # Click the date picker trigger to open calendar
     trigger = WebDriverWait(driver, 10).until(
         EC.element_to_be_clickable((By.XPATH,
@@ -149,48 +147,36 @@ def set_browser_date(driver, label_text, date_value):
         ))
     )
     trigger.click()
-    time.sleep(1)
 
     # Wait for calendar dropdown to appear
-    WebDriverWait(driver, 10).until(
-        EC.visibility_of_element_located((By.CSS_SELECTOR, "div.o-select-dropdown"))
-    )
+    timer.wait(driver, "date_picker_open", EC.visibility_of_element_located((By.CSS_SELECTOR, "div.o-select-dropdown")), timeout=10)
 
     # Click the year header button to open year picker
     year_btns = driver.find_elements(By.CSS_SELECTOR, "div.o-select-dropdown button.op-dp-date-btn")
     if len(year_btns) >= 2:
         year_btns[1].click()  # Second button is year
-        time.sleep(0.5)
 
     # Click the target year
-    year_cell = WebDriverWait(driver, 5).until(
-        EC.element_to_be_clickable((By.XPATH,
+    year_cell = timer.wait(driver, "date_picker_year", EC.element_to_be_clickable((By.XPATH,
             f"//div[contains(@class,'o-select-dropdown')]//button[contains(@class,'o-dp-year-cell') and text()='{target_year}']"
-        ))
-    )
+        )), timeout=5)
     year_cell.click()
     print(f"[INFO] Selected year: {target_year}")
-    time.sleep(0.5)
 
     # Click the target month
-    month_cell = WebDriverWait(driver, 5).until(
-        EC.element_to_be_clickable((By.XPATH,
+    month_cell = timer.wait(driver, "date_picker_month", EC.element_to_be_clickable((By.XPATH,
             f"//div[contains(@class,'o-select-dropdown')]//button[contains(@class,'o-dp-month-cell') and text()='{target_month}']"
-        ))
-    )
+        )), timeout=5)
     month_cell.click()
     print(f"[INFO] Selected month: {target_month}")
-    time.sleep(0.5)
 
     # Click the target day (not 'light' class - those are next/prev month)
-    day_cell = WebDriverWait(driver, 5).until(
-        EC.element_to_be_clickable((By.XPATH,
+    day_cell = timer.wait(driver, "date_picker_day", EC.element_to_be_clickable((By.XPATH,
             f"//div[contains(@class,'o-select-dropdown')]//div[contains(@class,'dpBodyCell') and not(contains(@class,'light')) and text()='{target_day}']"
-        ))
-    )
+        )), timeout=5)
     day_cell.click()
     print(f"[INFO] Selected day: {target_day}")
-    time.sleep(1)
+    timer.settle(driver, "date_picker_close", EC.invisibility_of_element_located((By.CSS_SELECTOR, "div.o-select-dropdown")), timeout=1)
     print(f"[INFO] {label_text} set to {date_value}")
 
 def click_search_button(driver):
@@ -202,17 +188,11 @@ def click_search_button(driver):
         (By.CSS_SELECTOR, "button.search-btn"),
         (By.CSS_SELECTOR, "button[type='submit']"),
     ]
-    for by, selector in search_selectors:
-        try:
-            search_button = WebDriverWait(driver, 5).until(
-                EC.element_to_be_clickable((by, selector))
-            )
-            search_button.click()
-            print(f"[INFO] Clicked Search button using: {selector}")
-            _wait_for_search_animation(driver)
-            return
-        except Exception:
-            continue
+    search_button, locator = locators.find(driver, "search_button", search_selectors, timeout=5)
+    if search_button is not None and locators.click(driver, "search_button", search_button):
+        print(f"[INFO] Clicked Search button using: {locator[1]}")
+        _wait_for_search_animation(driver)
+        return
     print("[WARNING] Could not find Search button automatically.")
     input("Please click the Search button manually, then press ENTER here to continue...")
     _wait_for_search_animation(driver)
@@ -221,9 +201,7 @@ def click_search_button(driver):
 def _wait_for_search_animation(driver):
     """Wait for table refresh to finish after Search is clicked."""
     try:
-        WebDriverWait(driver, 20).until(
-            EC.invisibility_of_element_located((By.CLASS_NAME, "ajaxLoader"))
-        )
+        timer.wait(driver, "search_refresh", EC.invisibility_of_element_located((By.CLASS_NAME, "ajaxLoader")), timeout=20)
         print("[INFO] Table refresh complete")
     except Exception:
         print("[DEBUG] ajaxLoader not detected, continuing...")
@@ -239,43 +217,41 @@ def select_timezone(driver, slug="+05:30"):
             ))
         )
         tz_trigger.click()
-        time.sleep(1)
 
         # Find the option by data-slug and click via JS (options have disabled attribute)
-        tz_span = WebDriverWait(driver, 5).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR,
+        tz_span = timer.wait(driver, "timezone_option", EC.presence_of_element_located((By.CSS_SELECTOR,
                 f"div.o-select-body span[data-slug='{slug}']"
-            ))
-        )
+            )), timeout=5)
         driver.execute_script("arguments[0].click();", tz_span)
         print(f"[INFO] Set Time Zone to GMT{slug}")
-        time.sleep(1)
+        timer.settle(driver, "timezone_close", EC.invisibility_of_element_located((By.CSS_SELECTOR, "div.o-select-body")), timeout=1)
     except Exception as e:
         print(f"[WARNING] Could not set Time Zone to GMT{slug}: {e}")
         input("Please select the timezone manually, then press ENTER here to continue...")
 
-def select_per_page(driver, value="50"):
-    """Select per-page count from the dropdown (e.g. '50')."""
+def select_per_page(driver, value="50", page_type="deposit"):
+    """Select per-page count from the dropdown (e.g. '50'), or 'auto' to pick the fastest size."""
+    if value == "auto":
+        return negotiate_page_size(driver, config['name'], page_type)
     try:
         # Click the Per Page dropdown trigger
         per_page_trigger = WebDriverWait(driver, 10).until(
             EC.element_to_be_clickable((By.CSS_SELECTOR, "div.row-select-container div.o-dp-trig"))
         )
         per_page_trigger.click()
-        time.sleep(1)
 
         # Click the target option by data-slug
-        option = WebDriverWait(driver, 5).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR,
+        option = timer.wait(driver, "per_page_option", EC.presence_of_element_located((By.CSS_SELECTOR,
                 f"div.o-select-option span[data-slug='{value}']"
-            ))
-        )
-        driver.execute_script("arguments[0].click();", option)
+            )), timeout=5)
+        # Waits for the re-render only when this size can change the table
+        click_page_size_option(driver, option, value)
         print(f"[INFO] Set Per Page to {value}")
-        time.sleep(3)
     except Exception as e:
         print(f"[WARNING] Could not set Per Page to {value}: {e}")
+    return value
 
+# Runs use a persistent per-site profile from result/profiles (warm_profile.py, --fresh-profile to skip it)
 # Windows Firefox profile path (comment out if you want a fresh profile)
 # profile_path = "C:\\Users\\BDC Computer ll\\AppData\\Roaming\\Mozilla\\Firefox\\Profiles\\your-profile-name"
 # firefox_profile = webdriver.FirefoxProfile(profile_path)
@@ -287,7 +263,7 @@ options = Options()
 # Example Windows profile path:
 # options.profile = "C:\\Users\\YourUsername\\AppData\\Roaming\\Mozilla\\Firefox\\Profiles\\xxxxxxxx.selenium-profile"
 
-# Headless mode if needed
+# Headless mode if needed (--profile crawl also blocks images, fonts and analytics hosts)
 # options.add_argument('--headless')
 
 # ======== Website Configuration ========
@@ -345,227 +321,269 @@ def select_website():
             print("\n\n❌ Operation cancelled by user")
             exit(0)
 
-# Setup terminal with custom settings
-setup_automation_terminal("Deposit Crawler")
-
-# Select website configuration BEFORE driver initialization
-config = select_website()
-
-# Setup the driver with error handling
-try:
-    print("🔧 Setting up Firefox driver...")
-    service = Service(GeckoDriverManager().install())
-    driver = webdriver.Firefox(service=service, options=options)
-    driver.maximize_window()
-    print("✅ Firefox driver started successfully")
-except Exception as e:
-    print(f"❌ Firefox driver failed to start: {e}")
-    print("\n🔧 Trying alternative Firefox setup...")
+def start_browser(headless=False):
+    """Start the browser with the setup that worked last time, then the fallbacks (driver_bootstrap). Exits if none start."""
+    print("🔧 Setting up browser driver...")
+    driver = start_driver(options, headless=headless)
+    if driver is None:
+        print("\n💡 Troubleshooting suggestions:")
+        print("1. Make sure Firefox or Chrome is installed and updated")
+        print("2. Try restarting your computer")
+        print("3. Check if any antivirus is blocking webdrivers")
+        print("4. Run as administrator")
+        print("5. Try running: pip install --upgrade selenium webdriver-manager")
+        sys.exit(1)
+    return driver
+
+def needs_login(driver, config, timeout=8):
+    """
+    Open the site and report whether the login form is shown (False only when the logged-in
+    sidebar is there; a page that shows neither in time goes through login())
+    """
+    driver.get(config['url'])
     try:
-        # Try without GeckoDriverManager
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        service = Service()  # Use system geckodriver
-        driver = webdriver.Firefox(service=service, options=options)
-        driver.maximize_window()
-        print("✅ Firefox driver started with alternative setup")
-    except Exception as e2:
-        print(f"❌ Alternative Firefox setup also failed: {e2}")
-        print("\n🔧 Trying Chrome as fallback...")
-        try:
-            chrome_options = ChromeOptions()
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_service = ChromeService(ChromeDriverManager().install())
-            driver = webdriver.Chrome(service=chrome_service, options=chrome_options)
-            driver.maximize_window()
-            print("✅ Chrome driver started successfully as fallback")
-        except Exception as e3:
-            print(f"❌ Chrome fallback also failed: {e3}")
-            print("\n💡 Troubleshooting suggestions:")
-            print("1. Make sure Firefox or Chrome is installed and updated")
-            print("2. Try restarting your computer")
-            print("3. Check if any antivirus is blocking webdrivers")
-            print("4. Run as administrator")
-            print("5. Try running: pip install --upgrade selenium webdriver-manager")
-            sys.exit(1)
-
-# Login with selected configuration
-print(f"\n🚀 Connecting to {config['name']}...")
-driver.get(config['url'])
-wait = WebDriverWait(driver, 40)
-
-# Merchant code (only for sites that have it)
-if 'merchant_code' in config:
-    merchant_code_input = wait.until(EC.presence_of_element_located((By.XPATH, config['merchant_code_xpath'])))
-    merchant_code_input.send_keys(config['merchant_code'])
-
-# Username + Password
-username_input = wait.until(EC.presence_of_element_located((By.XPATH, config['username_xpath'])))
-username_input.send_keys(config['username'])
-password_input = wait.until(EC.presence_of_element_located((By.XPATH, config['password_xpath'])))
-password_input.send_keys(config['password'])
-
-# CAPTCHA handling (luckytaj)
-if config.get('has_captcha'):
-    captcha_input = wait.until(EC.presence_of_element_located((By.XPATH, "//input[@placeholder='Captcha Code']")))
-    captcha_code = get_captcha_number(driver)
-    captcha_input.send_keys(captcha_code)
-    print(f"\033[92mExtracted CAPTCHA: {captcha_code}\033[0m")
-
-# Submit (ENTER on last field)
-if config.get('has_captcha'):
-    captcha_input.send_keys(Keys.ENTER)
-else:
-    password_input.send_keys(Keys.ENTER)
-
-print(f"✅ Login attempted for {config['name']}")
+        # Returns as soon as either the login form or the logged-in sidebar shows up
+        WebDriverWait(driver, timeout).until(EC.any_of(
+            EC.presence_of_element_located((By.XPATH, config['username_xpath'])),
+            EC.presence_of_element_located((By.CSS_SELECTOR, "div.sidebar-item-container")),
+        ))
+    except TimeoutException:
+        print(f"[WARNING] {config['name']} showed neither the login form nor the sidebar in {timeout}s, logging in")
+        return True
+    return bool(driver.find_elements(By.XPATH, config['username_xpath']))
+
+def login(driver, config, load_page=True):
+    """Log in to the back office with the selected configuration"""
+    print(f"\n🚀 Connecting to {config['name']}...")
+    if load_page:
+        driver.get(config['url'])
+    wait = WebDriverWait(driver, 40)
 
-# ======== Post-Login Navigation ========
-navigate_to_deposit_page(driver, config)
+    # Merchant code (only for sites that have it)
+    if 'merchant_code' in config:
+        merchant_code_input = wait.until(EC.presence_of_element_located((By.XPATH, config['merchant_code_xpath'])))
+        merchant_code_input.send_keys(config['merchant_code'])
+
+    # Username + Password
+    username_input = wait.until(EC.presence_of_element_located((By.XPATH, config['username_xpath'])))
+    username_input.send_keys(config['username'])
+    password_input = wait.until(EC.presence_of_element_located((By.XPATH, config['password_xpath'])))
+    password_input.send_keys(config['password'])
+
+    # CAPTCHA handling (luckytaj)
+    if config.get('has_captcha'):
+        captcha_input = wait.until(EC.presence_of_element_located((By.XPATH, "//input[@placeholder='Captcha Code']")))
+        captcha_code = get_captcha_number(driver)
+        captcha_input.send_keys(captcha_code)
+        print(f"\033[92mExtracted CAPTCHA: {captcha_code}\033[0m")
+
+    # Submit (ENTER on last field)
+    if config.get('has_captcha'):
+        captcha_input.send_keys(Keys.ENTER)
+    else:
+        password_input.send_keys(Keys.ENTER)
+
+    print(f"✅ Login attempted for {config['name']}")
+
+selected_page_size = "50"  # Rows per page picked by the last apply_search_filters (recorded in the journal)
+
+def reload_list_page(driver, start_date, end_date, page_type="deposit"):
+    """Open the list again from the site's start page and search, so the table is back on page 1"""
+    driver.get(config['url'])
+    navigate = navigate_to_withdrawal_page if page_type == "withdrawal" else navigate_to_deposit_page
+    navigate(driver, config)
+    apply_search_filters(driver, start_date, end_date, page_type)
+
+def apply_search_filters(driver, start_date, end_date, page_type="deposit"):
+    """
+    Set the date range and timezone, run the search and set the rows per page (--per-page).
+    Opens the learned filtered link when the site keeps the filters in the URL.
+    """
+    filter_values = {"start": start_date.strftime("%Y-%m-%d"), "end": end_date.strftime("%Y-%m-%d"),
+                     "timezone": "05:30", "status": "Approved"}
+    applied = routes.open_filtered(
+        driver, page_type, filter_values,
+        {"start": ("Start Date", start_date), "end": ("End Date", end_date)}, "Start Date"
+    )
+    if applied is not None:
+        # Filters the URL does not carry are set by hand
+        if "timezone" not in applied:
+            select_timezone(driver, "+05:30")
+        if config.get('has_status_filter') and "status" not in applied:
+            select_status_approved(driver)
+        click_search_button(driver)
+    else:
+        if routes.reloaded:
+            # The failed link reloaded the page, so the status selected during navigation is gone
+            if page_type not in routes.entries:
+                # The plain route failed as well: back to the list through the menu
+                navigate = navigate_to_withdrawal_page if page_type == "withdrawal" else navigate_to_deposit_page
+                navigate(driver, config)
+            elif config.get('has_status_filter'):
+                select_status_approved(driver)
+        set_browser_date(driver, "Start Date", start_date)
+        set_browser_date(driver, "End Date", end_date)
+        select_timezone(driver, "+05:30")
+        click_search_button(driver)
+        routes.remember_filters(driver, page_type, filter_values)
+    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+    global selected_page_size
+    selected_page_size = select_per_page(driver, args.per_page, page_type)
+
+# ======== Command Line Options ========
+parser = argparse.ArgumentParser(description="Deposit/withdrawal crawler")
+parser.add_argument("--source", choices=["dom", "api"], default="dom",
+                    help="dom: scrape the rendered table (default), api: page through the back office's JSON requests")
+parser.add_argument("--shards", type=int, default=1,
+                    help="crawl the date range with this many parallel headless browsers")
+parser.add_argument("--shard-days", type=int, default=1,
+                    help="days per shard window when --shards is used (default 1)")
+parser.add_argument("--headless", action="store_true", help="run the browser headless")
+parser.add_argument("--profile", choices=["default", "crawl"], default="default",
+                    help="crawl: headless, eager page loads, no images/fonts/media, analytics hosts blocked "
+                         "(opt-in, not benchmarked yet: see crawl_profile.py and profile_benchmark.py)")
+parser.add_argument("--fresh-profile", action="store_true",
+                    help="start from a temporary browser profile instead of the persistent one in result/profiles")
+parser.add_argument("--extract", choices=["snapshot", "pushdown"], default="snapshot",
+                    help="snapshot: read all cells and filter in Python (default), "
+                         "pushdown: filter dates/summary rows and project columns inside the page")
+parser.add_argument("--per-page", default="auto",
+                    help="rows per page, or 'auto' (default) to measure the offered sizes and keep the fastest")
+parser.add_argument("--seek", action="store_true",
+                    help="binary-search the paginator for the page where end_date starts instead of walking newer pages")
+parser.add_argument("--pipelined", action="store_true",
+                    help="parse each page in a worker thread while the next page loads")
+parser.add_argument("--resume", action="store_true",
+                    help="continue an interrupted crawl from its journal in result/journal")
+parser.add_argument("--incremental", action="store_true",
+                    help="stop paging at rows collected by the previous run and merge them from result/state")
+# Worker options (set by the sharded parent for each shard window)
+parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+parser.add_argument("--site", help=argparse.SUPPRESS)
+parser.add_argument("--mode", choices=["deposit", "withdrawal"], default="deposit", help=argparse.SUPPRESS)
+parser.add_argument("--start", help=argparse.SUPPRESS)
+parser.add_argument("--end", help=argparse.SUPPRESS)
+parser.add_argument("--output", help=argparse.SUPPRESS)
+args = parser.parse_args()
 
-# ======== Date Selection ========
 from date_selector import get_date_selection
 
-start_date, end_date = get_date_selection()
-
-if start_date and end_date:
+if args.worker:
+    # Shard worker: site and date window come from the sharded parent
+    config = website_configs[args.site]
+    start_date = datetime.strptime(args.start, "%Y-%m-%d").date()
+    end_date = datetime.strptime(args.end, "%Y-%m-%d").date()
+else:
+    # Setup terminal with custom settings
+    setup_automation_terminal("Deposit Crawler")
+
+    # Select website configuration BEFORE driver initialization
+    config = select_website()
+    start_date = end_date = None
+
+site_key = next(key for key, site_config in website_configs.items() if site_config is config)
+locators = LocatorCache(config['name'])
+timer = WaitTimer(config['name'])
+routes = RouteCache(config['name'])
+session_name = f"backoffice-{config['name']}"
+
+if args.shards > 1 and not args.worker:
+    # Sharded run: every worker starts and logs in its own headless browser
+    driver = None
+    start_date, end_date = get_date_selection()
+    if not (start_date and end_date):
+        print("\033[1;31m[ERROR] No dates selected, exiting...\033[0m")
+        exit(1)
     print(f"\033[1;32m[APPROVED]\033[0m Date range selected: {start_date} to {end_date}")
-    print(f"\033[1;33m[INFO]\033[0m Setting dates in browser...")
-    set_browser_date(driver, "Start Date", start_date)
-    set_browser_date(driver, "End Date", end_date)
-    select_timezone(driver, "+05:30")
-    click_search_button(driver)
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-    time.sleep(1)
-    select_per_page(driver, "50")
-    time.sleep(1)
-    print(f"\033[1;33m[INFO]\033[0m Using optimized extraction with early stopping")
 else:
-    print("\033[1;31m[ERROR] No dates selected, exiting...\033[0m")
-    driver.quit()
-    exit(1)
+    def open_logged_in_browser():
+        """Browser start, login and the deposit page (the steps that do not need the dates)"""
+        # Attach to the browser daemon's kept-alive session when it is running (shard workers always start their own)
+        driver = None if args.worker else attach_browser(session_name)
+        if driver is None:
+            if args.profile == "crawl":
+                apply_crawl_profile(options)
+            if not args.fresh_profile:
+                # Keeps the HTTP cache between runs; shard workers get their own slots
+                WarmProfile(session_name).apply(options)
+            driver = start_browser(headless=args.headless or args.worker or args.profile == "crawl")
+
+        # Login with selected configuration (skipped when the attached session is still logged in)
+        # A fresh browser first gets the saved session back (result/sessions), the login form only if it expired
+        if getattr(driver, "is_new_session", True) and not restore_session(driver, session_name, config['url']):
+            login(driver, config)
+        elif needs_login(driver, config):
+            clear_session(session_name)
+            login(driver, config, load_page=False)
+        else:
+            print(f"✅ Reusing logged-in session for {config['name']}")
+        if getattr(driver, "is_new_session", True):
+            cache_report(driver, "First page load")
+
+        # ======== Post-Login Navigation ========
+        navigate_to_deposit_page(driver, config)
+        if not args.worker:
+            save_session(driver, session_name)
+        if args.worker and args.mode == "withdrawal":
+            navigate_to_withdrawal_page(driver, config)
+        return driver
+
+    if args.worker:
+        driver = open_logged_in_browser()
+    else:
+        # ======== Date Selection ========
+        # The browser starts and logs in while the operator picks the dates
+        startup = BackgroundStart("Browser startup and login", open_logged_in_browser)
+        try:
+            start_date, end_date = get_date_selection()
+        except BaseException:
+            # Cancelled at the prompt: close the browser that is being started instead of leaving it behind
+            startup.discard(lambda started_driver: started_driver.quit())
+            raise
+        if not (start_date and end_date):
+            startup.discard(lambda started_driver: started_driver.quit())
+        else:
+            driver = startup.result()
+
+    if start_date and end_date:
+        print(f"\033[1;32m[APPROVED]\033[0m Date range selected: {start_date} to {end_date}")
+        print(f"\033[1;33m[INFO]\033[0m Setting dates in browser...")
+        apply_search_filters(driver, start_date, end_date, args.mode if args.worker else "deposit")
+        print(f"\033[1;33m[INFO]\033[0m Using optimized extraction with early stopping")
+    else:
+        print("\033[1;31m[ERROR] No dates selected, exiting...\033[0m")
+        exit(1)
 
 
 # ======= Print Logic Here =======
 
 def extract_transaction_data_with_date_filter(driver, start_date, end_date):
     """
-    Extracts transaction data using CSS table selectors with early-stopping date filtering.
+    Extracts transaction data from a single table snapshot with early-stopping date filtering.
+    Deposit columns: Order ID=0, Player ID=4, Phone=5, Amount=9, Tax Fee=12, Time=20, Gateway=21
     Returns (collected_records, should_stop_scraping)
     """
     print(f"[INFO] Filtering for dates: {start_date} to {end_date}")
 
-    # Try different table selectors (from sample_crawler)
-    selectors_to_try = [
-        "table.tableInfo tbody tr",
-        "table.new_data-table tbody tr",
-        "table tbody tr",
-        ".table tbody tr",
-        "tbody tr"
-    ]
-
-    rows = []
-    working_selector = None
-
-    for selector in selectors_to_try:
-        print(f"[DEBUG] Trying selector: {selector}")
-        test_rows = driver.find_elements(By.CSS_SELECTOR, selector)
-        print(f"[DEBUG] Found {len(test_rows)} rows with selector: {selector}")
-        if len(test_rows) > 0:
-            rows = test_rows
-            working_selector = selector
-            print(f"[SUCCESS] Using selector: {selector}")
-            break
-
-    if not rows:
-        print("[ERROR] No table rows found with any selector!")
-        return [], True
-
-    print(f"[INFO] Total rows found: {len(rows)} using selector: {working_selector}")
-
-    collected_records = []
-    should_stop_scraping = False
-
-    time.sleep(1)  # Stability delay
-
-    for idx in range(len(rows)):
-        try:
-            # Re-find rows to avoid stale element reference
-            current_rows = driver.find_elements(By.CSS_SELECTOR, working_selector)
-            if idx >= len(current_rows):
-                print(f"[WARNING] Row {idx + 1} no longer exists. Skipping.")
-                continue
-
-            row = current_rows[idx]
-            cols = row.find_elements(By.TAG_NAME, 'td')
-
-            if len(cols) < 10:
-                print(f"[WARNING] Row {idx + 1} has only {len(cols)} columns. Skipping.")
-                continue
-
-            # Skip summary rows
-            first_col_text = cols[0].text.strip()
-            if "Page Summary" in first_col_text or "Total Summary" in first_col_text:
-                print(f"[INFO] Skipping summary row: '{first_col_text}'")
-                continue
-
-            # Extract time from column 20 (format: 'YYYY-MM-DD HH:MM:SS')
-            full_date_str = cols[20].text.strip() if len(cols) > 20 else ""
-            if not full_date_str:
-                print(f"[WARNING] No date in row {idx + 1}, skipping")
-                continue
-
-            try:
-                date_str = full_date_str.split(" ")[0]
-                row_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-
-                # Date filtering logic with early stopping
-                if row_date > end_date:
-                    print(f"[DEBUG] Row {idx + 1} too new ({row_date}), skipping")
-                    continue
-
-                if row_date < start_date:
-                    print(f"[INFO] Row {idx + 1} too old ({row_date}), stopping scraping")
-                    should_stop_scraping = True
-                    break
-
-                # Parse amount from column 9 (strip "Rs" and commas)
-                amount_text = cols[9].text.strip().replace("Rs", "").replace(",", "").strip()
-                try:
-                    amount = float(amount_text) if amount_text else 0.0
-                except ValueError:
-                    print(f"[WARNING] Invalid amount '{amount_text}' in row {idx + 1}, setting to 0.0")
-                    amount = 0.0
+    if args.extract == "pushdown":
+        # Date window, summary skip and column projection run inside the page
+        collected_records, should_stop_scraping, working_selector = pushdown_transaction_rows(
+            driver, start_date, end_date, DEPOSIT_COLUMNS, locators.ordered("table_rows", TABLE_ROW_SELECTORS)
+        )
+        if not working_selector:
+            print("[ERROR] No table rows found with any selector!")
+            return [], True
+        locators.remember("table_rows", working_selector)
+    else:
+        rows, working_selector = snapshot_table_rows(driver, locators.ordered("table_rows", TABLE_ROW_SELECTORS))
+        if not rows:
+            print("[ERROR] No table rows found with any selector!")
+            return [], True
 
-                # Parse tax fee from column 12
-                tax_text = cols[12].text.strip().replace(",", "")
-                try:
-                    tax_fee = float(tax_text) if tax_text else 0.0
-                except ValueError:
-                    print(f"[WARNING] Invalid tax fee '{tax_text}' in row {idx + 1}, setting to 0.0")
-                    tax_fee = 0.0
-
-                # Create record using sample_crawler column mapping
-                record = {
-                    "Order ID": cols[0].text.strip(),
-                    "Player ID": cols[4].text.strip() if len(cols) > 4 else "",
-                    "Phone Number": cols[5].text.strip(),
-                    "Amount": amount,
-                    "Tax Fee": tax_fee,
-                    "Time": full_date_str,
-                    "Gateway": cols[21].text.strip() if len(cols) > 21 else "Unknown",
-                    "Date": row_date
-                }
-                collected_records.append(record)
-
-            except ValueError as e:
-                print(f"[WARNING] Invalid date format '{full_date_str}' in row {idx + 1}: {e}")
-                continue
+        print(f"[INFO] Total rows found: {len(rows)} using selector: {working_selector}")
+        locators.remember("table_rows", working_selector)
 
-        except Exception as e:
-            print(f"[ERROR] Failed to process row {idx + 1}: {e}")
-            continue
+        collected_records, should_stop_scraping = parse_transaction_rows(rows, start_date, end_date, DEPOSIT_COLUMNS)
 
     print(f"[INFO] Collected {len(collected_records)} records from this page")
     print(f"[INFO] Should stop scraping: {should_stop_scraping}")
@@ -575,117 +593,31 @@ def extract_transaction_data_with_date_filter(driver, start_date, end_date):
 
 def extract_withdrawal_data_with_date_filter(driver, start_date, end_date):
     """
-    Extracts withdrawal data using the withdrawal table column mapping with early-stopping date filtering.
-    Withdrawal columns: Order ID=1, Phone=8, Amount=12, Tax Fee=13, Time=18, Gateway=24
+    Extracts withdrawal data from a single table snapshot with early-stopping date filtering.
+    Withdrawal columns: Order ID=1, Player ID=7, Phone=8, Amount=12, Tax Fee=13, Time=18, Gateway=24
     Returns (collected_records, should_stop_scraping)
     """
     print(f"[INFO] Filtering withdrawals for dates: {start_date} to {end_date}")
 
-    selectors_to_try = [
-        "table.tableInfo tbody tr",
-        "table.new_data-table tbody tr",
-        "table tbody tr",
-        ".table tbody tr",
-        "tbody tr"
-    ]
-
-    rows = []
-    working_selector = None
-
-    for selector in selectors_to_try:
-        print(f"[DEBUG] Trying selector: {selector}")
-        test_rows = driver.find_elements(By.CSS_SELECTOR, selector)
-        print(f"[DEBUG] Found {len(test_rows)} rows with selector: {selector}")
-        if len(test_rows) > 0:
-            rows = test_rows
-            working_selector = selector
-            print(f"[SUCCESS] Using selector: {selector}")
-            break
-
-    if not rows:
-        print("[ERROR] No table rows found with any selector!")
-        return [], True
-
-    print(f"[INFO] Total rows found: {len(rows)} using selector: {working_selector}")
-
-    collected_records = []
-    should_stop_scraping = False
-
-    time.sleep(1)
-
-    for idx in range(len(rows)):
-        try:
-            current_rows = driver.find_elements(By.CSS_SELECTOR, working_selector)
-            if idx >= len(current_rows):
-                print(f"[WARNING] Row {idx + 1} no longer exists. Skipping.")
-                continue
-
-            row = current_rows[idx]
-            cols = row.find_elements(By.TAG_NAME, 'td')
-
-            if len(cols) < 5:
-                print(f"[WARNING] Row {idx + 1} has only {len(cols)} columns. Skipping.")
-                continue
-
-            first_col_text = cols[0].text.strip()
-            if "Page Summary" in first_col_text or "Total Summary" in first_col_text:
-                print(f"[INFO] Skipping summary row: '{first_col_text}'")
-                continue
-
-            # Time from column 18
-            full_date_str = cols[18].text.strip() if len(cols) > 18 else ""
-            if not full_date_str:
-                print(f"[WARNING] No date in row {idx + 1}, skipping")
-                continue
-
-            try:
-                date_str = full_date_str.split(" ")[0]
-                row_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-
-                if row_date > end_date:
-                    print(f"[DEBUG] Row {idx + 1} too new ({row_date}), skipping")
-                    continue
-
-                if row_date < start_date:
-                    print(f"[INFO] Row {idx + 1} too old ({row_date}), stopping scraping")
-                    should_stop_scraping = True
-                    break
-
-                # Amount from column 12
-                amount_text = cols[12].text.strip().replace("Rs", "").replace(",", "").strip()
-                try:
-                    amount = float(amount_text) if amount_text else 0.0
-                except ValueError:
-                    print(f"[WARNING] Invalid amount '{amount_text}' in row {idx + 1}, setting to 0.0")
-                    amount = 0.0
+    if args.extract == "pushdown":
+        # Date window, summary skip and column projection run inside the page
+        collected_records, should_stop_scraping, working_selector = pushdown_transaction_rows(
+            driver, start_date, end_date, WITHDRAWAL_COLUMNS, locators.ordered("table_rows", TABLE_ROW_SELECTORS)
+        )
+        if not working_selector:
+            print("[ERROR] No table rows found with any selector!")
+            return [], True
+        locators.remember("table_rows", working_selector)
+    else:
+        rows, working_selector = snapshot_table_rows(driver, locators.ordered("table_rows", TABLE_ROW_SELECTORS))
+        if not rows:
+            print("[ERROR] No table rows found with any selector!")
+            return [], True
 
-                # Tax Fee from column 13
-                tax_text = cols[13].text.strip().replace(",", "")
-                try:
-                    tax_fee = float(tax_text) if tax_text else 0.0
-                except ValueError:
-                    print(f"[WARNING] Invalid tax fee '{tax_text}' in row {idx + 1}, setting to 0.0")
-                    tax_fee = 0.0
-
-                record = {
-                    "Order ID": cols[1].text.strip(),
-                    "Player ID": cols[7].text.strip() if len(cols) > 7 else "",
-                    "Phone Number": cols[8].text.strip(),
-                    "Amount": amount,
-                    "Tax Fee": tax_fee,
-                    "Time": full_date_str,
-                    "Gateway": cols[24].text.strip() if len(cols) > 24 else "Unknown",
-                    "Date": row_date
-                }
-                collected_records.append(record)
-
-            except ValueError as e:
-                print(f"[WARNING] Invalid date format '{full_date_str}' in row {idx + 1}: {e}")
-                continue
+        print(f"[INFO] Total rows found: {len(rows)} using selector: {working_selector}")
+        locators.remember("table_rows", working_selector)
 
-        except Exception as e:
-            print(f"[ERROR] Failed to process row {idx + 1}: {e}")
-            continue
+        collected_records, should_stop_scraping = parse_transaction_rows(rows, start_date, end_date, WITHDRAWAL_COLUMNS)
 
     print(f"[INFO] Collected {len(collected_records)} withdrawal records from this page")
     print(f"[INFO] Should stop scraping: {should_stop_scraping}")
@@ -701,8 +633,10 @@ def get_output_file_path():
     os.makedirs(result_dir, exist_ok=True)
     return os.path.join(result_dir, "selenium-transaction_history.txt")
 
-def print_grouped_results(gateway_groups, section_type="DEPOSITS", file_mode="w"):
+def print_grouped_results(gateway_groups, section_type="DEPOSITS", file_mode="w", totals=None):
+    """Write one section: per-gateway records with their totals, then the per-day and per-hour tables"""
     print(f"[DEBUG] print_grouped_results called with {len(gateway_groups)} gateway groups ({section_type})")
+    totals = totals or aggregate_groups(gateway_groups)
     for gateway, records in gateway_groups.items():
         print(f"[DEBUG] Gateway '{gateway}' has {len(records)} records")
 
@@ -717,11 +651,9 @@ def print_grouped_results(gateway_groups, section_type="DEPOSITS", file_mode="w"
         print(f"\033[92m{'='*80}\033[0m")
 
         for gateway, records in gateway_groups.items():
-            total_amount = sum(record["Amount"] if isinstance(record["Amount"], (int, float)) else float(record["Amount"].replace(",", "")) for record in records)
+            _count, total_amount, total_tax_amount = totals.gateways[gateway]
 
-            total_tax_amount = sum(float(record.get("Tax Fee", 0)) for record in records)
-
-            header = f"\n==== {gateway} ({len(records)} record{'s' if len(records) != 1 else ''}) | Total Amount: Rs {total_amount:,.2f} | Total Fee: Rs {total_tax_amount:.2f} ====\n"
+            header = f"\n==== {gateway} ({len(records)} record{'s' if len(records) != 1 else ''}) | Total Amount: Rs {format_rupees(total_amount)} | Total Fee: Rs {format_rupees(total_tax_amount, grouping=False)} ====\n"
             print(f"\033[92m{header}\033[0m")
             f.write(header)
 
@@ -744,34 +676,38 @@ def print_grouped_results(gateway_groups, section_type="DEPOSITS", file_mode="w"
                     f"Order ID: {record['Order ID']}\n"
                     f"Player ID: {record.get('Player ID', '')}\n"
                     f"Phone Number: {record['Phone Number']}\n"
-                    f"Amount: {record['Amount']:,.2f}\n"
-                    f"Tax Fee: {record.get('Tax Fee', 0)}\n"
+                    f"Amount: {format_rupees(record['Amount'])}\n"
+                    f"Tax Fee: {format_rupees(record.get('Tax Fee', 0), grouping=False)}\n"
                     f"Time: {record['Time']}\n"
                 )
                 print(f"\033[94m{entry}\033[0m")
                 f.write(entry)
 
-            footer = f"\n>> Total Amount for {gateway}: Rs {total_amount:,.2f}\n"
+            footer = f"\n>> Total Amount for {gateway}: Rs {format_rupees(total_amount)}\n"
             print(f"\033[93m{footer}\033[0m")
             f.write(footer)
 
-def _build_table(title, groups):
-    """Build a formatted table for a section (deposits or withdrawals)."""
-    rows = []
-    for gateway, records in groups.items():
-        amount = sum(r["Amount"] for r in records)
-        fee = round(sum(float(r.get("Tax Fee", 0)) for r in records), 2)
-        rows.append((gateway, len(records), amount, fee))
+        # Per-day and per-hour breakdown from the same totals
+        for title, breakdown in (("DAY", totals.days), ("HOUR", totals.hours)):
+            if not breakdown:
+                continue
+            rows = [(f"{key:02d}:00-{key:02d}:59" if title == "HOUR" else str(key), value) for key, value in breakdown.items()]
+            table = _build_table(f"{section_type} BY {title}", rows, totals.total)
+            print(f"\n\033[96m{table}\033[0m")
+            f.write("\n" + table + "\n")
 
-    total_records = sum(r[1] for r in rows)
-    total_amount = sum(r[2] for r in rows)
-    total_fee = round(sum(r[3] for r in rows), 2)
+def _build_table(title, rows, total):
+    """Build a formatted table from (label, Totals) rows and the section's Totals (money in paise)."""
+    rows = [(label, totals.count, "Rs " + format_rupees(totals.amount), "Rs " + format_rupees(totals.fee))
+            for label, totals in rows]
+    total_records = total.count
+    total_amount, total_fee = "Rs " + format_rupees(total.amount), "Rs " + format_rupees(total.fee)
 
     # Column widths
     gw_w = max(len(title), max((len(r[0]) for r in rows), default=7), 7)
     rec_w = max(7, len(f"{total_records:,}"))
-    amt_w = max(12, len(f"Rs {total_amount:,.2f}"))
-    fee_w = max(12, len(f"Rs {total_fee:,.2f}"))
+    amt_w = max(12, len(total_amount))
+    fee_w = max(12, len(total_fee))
 
     top    = f"+-{'-'*gw_w}-+-{'-'*rec_w}-+-{'-'*amt_w}-+-{'-'*fee_w}-+"
     mid    = f"+-{'-'*gw_w}-+-{'-'*rec_w}-+-{'-'*amt_w}-+-{'-'*fee_w}-+"
@@ -780,16 +716,16 @@ def _build_table(title, groups):
 
     lines = [top, header, mid]
     for gw, cnt, amt, fee in rows:
-        lines.append(f"| {gw:<{gw_w}} | {cnt:>{rec_w},} | {'Rs ' + f'{amt:,.2f}':>{amt_w}} | {'Rs ' + f'{fee:,.2f}':>{fee_w}} |")
+        lines.append(f"| {gw:<{gw_w}} | {cnt:>{rec_w},} | {amt:>{amt_w}} | {fee:>{fee_w}} |")
     lines.append(mid)
-    lines.append(f"| {'TOTAL':<{gw_w}} | {total_records:>{rec_w},} | {'Rs ' + f'{total_amount:,.2f}':>{amt_w}} | {'Rs ' + f'{total_fee:,.2f}':>{fee_w}} |")
+    lines.append(f"| {'TOTAL':<{gw_w}} | {total_records:>{rec_w},} | {total_amount:>{amt_w}} | {total_fee:>{fee_w}} |")
     lines.append(bottom)
 
-    return "\n".join(lines), total_records, total_amount, total_fee
+    return "\n".join(lines)
 
 
-def write_grand_total(deposit_groups, withdrawal_groups):
-    """Write combined grand total for deposits and withdrawals to output file."""
+def write_grand_total(deposit_totals, withdrawal_totals):
+    """Write combined grand total for deposits and withdrawals to output file (SectionTotals or None)."""
     output_file = get_output_file_path()
 
     with open(output_file, "a", encoding="utf-8") as f:
@@ -799,109 +735,48 @@ def write_grand_total(deposit_groups, withdrawal_groups):
         f.write(grand_total_header)
 
         # Deposit table
-        if deposit_groups:
-            table, _, _, _ = _build_table("DEPOSITS", deposit_groups)
+        if deposit_totals and deposit_totals.gateways:
+            table = _build_table("DEPOSITS", deposit_totals.gateways.items(), deposit_totals.total)
             print(f"\033[95m{table}\033[0m")
             f.write(table + "\n")
 
         # Withdrawal table
-        if withdrawal_groups:
-            table, _, _, _ = _build_table("WITHDRAWALS", withdrawal_groups)
+        if withdrawal_totals and withdrawal_totals.gateways:
+            table = _build_table("WITHDRAWALS", withdrawal_totals.gateways.items(), withdrawal_totals.total)
             print(f"\n\033[95m{table}\033[0m")
             f.write("\n" + table + "\n")
 
 
 
+def write_transaction_handoff(deposit_groups, withdrawal_groups):
+    """Write the structured handoff (JSONL + index) for add_deposit, records oldest first per gateway."""
+    sections = {}
+    for section_type, groups in (("DEPOSITS", deposit_groups), ("WITHDRAWALS", withdrawal_groups)):
+        if groups:
+            sections[section_type] = {
+                gateway: sorted(records, key=lambda record: record["Time"] or "")
+                for gateway, records in groups.items()
+            }
+    write_handoff(HANDOFF_TRANSACTIONS, sections)
+
+
 def click_next_page(driver, wait_timeout=10):
+    """Click Next with the locator and click strategy that worked last time on this site tried first"""
     try:
-        # Try sample_crawler's selector first, then Ant Design fallbacks
-        css_selectors = [
-            ("div.ml-3 button", "CSS_SELECTOR"),
-        ]
-        xpath_selectors = [
-            "//li[@title='Next Page' and @aria-disabled='false']//button[@class='ant-pagination-item-link']",
-            "//button[@class='ant-pagination-item-link']",
-        ]
-
-        next_button = None
         print("[DEBUG] Searching for Next button...")
-
-        # Try CSS selectors first
-        for selector, _ in css_selectors:
-            try:
-                print(f"[DEBUG] Trying CSS: {selector}")
-                next_button = WebDriverWait(driver, 3).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                )
-                print(f"[SUCCESS] Found next button using CSS: {selector}")
-                break
-            except Exception as e:
-                print(f"[DEBUG] Failed: {e}")
-                continue
-
-        # Try XPath selectors as fallback
-        if not next_button:
-            for selector in xpath_selectors:
-                try:
-                    print(f"[DEBUG] Trying XPath: {selector}")
-                    next_button = WebDriverWait(driver, 3).until(
-                        EC.element_to_be_clickable((By.XPATH, selector))
-                    )
-                    print(f"[SUCCESS] Found next button using XPath: {selector}")
-                    break
-                except Exception as e:
-                    print(f"[DEBUG] Failed: {e}")
-                    continue
-
+        next_button, locator = locators.find(driver, "next_button", NEXT_BUTTON_LOCATORS, timeout=3,
+                                             catch_all=NEXT_BUTTON_CATCH_ALL)
         if not next_button:
             print("[ERROR] Could not find Next button with any selector")
             return False
+        print(f"[SUCCESS] Found next button using: {locator[1]}")
 
-        # Try multiple click strategies
-        # Strategy 1: Regular click
-        try:
-            next_button.click()
-            time.sleep(.5)
-            print("[INFO] Successfully clicked Next button with regular click")
-            return True
-        except Exception as e:
-            print(f"[DEBUG] Regular click failed: {e}")
-
-        # Strategy 2: JavaScript click
-        try:
-            print("[DEBUG] Trying JavaScript click...")
-            driver.execute_script("arguments[0].click();", next_button)
-            time.sleep(2)
-            print("[INFO] Successfully clicked Next button with JavaScript")
-            return True
-        except Exception as e:
-            print(f"[DEBUG] JavaScript click failed: {e}")
-
-        # Strategy 3: Action chains click
-        try:
-            from selenium.webdriver.common.action_chains import ActionChains
-            print("[DEBUG] Trying ActionChains click...")
-            ActionChains(driver).move_to_element(next_button).click().perform()
-            time.sleep(2)
-            print("[INFO] Successfully clicked Next button with ActionChains")
-            return True
-        except Exception as e:
-            print(f"[DEBUG] ActionChains click failed: {e}")
-
-        # Strategy 4: Scroll into view then click
-        try:
-            print("[DEBUG] Trying scroll into view then click...")
-            driver.execute_script("arguments[0].scrollIntoView(true);", next_button)
-            time.sleep(1)
-            next_button.click()
-            time.sleep(2)
-            print("[INFO] Successfully clicked Next button after scrolling into view")
-            return True
-        except Exception as e:
-            print(f"[DEBUG] Scroll + click failed: {e}")
-
-        print("[ERROR] All click strategies failed")
-        return False
+        strategy = locators.click(driver, "next_button", next_button)
+        if not strategy:
+            print("[ERROR] All click strategies failed")
+            return False
+        print(f"[INFO] Successfully clicked Next button ({strategy} click)")
+        return True
 
     except Exception as e:
         print(f"[WARNING] Could not click Next button: {e}")
@@ -912,97 +787,309 @@ def click_next_page(driver, wait_timeout=10):
 
 gateway_groups = defaultdict(list)  # Global collector
 seen_order_ids = set()  # Track seen Order IDs to prevent duplicates
+section_totals = {}  # "deposit"/"withdrawal" -> SectionTotals of the last extraction, reused by the report
+
+
+def collect_unique_records(page_records, all_collected_records, page_counter):
+    """Append records whose Order ID has not been seen yet. Returns the duplicate count."""
+    duplicate_count = 0
+    for record in page_records:
+        order_id = record["Order ID"]
+        if order_id not in seen_order_ids:
+            all_collected_records.append(record)
+            seen_order_ids.add(order_id)
+        else:
+            duplicate_count += 1
+            print(f"\033[93m[WARNING] Duplicate Order ID '{order_id}' found on page {page_counter}. Skipping.\033[0m")
+    return duplicate_count
+
+
+def summarize_extraction(all_collected_records, page_counter, duplicate_count, label):
+    """Group collected records by gateway and print the extraction summary."""
+    # Group records by gateway for output
+    gateway_groups = defaultdict(list)
+    for record in all_collected_records:
+        gateway_groups[record["Gateway"]].append(record)
+
+    # Count, amount and fee per gateway/day/hour in one pass, reused by the report
+    totals = section_totals[label] = aggregate_records(all_collected_records)
+    total_amount = totals.total.amount
+
+    # Print summary
+    total_records = len(all_collected_records)
+    print(f"\033[92m[SUMMARY] Extraction completed:\033[0m")
+    print(f"  - Pages scraped: {page_counter}")
+    print(f"  - Total records collected: {total_records}")
+    print(f"  - Unique gateways: {len(gateway_groups)}")
+    print(f"  - Duplicates skipped: {duplicate_count}")
+    print(f"  - {label.capitalize()} count: {total_records}")
+    print(f"  - {label.capitalize()} amount: Rs {format_rupees(total_amount)}")
+
+    if total_records == 0:
+        print("\033[93m[WARNING] No records found in the specified date range.\033[0m")
+
+    return gateway_groups
 
 
-def run_optimized_transaction_extraction(driver, start_date, end_date, mode="deposit"):
+def wait_for_page_load(driver, previous_fingerprint):
+    """Wait until the table no longer shows the page it showed before Next was clicked"""
+    try:
+        wait_for_page_turn(driver, previous_fingerprint)
+    except PageTurnTimeout as e:
+        print(f"\033[91m[ERROR] {e}\033[0m")
+        raise
+    print("[INFO] New page rendered")
+
+
+def skip_to_page(driver, target_page):
+    """Jump (or click Next until) target_page is shown, without parsing. Returns the page actually reached."""
+    if target_page > 1 and jump_to_page(driver, target_page):
+        print(f"[INFO] Jumped to page {target_page}")
+        return target_page
+
+    page = 1
+    while page < target_page:
+        print(f"[INFO] Skipping to page {target_page} (at page {page})...")
+        fingerprint = table_fingerprint(driver)
+        if not click_next_page(driver):
+            print(f"\033[93m[WARNING] Could not move past page {page}, resuming from there\033[0m")
+            break
+        wait_for_page_load(driver, fingerprint)
+        page += 1
+    return page
+
+
+def get_journal_filters(mode, start_date, end_date):
+    """Filter state stored in the journal header; a resume only reuses a journal with the same filters"""
+    return {"site": site_key, "mode": mode, "start": str(start_date), "end": str(end_date), "per_page": selected_page_size}
+
+
+def reached_known_records(page_records, known_order_ids, page_counter):
+    """True when a page contains rows the previous run already collected (incremental mode)."""
+    if known_order_ids and any(record["Order ID"] in known_order_ids for record in page_records):
+        print(f"\033[93m[INFO] Reached rows from the previous run. Stopping extraction at page {page_counter}.\033[0m")
+        return True
+    return False
+
+
+def parse_snapshot_html(html, start_date, end_date, columns):
+    """Parse a page's raw table HTML into records (runs in the pipeline's parser thread)."""
+    rows = parse_table_html(html)
+    return parse_transaction_rows(rows, start_date, end_date, columns)
+
+
+def run_pipelined_pages(driver, start_date, end_date, mode, page_counter, all_collected_records,
+                        journal_path, known_order_ids):
+    """
+    Pipelined page loop: grab page N's raw table HTML, hand it to a parser thread and click
+    Next right away, so parsing, dedup and journaling overlap with page N+1 loading.
+    The oldest date is read together with the HTML, so the date-boundary stop never
+    loads an extra page. Returns (last_page, duplicate_count).
+    """
+    columns = WITHDRAWAL_COLUMNS if mode == "withdrawal" else DEPOSIT_COLUMNS
+    duplicate_count = 0
+
+    with ThreadPoolExecutor(max_workers=1) as parse_pool:
+        while True:
+            print(f"\033[92m[INFO] Scraping page {page_counter} (pipelined)...\033[0m")
+            snapshot = snapshot_table_html(driver, columns["time"], locators.ordered("table_rows", TABLE_ROW_SELECTORS))
+            if not snapshot.get("selector"):
+                print("[ERROR] No table rows found with any selector!")
+                break
+            locators.remember("table_rows", snapshot["selector"])
+            parsed = parse_pool.submit(parse_snapshot_html, snapshot["html"], start_date, end_date, columns)
+
+            oldest = snapshot.get("oldest")
+            at_boundary = bool(oldest) and datetime.strptime(oldest, "%Y-%m-%d").date() < start_date
+
+            # Start loading the next page while this one is parsed
+            has_next = False
+            if not at_boundary:
+                fingerprint = table_fingerprint(driver)
+                has_next = click_next_page(driver)
+
+            page_records, should_stop = parsed.result()
+            duplicate_count += collect_unique_records(page_records, all_collected_records, page_counter)
+            append_journal_page(journal_path, page_counter, page_records)
+            print(f"[INFO] Page {page_counter}: Collected {len(page_records)} new records")
+
+            if reached_known_records(page_records, known_order_ids, page_counter):
+                break
+            if at_boundary or should_stop:
+                print(f"\033[93m[INFO] Reached date boundary. Stopping extraction at page {page_counter}.\033[0m")
+                break
+            if not has_next:
+                print("[INFO] No more pages found. Finishing extraction.")
+                break
+
+            wait_for_page_load(driver, fingerprint)
+            page_counter += 1
+            print(f"[SUCCESS] Successfully navigated to page {page_counter}")
+
+    return page_counter, duplicate_count
+
+
+def run_optimized_transaction_extraction(driver, start_date, end_date, mode="deposit", known_records=None):
     """
     Optimized extraction with early stopping based on date range.
     Stops scraping when encountering dates older than start_date.
     mode: "deposit" or "withdrawal" — selects the correct column mapping.
+    known_records: records from the previous run (incremental mode); paging also stops at
+    the first page that contains one of them and the rest are merged in from the stored set.
+    Every parsed page is appended to the crawl journal; with --resume the journal is reloaded
+    and the crawl continues from the last completed page.
+    With --pipelined, pages are parsed in a worker thread while the next page loads.
     """
     page_counter = 1
     all_collected_records = []
     duplicate_count = 0
     stop_scraping = False
+    known_order_ids = {record["Order ID"] for record in known_records or []}
 
     extract_fn = extract_withdrawal_data_with_date_filter if mode == "withdrawal" else extract_transaction_data_with_date_filter
     label = "withdrawal" if mode == "withdrawal" else "deposit"
 
-    print(f"\033[92m[INFO] Starting optimized {label} extraction for date range: {start_date} to {end_date}\033[0m")
+    journal_path = get_journal_path(site_key, mode, start_date, end_date)
+    journal_filters = get_journal_filters(mode, start_date, end_date)
+    resumed = load_journal(journal_path, journal_filters) if args.resume else None
+
+    if resumed and resumed["complete"]:
+        print(f"\033[92m[INFO] Journal already holds the complete {label} crawl ({len(resumed['records'])} records)\033[0m")
+        collect_unique_records(resumed["records"], all_collected_records, "journal")
+        merge_known_records(all_collected_records, known_records, seen_order_ids, start_date, end_date)
+        return summarize_extraction(all_collected_records, resumed["last_page"], duplicate_count, label)
+
+    if resumed and resumed["last_page"] > 0:
+        collect_unique_records(resumed["records"], all_collected_records, "journal")
+        print(f"\033[92m[INFO] Resuming {label} extraction: {len(all_collected_records)} records from "
+              f"{resumed['last_page']} journaled page(s)\033[0m")
+        # Re-read the last completed page so rows shifted by new transactions are not missed
+        page_counter = skip_to_page(driver, resumed["last_page"])
+    else:
+        start_journal(journal_path, journal_filters)
+        if args.seek:
+            # Skip the pages that only hold rows newer than end_date
+            time_column = (WITHDRAWAL_COLUMNS if mode == "withdrawal" else DEPOSIT_COLUMNS)["time"]
+            try:
+                page_counter = seek_start_page(driver, end_date, time_column)
+            except SeekError as e:
+                print(f"\033[93m[WARNING] Seek: {e}. Reloading the list to crawl from page 1\033[0m")
+                reload_list_page(driver, start_date, end_date, mode)
+                page_counter = 1
 
-    while not stop_scraping:
-        print(f"\033[92m[INFO] Scraping page {page_counter}...\033[0m")
+    print(f"\033[92m[INFO] Starting optimized {label} extraction for date range: {start_date} to {end_date}\033[0m")
 
-        # Extract data from current page with date filtering
-        page_records, should_stop = extract_fn(
-            driver, start_date, end_date
+    if args.pipelined and args.extract == "pushdown":
+        print("[INFO] --extract pushdown already filters inside the page, using the serial page loop")
+    if args.pipelined and args.extract != "pushdown":
+        page_counter, duplicate_count = run_pipelined_pages(
+            driver, start_date, end_date, mode, page_counter, all_collected_records, journal_path, known_order_ids
         )
+    else:
+        while not stop_scraping:
+            print(f"\033[92m[INFO] Scraping page {page_counter}...\033[0m")
+
+            # Extract data from current page with date filtering
+            page_records, should_stop = extract_fn(
+                driver, start_date, end_date
+            )
         
-        # Check for duplicates and add to collection
-        for record in page_records:
-            order_id = record["Order ID"]
-            if order_id not in seen_order_ids:
-                all_collected_records.append(record)
-                seen_order_ids.add(order_id)
-            else:
-                duplicate_count += 1
-                print(f"\033[93m[WARNING] Duplicate Order ID '{order_id}' found on page {page_counter}. Skipping.\033[0m")
+            # Check for duplicates and add to collection
+            duplicate_count += collect_unique_records(page_records, all_collected_records, page_counter)
+            append_journal_page(journal_path, page_counter, page_records)
         
-        print(f"[INFO] Page {page_counter}: Collected {len(page_records)} new records")
+            print(f"[INFO] Page {page_counter}: Collected {len(page_records)} new records")
         
-        # Check if we should stop scraping
-        if should_stop:
-            print(f"\033[93m[INFO] Reached date boundary. Stopping extraction at page {page_counter}.\033[0m")
-            stop_scraping = True
-            break
+            # Check if we should stop scraping
+            if reached_known_records(page_records, known_order_ids, page_counter):
+                break
+            if should_stop:
+                print(f"\033[93m[INFO] Reached date boundary. Stopping extraction at page {page_counter}.\033[0m")
+                stop_scraping = True
+                break
         
-        # Try to go to next page
-        print(f"[DEBUG] Attempting to navigate to next page...")
-        time.sleep(1)
-        has_next = click_next_page(driver)
-        if not has_next:
-            print("[INFO] No more pages found. Finishing extraction.")
-            break
-        else:
-            # Wait for loading animation to appear and disappear
-            try:
-                WebDriverWait(driver, 5).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "div.anime-shadow"))
-                )
-                WebDriverWait(driver, 20).until(
-                    EC.invisibility_of_element_located((By.CSS_SELECTOR, "div.anime-shadow"))
-                )
-                print("[INFO] Page loading animation complete")
-            except Exception:
-                print("[DEBUG] Animation element not detected, continuing...")
-            time.sleep(0.5)
-            print(f"[SUCCESS] Successfully navigated to page {page_counter + 1}")
+            # Try to go to next page
+            print(f"[DEBUG] Attempting to navigate to next page...")
+            fingerprint = table_fingerprint(driver)
+            has_next = click_next_page(driver)
+            if not has_next:
+                print("[INFO] No more pages found. Finishing extraction.")
+                break
+            else:
+                wait_for_page_load(driver, fingerprint)
+                print(f"[SUCCESS] Successfully navigated to page {page_counter + 1}")
 
-        page_counter += 1
-    
-    # Group records by gateway for output
-    gateway_groups = defaultdict(list)
-    for record in all_collected_records:
-        gateway_groups[record["Gateway"]].append(record)
+            page_counter += 1
 
-    # Calculate total amount
-    total_amount = sum(record["Amount"] for record in all_collected_records)
+    mark_journal_complete(journal_path)
+    merge_known_records(all_collected_records, known_records, seen_order_ids, start_date, end_date)
+    return summarize_extraction(all_collected_records, page_counter, duplicate_count, label)
+
+
+def fall_back_to_dom_extraction(driver, start_date, end_date, mode, known_records, reason):
+    """Scrape the rendered table instead when the JSON API cannot be used"""
+    print(f"\033[93m[WARNING] {reason}. Falling back to DOM extraction.\033[0m")
+    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+    select_per_page(driver, args.per_page, mode)
+    return run_optimized_transaction_extraction(driver, start_date, end_date, mode, known_records)
+
+
+def run_api_transaction_extraction(driver, start_date, end_date, mode="deposit", known_records=None):
+    """
+    Extraction through the back office's own JSON API instead of the rendered table.
+    Re-runs Search with a request hook installed to capture the call that fills the table,
+    then pages through it over HTTP (browser cookies, pooled session) at the largest
+    page size the API accepts. Falls back to DOM extraction if nothing usable is captured
+    or the API stops answering.
+    """
+    label = "withdrawal" if mode == "withdrawal" else "deposit"
+    field_map = config.get("api_field_map")
+
+    print(f"\033[92m[INFO] Starting API {label} extraction for date range: {start_date} to {end_date}\033[0m")
+
+    install_capture_hook(driver)
+    click_search_button(driver)
+    request = find_table_request(read_captured_requests(driver), field_map)
+
+    if not request:
+        return fall_back_to_dom_extraction(driver, start_date, end_date, mode, known_records,
+                                           "Could not capture the table request")
+
+    print(f"[INFO] Captured table request: {request.get('method', 'GET')} {request['url']}")
+    client = ApiTableClient.from_driver(driver, request)
+    page_size = client.negotiate_page_size()
+    if page_size is None:
+        return fall_back_to_dom_extraction(driver, start_date, end_date, mode, known_records,
+                                           "The table API accepted no page size")
+
+    page_counter = 0
+    all_collected_records = []
+    duplicate_count = 0
+    known_order_ids = {record["Order ID"] for record in known_records or []}
+
+    try:
+        for page_counter, items in client.iter_pages(page_size):
+            rows = [api_item_to_row(item, field_map) for item in items]
+            page_records, should_stop = parse_transaction_rows(rows, start_date, end_date, API_COLUMNS)
+            duplicate_count += collect_unique_records(page_records, all_collected_records, page_counter)
+            print(f"[INFO] API page {page_counter}: {len(items)} rows, {len(page_records)} in range")
+
+            if reached_known_records(page_records, known_order_ids, page_counter):
+                break
+            if should_stop:
+                print(f"\033[93m[INFO] Reached date boundary. Stopping extraction at page {page_counter}.\033[0m")
+                break
+    except requests.RequestException as e:
+        # The DOM crawl starts over, so the API pages must not count as already seen
+        for record in all_collected_records:
+            seen_order_ids.discard(record["Order ID"])
+        return fall_back_to_dom_extraction(driver, start_date, end_date, mode, known_records,
+                                           f"Table API failed on page {page_counter + 1} ({e})")
+
+    merge_known_records(all_collected_records, known_records, seen_order_ids, start_date, end_date)
+    return summarize_extraction(all_collected_records, page_counter, duplicate_count, label)
 
-    # Print summary
-    total_records = len(all_collected_records)
-    print(f"\033[92m[SUMMARY] Extraction completed:\033[0m")
-    print(f"  - Pages scraped: {page_counter}")
-    print(f"  - Total records collected: {total_records}")
-    print(f"  - Unique gateways: {len(gateway_groups)}")
-    print(f"  - Duplicates skipped: {duplicate_count}")
-    print(f"  - {label.capitalize()} count: {total_records}")
-    print(f"  - {label.capitalize()} amount: Rs {total_amount:,.2f}")
-    
-    if total_records == 0:
-        print("\033[93m[WARNING] No records found in the specified date range.\033[0m")
 
-    return gateway_groups
-    
 def show_post_crawl_menu():
     """Show menu after crawling is complete"""
     import subprocess
@@ -1051,9 +1138,75 @@ def show_post_crawl_menu():
             print("\n\n❌ Operation cancelled by user")
             return
 
+def run_shard_worker():
+    """
+    Crawl this worker's date window and save the records for the sharded parent.
+    The window's journal is kept until the parent has written the merged results.
+    """
+    extract = run_api_transaction_extraction if args.source == "api" else run_optimized_transaction_extraction
+    try:
+        groups = extract(driver, start_date, end_date, mode=args.mode)
+        records = [record for gateway_records in groups.values() for record in gateway_records]
+        save_shard_records(args.output, records)
+        print(f"[INFO] Saved {len(records)} records to {args.output}")
+    finally:
+        # Save what this worker learned about the waits (the parent has no browser to learn from)
+        timer.report()
+        driver.quit()
+
+
+def run_sharded_extraction(mode="deposit"):
+    """
+    Crawl start_date..end_date as shard windows in parallel worker browsers,
+    then merge the shards with Order ID dedup into one gateway_groups.
+    """
+    label = "withdrawal" if mode == "withdrawal" else "deposit"
+    windows = split_date_range(start_date, end_date, args.shard_days)
+    shard_results = run_shards(os.path.abspath(__file__), site_key, windows, mode,
+                               workers=min(args.shards, len(windows)), resume=args.resume,
+                               extra_args=["--source", args.source, "--extract", args.extract, "--per-page", args.per_page,
+                                           "--profile", args.profile]
+                               + (["--fresh-profile"] if args.fresh_profile else [])
+                               + (["--resume"] if args.resume else [])
+                               + (["--pipelined"] if args.pipelined else [])
+                               + (["--seek"] if args.seek else []))
+    if shard_results is None:
+        print(f"\033[91m[ERROR] Sharded {label} crawl incomplete. No results written.\033[0m")
+        sys.exit(1)
+
+    all_collected_records = []
+    duplicate_count = 0
+    for window, records in zip(windows, shard_results):
+        duplicate_count += collect_unique_records(records, all_collected_records, f"{window[0]}..{window[1]}")
+
+    return summarize_extraction(all_collected_records, f"{len(windows)} shard window(s)", duplicate_count, label)
+
+
+def run_incremental_extraction(extract, mode="deposit"):
+    """Extract with the stored records of the previous runs, then save the merged set and high-water mark."""
+    known_records = get_known_records(site_key, mode, start_date, end_date)
+    groups = extract(driver, start_date, end_date, mode=mode, known_records=known_records)
+    records = [record for gateway_records in groups.values() for record in gateway_records]
+    save_crawl_state(site_key, mode, records, start_date, end_date)
+    return groups
+
+
 def main():
+    if args.worker:
+        run_shard_worker()
+        return
+
+    if args.incremental and driver is None:
+        print("\033[93m[WARNING] --incremental is not used with --shards, doing a full sharded crawl\033[0m")
+
     # Run deposit extraction
-    deposit_groups = run_optimized_transaction_extraction(driver, start_date, end_date)
+    extract = run_api_transaction_extraction if args.source == "api" else run_optimized_transaction_extraction
+    if driver is None:
+        deposit_groups = run_sharded_extraction()
+    elif args.incremental:
+        deposit_groups = run_incremental_extraction(extract)
+    else:
+        deposit_groups = extract(driver, start_date, end_date)
 
     # Ask user about withdrawals
     print("\n" + "="*60)
@@ -1061,27 +1214,40 @@ def main():
 
     withdrawal_groups = {}
     if choice == 'y':
-        navigate_to_withdrawal_page(driver, config)
-        set_browser_date(driver, "Start Date", start_date)
-        set_browser_date(driver, "End Date", end_date)
-        select_timezone(driver, "+05:30")
-        click_search_button(driver)
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(1)
-        select_per_page(driver, "50")
-        time.sleep(1)
         # Reset seen_order_ids for withdrawal extraction
         seen_order_ids.clear()
-        withdrawal_groups = run_optimized_transaction_extraction(driver, start_date, end_date, mode="withdrawal")
+        if driver is None:
+            withdrawal_groups = run_sharded_extraction(mode="withdrawal")
+        else:
+            navigate_to_withdrawal_page(driver, config)
+            apply_search_filters(driver, start_date, end_date, "withdrawal")
+            if args.incremental:
+                withdrawal_groups = run_incremental_extraction(extract, mode="withdrawal")
+            else:
+                withdrawal_groups = extract(driver, start_date, end_date, mode="withdrawal")
 
-    # Write results to file
-    print_grouped_results(deposit_groups, section_type="DEPOSITS", file_mode="w")
+    # Write results to file (totals from the extraction summary, not summed again)
+    deposit_totals = section_totals.get("deposit") or aggregate_groups(deposit_groups)
+    withdrawal_totals = (section_totals.get("withdrawal") or aggregate_groups(withdrawal_groups)) if withdrawal_groups else None
+    print_grouped_results(deposit_groups, section_type="DEPOSITS", file_mode="w", totals=deposit_totals)
     if withdrawal_groups:
-        print_grouped_results(withdrawal_groups, section_type="WITHDRAWALS", file_mode="a")
-    write_grand_total(deposit_groups, withdrawal_groups)
-
-    time.sleep(5)
-    driver.quit()
+        print_grouped_results(withdrawal_groups, section_type="WITHDRAWALS", file_mode="a", totals=withdrawal_totals)
+    write_grand_total(deposit_totals, withdrawal_totals)
+    write_transaction_handoff(deposit_groups, withdrawal_groups)
+
+    # Results are on disk, the journals (and shard outputs) are no longer needed
+    for mode in ("deposit", "withdrawal"):
+        finish_journal(get_journal_path(site_key, mode, start_date, end_date))
+        if driver is None:
+            windows = split_date_range(start_date, end_date, args.shard_days)
+            clear_shard_outputs(site_key, windows, mode)
+            for window_start, window_end in windows:
+                finish_journal(get_journal_path(site_key, mode, window_start, window_end))
+
+    timer.report()
+    if driver is not None:
+        time.sleep(5)
+        driver.quit()
     cleanup_terminal()
 
     # Show post-crawl menu
@@ -0,0 +1,134 @@
+"""
+Adaptive wait timing for the Selenium scripts
+Every named wait polls its condition quickly instead of sleeping a fixed time, records how
+long it really took per site in result/wait_timing.json and uses the rolling p95 of that
+history to size its timeout. report() shows where the wall-clock time of a run went.
+"""
+import json
+import math
+import os
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from atomic_file import write_json_atomic
+
+# Poll every 50 ms instead of WebDriverWait's default 500 ms
+FAST_POLL = 0.05
+# Samples kept per site and wait name
+HISTORY_SIZE = 50
+# Below this many samples the caller's default timeout is used as is
+MIN_SAMPLES = 5
+# Learned timeout = p95 * HEADROOM, never below MIN_TIMEOUT and never above the caller's default
+HEADROOM = 3
+MIN_TIMEOUT = 2
+
+
+def get_timing_path():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    working_dir = os.path.dirname(os.path.dirname(script_dir))
+    result_dir = os.path.join(working_dir, "result")
+    os.makedirs(result_dir, exist_ok=True)
+    return os.path.join(result_dir, "wait_timing.json")
+
+
+def _read_timing_file():
+    try:
+        with open(get_timing_path(), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class WaitTimer:
+    """Named, measured waits for one site"""
+
+    def __init__(self, site):
+        self.site = site
+        self.history = _read_timing_file().get(site, {})
+        self.session = {}  # name -> {"seconds": [...], "timeouts": n}
+        self.started = time.time()
+
+    def timeout_for(self, name, default):
+        """Timeout for a named wait: p95 of its history with headroom, capped at the default"""
+        samples = self.history.get(name, [])
+        if len(samples) < MIN_SAMPLES:
+            return default
+        return min(default, max(MIN_TIMEOUT, percentile(samples, 0.95) * HEADROOM))
+
+    def _record(self, name, seconds, timed_out=False):
+        stats = self.session.setdefault(name, {"seconds": [], "timeouts": 0})
+        stats["seconds"].append(seconds)
+        if timed_out:
+            stats["timeouts"] += 1
+        else:
+            self.history[name] = (self.history.get(name, []) + [round(seconds, 3)])[-HISTORY_SIZE:]
+
+    def wait(self, driver, name, condition, timeout=20, escalate=True):
+        """
+        WebDriverWait(driver, timeout).until(condition) with fast polling and the learned timeout.
+        escalate: when the learned timeout runs out, keep waiting up to the caller's timeout before
+        giving up (set False for fallback selector loops, where failing fast is the point).
+        Raises TimeoutException like WebDriverWait.
+        """
+        learned = self.timeout_for(name, timeout)
+        started = time.time()
+        try:
+            result = WebDriverWait(driver, learned, poll_frequency=FAST_POLL).until(condition)
+        except TimeoutException:
+            if not escalate or learned >= timeout:
+                self._record(name, time.time() - started, timed_out=True)
+                raise
+            print(f"[DEBUG] {name} slower than usual (> {learned:.1f}s), waiting up to {timeout}s")
+            try:
+                result = WebDriverWait(driver, timeout - learned, poll_frequency=FAST_POLL).until(condition)
+            except TimeoutException:
+                self._record(name, time.time() - started, timed_out=True)
+                raise
+        self._record(name, time.time() - started)
+        return result
+
+    def settle(self, driver, name, condition, timeout=3):
+        """Wait for a condition that usually but not always happens (replaces a fixed sleep); True if it did"""
+        try:
+            self.wait(driver, name, condition, timeout=timeout, escalate=False)
+            return True
+        except TimeoutException:
+            return False
+
+    def save(self):
+        # Re-read before writing so parallel shard workers do not drop each other's samples
+        data = _read_timing_file()
+        site_history = data.get(self.site, {})
+        for name, samples in self.history.items():
+            site_history[name] = samples[-HISTORY_SIZE:]
+        data[self.site] = site_history
+        write_json_atomic(get_timing_path(), data, indent=1)
+
+    def report(self):
+        """Print where the run's wall-clock time went and save the timing history"""
+        try:
+            self.save()
+        except OSError as e:
+            print(f"[WARNING] Could not save wait timing: {e}")
+        if not self.session:
+            return
+        wall = time.time() - self.started
+        waited = sum(sum(stats["seconds"]) for stats in self.session.values())
+        print("\n\033[96m[INFO] Wait timing report\033[0m")
+        print(f"{'Wait':<32}{'Count':>7}{'Total s':>10}{'Share':>8}{'p50 s':>8}{'p95 s':>8}{'Timeouts':>10}")
+        for name, stats in sorted(self.session.items(), key=lambda item: -sum(item[1]["seconds"])):
+            total = sum(stats["seconds"])
+            print(f"{name:<32}{len(stats['seconds']):>7}{total:>10.2f}{total / max(wall, 0.01):>8.0%}"
+                  f"{percentile(stats['seconds'], 0.5):>8.2f}{percentile(stats['seconds'], 0.95):>8.2f}"
+                  f"{stats['timeouts']:>10}")
+        print(f"{'Waiting total':<32}{'':>7}{waited:>10.2f}{waited / max(wall, 0.01):>8.0%}")
+        print(f"{'Run wall clock':<32}{'':>7}{wall:>10.2f}")
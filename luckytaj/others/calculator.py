@@ -1,7 +1,5 @@
 from selenium import webdriver
-from selenium.webdriver.firefox.service import Service
 from selenium.webdriver.firefox.options import Options
-from webdriver_manager.firefox import GeckoDriverManager
 import time
 import signal
 import sys
@@ -14,6 +12,9 @@ from selenium.webdriver.support.ui import Select
 from datetime import datetime
 from collections import defaultdict
 from terminal_utils import setup_automation_terminal, cleanup_terminal, print_status
+from page_turn import table_fingerprint, wait_for_page_turn, PageTurnTimeout
+from driver_bootstrap import start_driver
+from records import CashRecord
 
 def signal_handler(signum, frame):
     """Handle shutdown signals gracefully"""
@@ -96,9 +97,10 @@ setup_automation_terminal("Phone Number Crawler")
 config = select_website()
 
 # Setup the driver
-service = Service(GeckoDriverManager().install())
-driver = webdriver.Firefox(service=service, options=options)
-driver.maximize_window()
+driver = start_driver(options)
+if driver is None:
+    print("❌ No browser could be started (see the errors above)")
+    sys.exit(1)
 
 # Login with selected configuration
 print(f"\n🚀 Connecting to {config['name']}...")
@@ -253,7 +255,6 @@ def extract_phone_data_with_date_filter(driver, start_date, end_date, wait_timeo
     should_stop_scraping = False
     
     print(f"[INFO] Processing {len(rows)} rows with date filtering...")
-    time.sleep(1)  # Stability delay
 
     for idx in range(len(rows)):
         try:
@@ -372,14 +373,7 @@ def extract_phone_data_with_date_filter(driver, start_date, end_date, wait_timeo
                     remark = remark_raw
 
                 # Create the record
-                record = {
-                    "Transaction Type": txn_type,
-                    "Amount": amount,  
-                    "Remark": remark,
-                    "Phone Number": phone_number,  # Add phone number field
-                    "Date": row_date,  # Add parsed date for easier processing
-                    "Time": registration_date_str  # Add full timestamp
-                }
+                record = CashRecord(txn_type, amount, remark, phone_number, row_date, registration_date_str)
                 collected_records.append(record)
 
             except ValueError as e:
@@ -574,7 +568,6 @@ def click_next_page(driver, wait_timeout=10):
         # Strategy 1: Regular click
         try:
             next_button.click()
-            time.sleep(2)
             print(f"[INFO] Successfully clicked Next Page button")
             return True
         except Exception as e:
@@ -584,7 +577,6 @@ def click_next_page(driver, wait_timeout=10):
         try:
             print("[DEBUG] Trying JavaScript click...")
             driver.execute_script("arguments[0].click();", next_button)
-            time.sleep(2)
             print(f"[INFO] Successfully clicked Next Page button with JavaScript")
             return True
         except Exception as e:
@@ -595,7 +587,6 @@ def click_next_page(driver, wait_timeout=10):
             from selenium.webdriver.common.action_chains import ActionChains
             print("[DEBUG] Trying ActionChains click...")
             ActionChains(driver).move_to_element(next_button).click().perform()
-            time.sleep(2)
             print(f"[INFO] Successfully clicked Next Page button with ActionChains")
             return True
         except Exception as e:
@@ -644,16 +635,21 @@ def run_optimized_phone_extraction(driver, start_date, end_date):
         
         # Try to go to next page
         print(f"[DEBUG] Attempting to navigate to next page...")
-        time.sleep(1)
+        fingerprint = table_fingerprint(driver)
         has_next = click_next_page(driver)
         if not has_next:
             print("[INFO] No more pages found. Finishing extraction.")
             break
         else:
+            # Returns as soon as the table shows the next page
+            try:
+                wait_for_page_turn(driver, fingerprint)
+            except PageTurnTimeout as e:
+                print(f"\033[91m[ERROR] {e}\033[0m")
+                raise
             print(f"[SUCCESS] Successfully navigated to page {page_counter + 1}")
             
         page_counter += 1
-        time.sleep(1)
     
     # Group records for output
     phone_groups = defaultdict(list)
@@ -0,0 +1,61 @@
+"""
+Exact money amounts as integer paise
+Amounts and fees used to be floats from float(text.replace(",", "")), so large ranges
+summed with float drift and could miss the back office's totals by a few paise. Cells are
+parsed straight into integer paise (Decimal, never through a float), summed as ints, and
+turned back into text only for display and JSON files ("1500.00", exact both ways).
+"""
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+PAISE_PER_RUPEE = 100
+# Record keys holding paise in memory and rupee text in JSON files
+MONEY_KEYS = ("Amount", "Tax Fee")
+
+_CENT = Decimal("0.01")
+
+
+def to_paise(value):
+    """
+    Rupees as integer paise from a cell/JSON value ('Rs 1,500.00', '1500', 1500.5).
+    Numbers are rupees; floats go through their shortest repr, so 0.1 is 10 paise.
+    Empty/None is 0, anything else unreadable raises ValueError.
+    """
+    if value is None or isinstance(value, bool):
+        return 0
+    if isinstance(value, int):
+        return value * PAISE_PER_RUPEE
+    text = repr(value) if isinstance(value, float) else str(value)
+    text = text.replace("Rs", "").replace(",", "").strip()
+    if not text:
+        return 0
+    try:
+        rupees = Decimal(text)
+    except InvalidOperation:
+        raise ValueError(f"not an amount: {value!r}") from None
+    if not rupees.is_finite():
+        raise ValueError(f"not an amount: {value!r}")
+    return int(rupees.quantize(_CENT, rounding=ROUND_HALF_UP) * PAISE_PER_RUPEE)
+
+
+def format_rupees(paise, grouping=True):
+    """'1,500.00' (or '1500.00' with grouping=False) for integer paise"""
+    sign = "-" if paise < 0 else ""
+    rupees, rest = divmod(abs(paise), PAISE_PER_RUPEE)
+    return f"{sign}{rupees:,}.{rest:02d}" if grouping else f"{sign}{rupees}.{rest:02d}"
+
+
+def money_from_json(data):
+    """Turn the MONEY_KEYS of a dict read from a JSON file back into integer paise (in place)"""
+    for key in MONEY_KEYS:
+        if key in data:
+            data[key] = to_paise(data[key])
+    return data
+
+
+def money_to_json(data):
+    """Copy of a record dict with the MONEY_KEYS as exact rupee text (paise in, '1500.00' out)"""
+    data = dict(data)
+    for key in MONEY_KEYS:
+        if isinstance(data.get(key), int):
+            data[key] = format_rupees(data[key], grouping=False)
+    return data
@@ -0,0 +1,136 @@
+"""
+Compact row records for the crawlers
+Collected rows used to be one dict each, with its own hash table of string keys. These
+classes keep the same fields in __slots__, intern the values that repeat across rows
+(gateway names, transaction types, affiliate codes) and share one date object per day, while
+still reading like the old dicts (record["Order ID"], record.get("Tax Fee", 0),
+dict(record, Date=...)), so the rest of the code and the JSON files are unchanged.
+Transaction amounts and fees are integer paise (money.py); to_json() writes them as rupee text.
+record_benchmark.py measures the memory per 100k records against plain dicts.
+"""
+import sys
+from datetime import datetime
+
+from money import to_paise, money_to_json
+
+_DAYS = {}
+
+
+def parse_day(text):
+    """date for 'YYYY-MM-DD', one shared object per day (raises ValueError like strptime)"""
+    day = _DAYS.get(text)
+    if day is None:
+        day = _DAYS[text] = datetime.strptime(text, "%Y-%m-%d").date()
+    return day
+
+
+class Record:
+    """Base for the slotted records: FIELDS maps each dict-style key to its slot"""
+    __slots__ = ()
+    FIELDS = ()    # ((key, slot), ...) in the order the old dicts had
+    INTERNED = ()  # slots whose string values repeat across rows
+    MONEY = ()     # keys held as integer paise (rupees in the JSON files)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._slot_of = dict(cls.FIELDS)
+
+    def __init__(self, *values):
+        for (_key, slot), value in zip(self.FIELDS, values):
+            if slot in self.INTERNED and isinstance(value, str):
+                value = sys.intern(value)
+            setattr(self, slot, value)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build from a dict as stored in the JSON files (Date as 'YYYY-MM-DD' or a date, money as rupees)"""
+        values = []
+        for key, _slot in cls.FIELDS:
+            value = data.get(key)
+            if key == "Date" and isinstance(value, str):
+                value = parse_day(value)
+            elif key in cls.MONEY:
+                value = to_paise(value)
+            values.append(value)
+        return cls(*values)
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, self._slot_of[key])
+        except KeyError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        if key not in self._slot_of:
+            raise KeyError(key)
+        setattr(self, self._slot_of[key], value)
+
+    def __contains__(self, key):
+        return key in self._slot_of
+
+    def get(self, key, default=None):
+        slot = self._slot_of.get(key)
+        return default if slot is None else getattr(self, slot)
+
+    def keys(self):
+        return [key for key, _slot in self.FIELDS]
+
+    def values(self):
+        return [getattr(self, slot) for _key, slot in self.FIELDS]
+
+    def items(self):
+        return [(key, getattr(self, slot)) for key, slot in self.FIELDS]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.FIELDS)
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def to_json(self):
+        """dict for the JSON files: Date as 'YYYY-MM-DD', money as exact rupee text"""
+        data = money_to_json(self.items())
+        if data.get("Date") is not None:
+            data["Date"] = str(data["Date"])
+        return data
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            return type(self) is type(other) and self.values() == other.values()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class TransactionRecord(Record):
+    """A deposit/withdrawal row (transaction.py, table_snapshot.py, crawl state, journal and shards)"""
+    __slots__ = ("order_id", "player_id", "phone_number", "amount", "tax_fee", "time", "gateway", "date")
+    FIELDS = (("Order ID", "order_id"), ("Player ID", "player_id"), ("Phone Number", "phone_number"),
+              ("Amount", "amount"), ("Tax Fee", "tax_fee"), ("Time", "time"), ("Gateway", "gateway"),
+              ("Date", "date"))
+    INTERNED = ("gateway",)
+    MONEY = ("Amount", "Tax Fee")
+
+
+class MemberRecord(Record):
+    """A member row with a phone number (phone_number.py)"""
+    __slots__ = ("player_id", "phone_number", "email", "affiliate_code")
+    FIELDS = (("Player ID", "player_id"), ("Phone Number", "phone_number"), ("Email", "email"),
+              ("Affiliate Code", "affiliate_code"))
+    INTERNED = ("affiliate_code",)
+
+
+class CashRecord(Record):
+    """A CASH_IN/CASH_OUT row (calculator.py)"""
+    __slots__ = ("transaction_type", "amount", "remark", "phone_number", "date", "time")
+    FIELDS = (("Transaction Type", "transaction_type"), ("Amount", "amount"), ("Remark", "remark"),
+              ("Phone Number", "phone_number"), ("Date", "date"), ("Time", "time"))
+    INTERNED = ("transaction_type",)